@@ -0,0 +1,33 @@
+"""add riot_rate_limit_bucket table
+
+Revision ID: c3d4e5f6a7b8
+Revises: b2c3d4e5f6a7
+Create Date: 2026-10-18 00:00:00.000000
+
+Shared Riot API rate-limit counters. One row per (host, scope, window) so
+every uvicorn worker and replica admits requests from the same budget.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'c3d4e5f6a7b8'
+down_revision: Union[str, None] = 'b2c3d4e5f6a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('riot_rate_limit_bucket',
+        sa.Column('bucket', sa.String(length=200), nullable=False),
+        sa.Column('window_started_at', sa.DateTime(), nullable=False),
+        sa.Column('request_count', sa.Integer(), nullable=False),
+        sa.Column('blocked_until', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('bucket'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('riot_rate_limit_bucket')
@@ -0,0 +1,36 @@
+"""add match table
+
+Revision ID: d4e5f6a7b8c9
+Revises: c3d4e5f6a7b8
+Create Date: 2026-10-18 01:00:00.000000
+
+Immutable store of finished Riot matches (match_id -> extracted participant
+rows). Consulted before any match-v5 download so int list, OPGG and duo
+refreshes only fetch match IDs they have never seen.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = 'd4e5f6a7b8c9'
+down_revision: Union[str, None] = 'c3d4e5f6a7b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('match',
+        sa.Column('match_id', sa.String(), nullable=False),
+        sa.Column('queue_id', sa.Integer(), nullable=True),
+        sa.Column('played_at', sa.DateTime(), nullable=False),
+        sa.Column('participants', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('fetched_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('match_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('match')
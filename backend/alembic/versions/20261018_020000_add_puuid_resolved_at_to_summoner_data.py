@@ -0,0 +1,27 @@
+"""add puuid_resolved_at to summoner_data
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-18 02:00:00.000000
+
+Records when a summoner's PUUID was last re-resolved from their Riot ID, so
+refreshes only repeat the account-v1 lookup after a TTL or a 4xx.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'e5f6a7b8c9d0'
+down_revision: Union[str, None] = 'd4e5f6a7b8c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('summoner_data', sa.Column('puuid_resolved_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('summoner_data', 'puuid_resolved_at')
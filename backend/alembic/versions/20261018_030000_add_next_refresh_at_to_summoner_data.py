@@ -0,0 +1,27 @@
+"""add next_refresh_at to summoner_data
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-18 03:00:00.000000
+
+Per-summoner due time for the staleness-tiered background refresh. NULL
+means "due now", so existing rows are picked up on the first tick.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'f6a7b8c9d0e1'
+down_revision: Union[str, None] = 'e5f6a7b8c9d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('summoner_data', sa.Column('next_refresh_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('summoner_data', 'next_refresh_at')
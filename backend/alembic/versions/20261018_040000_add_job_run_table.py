@@ -0,0 +1,43 @@
+"""add job_run table
+
+Revision ID: a7b8c9d0e1f2
+Revises: f6a7b8c9d0e1
+Create Date: 2026-10-18 04:00:00.000000
+
+History of background job executions (duration, items processed and
+failed, Riot calls and 429s) for the admin job metrics endpoint.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'a7b8c9d0e1f2'
+down_revision: Union[str, None] = 'f6a7b8c9d0e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('job_run',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('job_name', sa.String(length=100), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('duration_seconds', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('items_total', sa.Integer(), nullable=False),
+        sa.Column('items_succeeded', sa.Integer(), nullable=False),
+        sa.Column('items_failed', sa.Integer(), nullable=False),
+        sa.Column('riot_calls', sa.Integer(), nullable=False),
+        sa.Column('riot_rate_limited', sa.Integer(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_job_run_job_name_started_at', 'job_run', ['job_name', 'started_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_job_run_job_name_started_at', table_name='job_run')
+    op.drop_table('job_run')
@@ -0,0 +1,47 @@
+"""add duo_match_teammate table
+
+Revision ID: c9d0e1f2a3b4
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-18 06:00:00.000000
+
+Normalizes duo_match.teammates into one row per (owner, match, teammate),
+indexed on (owner_id, teammate_name), so duo records are counted with a
+single GROUP BY join against duo_entry_account. Backfilled from the
+existing JSONB lists.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'c9d0e1f2a3b4'
+down_revision: Union[str, None] = 'a7b8c9d0e1f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('duo_match_teammate',
+        sa.Column('owner_id', sa.UUID(), nullable=False),
+        sa.Column('match_id', sa.String(), nullable=False),
+        sa.Column('teammate_name', sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['match_id', 'owner_id'],
+            ['duo_match.match_id', 'duo_match.owner_id'],
+            ondelete='CASCADE',
+        ),
+        sa.PrimaryKeyConstraint('owner_id', 'match_id', 'teammate_name'),
+    )
+    op.create_index('ix_duo_match_teammate_owner_name', 'duo_match_teammate', ['owner_id', 'teammate_name'], unique=False)
+
+    op.execute("""
+        INSERT INTO duo_match_teammate (owner_id, match_id, teammate_name)
+        SELECT DISTINCT owner_id, match_id, jsonb_array_elements_text(teammates)
+        FROM duo_match
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_duo_match_teammate_owner_name', table_name='duo_match_teammate')
+    op.drop_table('duo_match_teammate')
@@ -0,0 +1,57 @@
+"""add duo_ingest_job table
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-10-18 07:00:00.000000
+
+Queue of duo match backfills. The /duos/account endpoints enqueue a job and
+return immediately; the background worker runs it, committing matches in
+batches and recording matches fetched/total for the status endpoint. A
+partial unique index keeps at most one queued job per owner, so concurrent
+enqueues coalesce into it.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'd0e1f2a3b4c5'
+down_revision: Union[str, None] = 'c9d0e1f2a3b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('duo_ingest_job',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('owner_id', sa.UUID(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('recalculate', sa.Boolean(), nullable=False),
+        sa.Column('matches_total', sa.Integer(), nullable=True),
+        sa.Column('matches_fetched', sa.Integer(), nullable=False),
+        sa.Column('matches_stored', sa.Integer(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['owner_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_duo_ingest_job_status_created_at', 'duo_ingest_job', ['status', 'created_at'], unique=False)
+    op.create_index('ix_duo_ingest_job_owner_created_at', 'duo_ingest_job', ['owner_id', 'created_at'], unique=False)
+    op.create_index(
+        'uq_duo_ingest_job_owner_queued',
+        'duo_ingest_job',
+        ['owner_id'],
+        unique=True,
+        postgresql_where=sa.text("status = 'queued'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_duo_ingest_job_owner_queued', table_name='duo_ingest_job')
+    op.drop_index('ix_duo_ingest_job_owner_created_at', table_name='duo_ingest_job')
+    op.drop_index('ix_duo_ingest_job_status_created_at', table_name='duo_ingest_job')
+    op.drop_table('duo_ingest_job')
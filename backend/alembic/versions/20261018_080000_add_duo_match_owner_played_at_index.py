@@ -0,0 +1,28 @@
+"""add duo_match (owner_id, played_at) index
+
+Revision ID: e1f2a3b4c5d6
+Revises: d0e1f2a3b4c5
+Create Date: 2026-10-18 08:00:00.000000
+
+Lets /duos/list count records over a time window (last 7/30 days, the
+current season or a custom range) by range-scanning the owner's matches
+instead of reading their whole history.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'e1f2a3b4c5d6'
+down_revision: Union[str, None] = 'd0e1f2a3b4c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_duo_match_owner_played_at', 'duo_match', ['owner_id', 'played_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_duo_match_owner_played_at', table_name='duo_match')
@@ -0,0 +1,166 @@
+"""partition duo_match by season
+
+Revision ID: f2a3b4c5d6e7
+Revises: e1f2a3b4c5d6
+Create Date: 2026-10-18 09:00:00.000000
+
+Adds duo_season (seeded with the 2025 and 2026 ranked seasons) and
+duo_season_record (per-season record snapshots), and rebuilds duo_match and
+duo_match_teammate as tables range-partitioned on played_at with one
+partition per season plus a DEFAULT partition. played_at joins both primary
+keys (Postgres requires the partition key in them) and is copied onto
+duo_match_teammate so it can be partitioned the same way; the teammate ->
+match foreign key is dropped, since it would block detaching a season.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = 'f2a3b4c5d6e7'
+down_revision: Union[str, None] = 'e1f2a3b4c5d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEASONS = [
+    ('2025', '2025-01-09 00:00:00', '2026-01-08 00:00:00'),
+    ('2026', '2026-01-08 00:00:00', '2027-01-07 00:00:00'),
+]
+
+
+def _create_partitions(table: str) -> None:
+    for name, starts_at, ends_at in SEASONS:
+        op.execute(
+            f"CREATE TABLE {table}_s{name} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{starts_at}') TO ('{ends_at}')"
+        )
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+
+def upgrade() -> None:
+    op.create_table('duo_season',
+        sa.Column('name', sa.String(length=20), nullable=False),
+        sa.Column('starts_at', sa.DateTime(), nullable=False),
+        sa.Column('ends_at', sa.DateTime(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('name'),
+    )
+    op.bulk_insert(
+        sa.table('duo_season',
+            sa.column('name', sa.String),
+            sa.column('starts_at', sa.DateTime),
+            sa.column('ends_at', sa.DateTime),
+        ),
+        [{'name': name, 'starts_at': starts_at, 'ends_at': ends_at} for name, starts_at, ends_at in SEASONS],
+    )
+
+    op.create_table('duo_season_record',
+        sa.Column('season', sa.String(length=20), nullable=False),
+        sa.Column('entry_id', sa.UUID(), nullable=False),
+        sa.Column('owner_id', sa.UUID(), nullable=False),
+        sa.Column('wins', sa.Integer(), nullable=False),
+        sa.Column('losses', sa.Integer(), nullable=False),
+        sa.Column('snapshotted_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['season'], ['duo_season.name'], ),
+        sa.ForeignKeyConstraint(['entry_id'], ['duo_entry.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['owner_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('season', 'entry_id'),
+    )
+
+    # Move the unpartitioned tables aside (constraint and index names are
+    # schema-wide, so free them up for the new tables).
+    op.drop_index('ix_duo_match_owner_played_at', table_name='duo_match')
+    op.drop_index('ix_duo_match_teammate_owner_name', table_name='duo_match_teammate')
+    op.rename_table('duo_match_teammate', 'duo_match_teammate_old')
+    op.execute("ALTER TABLE duo_match_teammate_old RENAME CONSTRAINT duo_match_teammate_pkey TO duo_match_teammate_old_pkey")
+    op.rename_table('duo_match', 'duo_match_old')
+    op.execute("ALTER TABLE duo_match_old RENAME CONSTRAINT duo_match_pkey TO duo_match_old_pkey")
+    op.execute("ALTER TABLE duo_match_old RENAME CONSTRAINT duo_match_owner_id_fkey TO duo_match_old_owner_id_fkey")
+
+    op.create_table('duo_match',
+        sa.Column('match_id', sa.String(), nullable=False),
+        sa.Column('owner_id', sa.UUID(), nullable=False),
+        sa.Column('win', sa.Boolean(), nullable=False),
+        sa.Column('teammates', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('played_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['owner_id'], ['user.id']),
+        sa.PrimaryKeyConstraint('match_id', 'owner_id', 'played_at'),
+        postgresql_partition_by='RANGE (played_at)',
+    )
+    op.create_index('ix_duo_match_owner_played_at', 'duo_match', ['owner_id', 'played_at'], unique=False)
+    _create_partitions('duo_match')
+
+    op.create_table('duo_match_teammate',
+        sa.Column('owner_id', sa.UUID(), nullable=False),
+        sa.Column('match_id', sa.String(), nullable=False),
+        sa.Column('teammate_name', sa.String(), nullable=False),
+        sa.Column('played_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('owner_id', 'match_id', 'teammate_name', 'played_at'),
+        postgresql_partition_by='RANGE (played_at)',
+    )
+    op.create_index('ix_duo_match_teammate_owner_name', 'duo_match_teammate', ['owner_id', 'teammate_name'], unique=False)
+    _create_partitions('duo_match_teammate')
+
+    op.execute("""
+        INSERT INTO duo_match (match_id, owner_id, win, teammates, played_at)
+        SELECT match_id, owner_id, win, teammates, played_at FROM duo_match_old
+    """)
+    op.execute("""
+        INSERT INTO duo_match_teammate (owner_id, match_id, teammate_name, played_at)
+        SELECT t.owner_id, t.match_id, t.teammate_name, m.played_at
+        FROM duo_match_teammate_old t
+        JOIN duo_match_old m ON m.owner_id = t.owner_id AND m.match_id = t.match_id
+    """)
+
+    op.drop_table('duo_match_teammate_old')
+    op.drop_table('duo_match_old')
+
+
+def downgrade() -> None:
+    # Matches in detached (archived) season partitions are not restored.
+    op.drop_index('ix_duo_match_teammate_owner_name', table_name='duo_match_teammate')
+    op.drop_index('ix_duo_match_owner_played_at', table_name='duo_match')
+    op.rename_table('duo_match_teammate', 'duo_match_teammate_partitioned')
+    op.execute("ALTER TABLE duo_match_teammate_partitioned RENAME CONSTRAINT duo_match_teammate_pkey TO duo_match_teammate_partitioned_pkey")
+    op.rename_table('duo_match', 'duo_match_partitioned')
+    op.execute("ALTER TABLE duo_match_partitioned RENAME CONSTRAINT duo_match_pkey TO duo_match_partitioned_pkey")
+    op.execute("ALTER TABLE duo_match_partitioned RENAME CONSTRAINT duo_match_owner_id_fkey TO duo_match_partitioned_owner_id_fkey")
+
+    op.create_table('duo_match',
+        sa.Column('match_id', sa.String(), nullable=False),
+        sa.Column('owner_id', sa.UUID(), nullable=False),
+        sa.Column('win', sa.Boolean(), nullable=False),
+        sa.Column('teammates', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('played_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['owner_id'], ['user.id']),
+        sa.PrimaryKeyConstraint('match_id', 'owner_id'),
+    )
+    op.create_index('ix_duo_match_owner_played_at', 'duo_match', ['owner_id', 'played_at'], unique=False)
+    op.create_table('duo_match_teammate',
+        sa.Column('owner_id', sa.UUID(), nullable=False),
+        sa.Column('match_id', sa.String(), nullable=False),
+        sa.Column('teammate_name', sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['match_id', 'owner_id'],
+            ['duo_match.match_id', 'duo_match.owner_id'],
+            ondelete='CASCADE',
+        ),
+        sa.PrimaryKeyConstraint('owner_id', 'match_id', 'teammate_name'),
+    )
+    op.create_index('ix_duo_match_teammate_owner_name', 'duo_match_teammate', ['owner_id', 'teammate_name'], unique=False)
+
+    op.execute("""
+        INSERT INTO duo_match (match_id, owner_id, win, teammates, played_at)
+        SELECT match_id, owner_id, win, teammates, played_at FROM duo_match_partitioned
+    """)
+    op.execute("""
+        INSERT INTO duo_match_teammate (owner_id, match_id, teammate_name)
+        SELECT owner_id, match_id, teammate_name FROM duo_match_teammate_partitioned
+    """)
+
+    op.drop_table('duo_match_teammate_partitioned')
+    op.drop_table('duo_match_partitioned')
+    op.drop_table('duo_season_record')
+    op.drop_table('duo_season')
@@ -0,0 +1,54 @@
+"""add opgg_refresh_job table
+
+Revision ID: a3b4c5d6e7f8
+Revises: f2a3b4c5d6e7
+Create Date: 2026-10-18 10:00:00.000000
+
+Queue of on-demand OPGG refreshes. /opgg/refresh enqueues a job and returns
+202; the background worker runs it. The partial unique index allows only
+one queued or running job per owner, so concurrent requests coalesce.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'a3b4c5d6e7f8'
+down_revision: Union[str, None] = 'f2a3b4c5d6e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('opgg_refresh_job',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('owner_id', sa.UUID(), nullable=False),
+        sa.Column('requested_by', sa.UUID(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('accounts_total', sa.Integer(), nullable=True),
+        sa.Column('accounts_refreshed', sa.Integer(), nullable=False),
+        sa.Column('accounts_failed', sa.Integer(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['owner_id'], ['user.id'], ),
+        sa.ForeignKeyConstraint(['requested_by'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'uq_opgg_refresh_job_owner_active',
+        'opgg_refresh_job',
+        ['owner_id'],
+        unique=True,
+        postgresql_where=sa.text("status IN ('queued', 'running')"),
+    )
+    op.create_index('ix_opgg_refresh_job_owner_created_at', 'opgg_refresh_job', ['owner_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_opgg_refresh_job_owner_created_at', table_name='opgg_refresh_job')
+    op.drop_index('uq_opgg_refresh_job_owner_active', table_name='opgg_refresh_job')
+    op.drop_table('opgg_refresh_job')
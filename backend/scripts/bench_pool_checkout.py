@@ -0,0 +1,258 @@
+"""Measure sync pool checkout time for the endpoints that call Riot.
+
+Runs the app in-process against the database in DATABASE_URL, with the Riot
+API replaced by a local fake server that answers after a fixed latency, and
+sends sequential requests to the write endpoints that resolve accounts
+through Riot:
+
+    cd backend && source venv/bin/activate
+    DATABASE_URL=postgresql://localhost/streampage_dev \\
+        python scripts/bench_pool_checkout.py --latency-ms 200 --requests 10
+
+For each request it reports the wall time and how long pool connections
+were checked out in total and at most at once (measured with pool
+listeners installed by this script, so the same command works on older
+commits). When a handler holds its session across the Riot calls, the
+longest checkout is about as long as the request; with the Riot calls run
+outside any transaction it should be a few milliseconds.
+
+Authentication is overridden to act as the page owner. The rows the run
+creates are deleted afterwards and the owner's tracked duo account is put
+back, but use a development database anyway.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import re
+import statistics
+import sys
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Make the backend package importable when running this file directly.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastapi import Depends
+from fastapi.testclient import TestClient
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from streampage.api.middleware.authenticator import get_current_user, require_creator
+from streampage.db import riot
+from streampage.db.engine import get_db, get_db_session, get_engine
+from streampage.db.models import (
+    DuoIngestJob,
+    DuoTrackedAccount,
+    IntListEntry,
+    Match,
+    OpggEntry,
+    SummonerData,
+    User,
+)
+from streampage.main import app
+from streampage.services.opgg_cache import opgg_accounts_cache
+from streampage.services.owner import OWNER_USERNAME
+
+NAME_PREFIX = "poolbench"
+PUUID_PREFIX = "poolbench-puuid-"
+MATCH_PREFIX = "POOLBENCH_"
+ACCOUNT_PATH = re.compile(r"^/riot/account/v1/accounts/by-riot-id/(?P<name>[^/]+)/[^/]+$")
+LEAGUE_PATH = re.compile(r"^/lol/league/v4/entries/by-puuid/[^/]+$")
+MATCH_IDS_PATH = re.compile(r"^/lol/match/v5/matches/by-puuid/(?P<puuid>[^/]+)/ids$")
+MATCH_PATH = re.compile(r"^/lol/match/v5/matches/(?P<match_id>[^/?]+)$")
+
+
+def _make_handler(latency: float) -> type[BaseHTTPRequestHandler]:
+    class FakeRiotHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send_json(self, status: int, body: object) -> None:
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.send_header("X-App-Rate-Limit", "2000:1,100000:120")
+            self.send_header("X-Method-Rate-Limit", "20000:10")
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self) -> None:
+            time.sleep(latency)
+            path = self.path.split("?", 1)[0]
+            account = ACCOUNT_PATH.match(path)
+            if account:
+                self._send_json(200, {"puuid": PUUID_PREFIX + account.group("name")})
+                return
+            if LEAGUE_PATH.match(path):
+                self._send_json(200, [{
+                    "queueType": "RANKED_SOLO_5x5",
+                    "tier": "GOLD",
+                    "rank": "II",
+                    "leaguePoints": 42,
+                    "wins": 10,
+                    "losses": 9,
+                }])
+                return
+            match_ids = MATCH_IDS_PATH.match(path)
+            if match_ids:
+                puuid = match_ids.group("puuid")
+                self._send_json(200, [f"{MATCH_PREFIX}{puuid[len(PUUID_PREFIX):]}_{i}" for i in range(3)])
+                return
+            match = MATCH_PATH.match(path)
+            if match:
+                name = match.group("match_id")[len(MATCH_PREFIX):].rsplit("_", 1)[0]
+                self._send_json(200, {
+                    "info": {
+                        "queueId": 420,
+                        "gameCreation": int(time.time() * 1000),
+                        "participants": [{
+                            "puuid": PUUID_PREFIX + name,
+                            "championId": 1,
+                            "championName": "Annie",
+                            "win": True,
+                            "kills": 1,
+                            "deaths": 2,
+                            "assists": 3,
+                        }],
+                    },
+                })
+                return
+            self._send_json(404, {"status": {"message": "Not found"}})
+
+        def log_message(self, format: str, *args) -> None:
+            pass
+
+    return FakeRiotHandler
+
+
+class PoolCheckoutRecorder:
+    """Records how long each sync pool connection stays checked out."""
+
+    def __init__(self):
+        self.holds: list[float] = []
+        self._lock = threading.Lock()
+
+    def install(self, engine) -> None:
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        connection_record.info["bench_checked_out_at"] = time.perf_counter()
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        if connection_record is None:
+            return
+        checked_out_at = connection_record.info.pop("bench_checked_out_at", None)
+        if checked_out_at is not None:
+            with self._lock:
+                self.holds.append(time.perf_counter() - checked_out_at)
+
+    def take(self) -> list[float]:
+        with self._lock:
+            holds, self.holds = self.holds, []
+        return holds
+
+
+def _act_as_owner(session: Session = Depends(get_db)) -> User:
+    return session.execute(select(User).where(User.username == OWNER_USERNAME)).scalar_one()
+
+
+def _requests(round_number: int) -> list[tuple[str, str, dict]]:
+    name = f"{NAME_PREFIX}{round_number}"
+    return [
+        ("int_list", "/riot/add_to_int_list", {"summoner_name": f"{name}i", "tagline": "NA1", "user_reason": "bench"}),
+        ("opgg", "/opgg/add_account", {"summoner_name": f"{name}o", "tagline": "NA1"}),
+        ("duo_account", "/duos/account", {"game_name": f"{name}d", "tag_line": "NA1"}),
+    ]
+
+
+def _cleanup(started_at: datetime, duo_account: dict | None) -> None:
+    with get_db_session() as session:
+        owner = session.execute(select(User).where(User.username == OWNER_USERNAME)).scalar_one()
+        session.query(IntListEntry).filter(IntListEntry.puuid.like(f"{PUUID_PREFIX}%")).delete(synchronize_session=False)
+        session.query(OpggEntry).filter(OpggEntry.puuid.like(f"{PUUID_PREFIX}%")).delete(synchronize_session=False)
+        session.query(SummonerData).filter(SummonerData.puuid.like(f"{PUUID_PREFIX}%")).delete(synchronize_session=False)
+        session.query(Match).filter(Match.match_id.like(f"{MATCH_PREFIX}%")).delete(synchronize_session=False)
+        session.query(DuoIngestJob).filter(
+            DuoIngestJob.owner_id == owner.id, DuoIngestJob.created_at >= started_at
+        ).delete(synchronize_session=False)
+        account = session.execute(
+            select(DuoTrackedAccount).where(DuoTrackedAccount.owner_id == owner.id)
+        ).scalar_one_or_none()
+        if account is not None:
+            if duo_account is None:
+                session.delete(account)
+            else:
+                for key, value in duo_account.items():
+                    setattr(account, key, value)
+        session.commit()
+        opgg_accounts_cache.invalidate(owner.id)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=200, help="fake Riot latency per request")
+    parser.add_argument("--requests", type=int, default=10, help="requests per endpoint")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(args.latency_ms / 1000))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    riot.RIOT_ACCOUNT_API_BASE = base_url
+    riot.RIOT_NA_API_BASE = base_url
+
+    recorder = PoolCheckoutRecorder()
+    recorder.install(get_engine())
+    app.dependency_overrides[get_current_user] = _act_as_owner
+    app.dependency_overrides[require_creator] = _act_as_owner
+
+    started_at = datetime.utcnow()
+    with get_db_session() as session:
+        account = session.execute(
+            select(DuoTrackedAccount).join(User, User.id == DuoTrackedAccount.owner_id)
+            .where(User.username == OWNER_USERNAME)
+        ).scalar_one_or_none()
+        duo_account = {
+            "puuid": account.puuid,
+            "game_name": account.game_name,
+            "tag_line": account.tag_line,
+        } if account else None
+
+    results: dict[str, list[tuple[float, float, float]]] = {}
+    try:
+        with TestClient(app) as client:
+            recorder.take()
+            for round_number in range(args.requests):
+                for label, path, body in _requests(round_number):
+                    started = time.perf_counter()
+                    response = client.post(path, json=body)
+                    elapsed = time.perf_counter() - started
+                    if response.status_code >= 400:
+                        print(f"{path} -> {response.status_code}: {response.text}", file=sys.stderr)
+                    holds = recorder.take()
+                    results.setdefault(label, []).append((elapsed, sum(holds), max(holds, default=0.0)))
+    finally:
+        _cleanup(started_at, duo_account)
+        app.dependency_overrides.clear()
+        riot.close_riot_client()
+        server.shutdown()
+
+    print(f"{'endpoint':<14}{'p50 ms':>10}{'held p50':>10}{'longest p50':>13}{'longest max':>13}")
+    for label, rows in results.items():
+        print(
+            f"{label:<14}"
+            f"{statistics.median(r[0] for r in rows) * 1000:>10.1f}"
+            f"{statistics.median(r[1] for r in rows) * 1000:>10.1f}"
+            f"{statistics.median(r[2] for r in rows) * 1000:>13.1f}"
+            f"{max(r[2] for r in rows) * 1000:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Concurrency benchmark for the hot public GET endpoints.
+
+Fires a fixed number of requests at a running backend with N requests in
+flight at once and reports throughput and latency percentiles per endpoint.
+Run it against a single uvicorn worker so the numbers reflect how many
+concurrent reads one process can serve:
+
+    cd backend && source venv/bin/activate
+    uvicorn streampage.main:app --workers 1 --port 8000 &
+    python scripts/bench_read_concurrency.py --concurrency 1 16 64 256
+
+With the sync handlers every request occupies one of Starlette's 40
+threadpool slots, so throughput flattens (and latency climbs linearly) once
+concurrency passes the threadpool size. The async handlers only wait on the
+asyncpg pool, so throughput keeps rising until the database is the limit.
+Compare by checking out the commit before the async routes landed and
+running the same command.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+DEFAULT_PATHS = [
+    "/users/public-profile",
+    "/opgg/accounts",
+    "/riot/int_list",
+    "/media/list",
+    "/cats/list",
+    "/shop/products",
+    "/shop/waitlist",
+]
+
+
+async def _run(client: httpx.AsyncClient, path: str, total: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    remaining = total
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            try:
+                response = await client.get(path)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50": statistics.median(latencies) * 1000,
+        "p95": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "errors": errors,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--requests", type=int, default=500, help="requests per endpoint per level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64, 256])
+    parser.add_argument("--path", action="append", dest="paths", help="endpoint to hit (repeatable)")
+    args = parser.parse_args()
+
+    limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+        print(f"{'endpoint':<24}{'conc':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'errors':>8}")
+        for path in args.paths or DEFAULT_PATHS:
+            for concurrency in args.concurrency:
+                result = await _run(client, path, args.requests, concurrency)
+                print(
+                    f"{path:<24}{concurrency:>6}{result['rps']:>10.1f}"
+                    f"{result['p50']:>10.1f}{result['p95']:>10.1f}{result['errors']:>8}"
+                )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,139 @@
+"""Benchmark recent-match fetching against a local fake Riot server.
+
+Starts an in-process HTTP server that answers the match-v5 endpoints with a
+fixed artificial latency, points streampage.db.riot at it, and times the
+path fetch_summoner_data takes for recent matches (get_last_10_match_ids,
+then get_matches) serially (max_workers=1, the old behaviour) and at each
+requested fan-out width:
+
+    cd backend && source venv/bin/activate
+    python scripts/bench_recent_matches.py --latency-ms 150 --workers 1 5 10
+
+With 10 matches and 150ms per round trip the serial path takes ~1.65s
+(ids + 10 details); at 5 workers it should be close to 3 round trips.
+
+The shared rate limiter and the match store need the database, so by default
+both are bypassed and only the HTTP fan-out is measured. Pass --with-db (with
+DATABASE_URL set) to include them; repeat calls are then served from the
+match store and only the match ID list is fetched.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import re
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Make the backend package importable when running this file directly.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from streampage.db import riot
+
+PUUID = "bench-puuid"
+MATCH_IDS_PATH = re.compile(r"^/lol/match/v5/matches/by-puuid/[^/]+/ids$")
+MATCH_PATH = re.compile(r"^/lol/match/v5/matches/(?P<match_id>[^/?]+)$")
+
+
+def _make_handler(latency: float, match_count: int) -> type[BaseHTTPRequestHandler]:
+    class FakeRiotHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send_json(self, status: int, body: object) -> None:
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.send_header("X-App-Rate-Limit", "20:1,100:120")
+            self.send_header("X-Method-Rate-Limit", "2000:10")
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self) -> None:
+            time.sleep(latency)
+            path = self.path.split("?", 1)[0]
+            if MATCH_IDS_PATH.match(path):
+                self._send_json(200, [f"NA1_{i}" for i in range(match_count)])
+                return
+            match = MATCH_PATH.match(path)
+            if match:
+                self._send_json(200, {
+                    "info": {
+                        "participants": [{
+                            "puuid": PUUID,
+                            "championId": 1,
+                            "championName": "Annie",
+                            "win": True,
+                            "kills": 1,
+                            "deaths": 2,
+                            "assists": 3,
+                        }],
+                    },
+                })
+                return
+            self._send_json(404, {"status": {"message": "Not found"}})
+
+        def log_message(self, format: str, *args) -> None:
+            pass
+
+    return FakeRiotHandler
+
+
+def _recent_matches(workers: int) -> dict[str, dict]:
+    return riot.get_matches(riot.get_last_10_match_ids(PUUID), max_workers=workers)
+
+
+class _NoopRateLimiter:
+    def acquire(self, url: str, method: str) -> None:
+        pass
+
+    def record(self, url: str, method: str, response) -> None:
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=150, help="fake server latency per request")
+    parser.add_argument("--matches", type=int, default=10, help="match IDs returned by the fake server")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 5, 10])
+    parser.add_argument("--rounds", type=int, default=5, help="timed calls per worker count")
+    parser.add_argument("--with-db", action="store_true", help="keep the DB-backed rate limiter and match store")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(args.latency_ms / 1000, args.matches))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    riot.RIOT_ACCOUNT_API_BASE = base_url
+    riot.RIOT_NA_API_BASE = base_url
+    if not args.with_db:
+        riot.riot_rate_limiter = _NoopRateLimiter()
+        riot._load_stored_matches = lambda match_ids: {}
+        riot._store_matches = lambda matches: None
+
+    try:
+        print(f"{'workers':>8}{'p50 ms':>10}{'min ms':>10}{'matches':>9}")
+        for workers in args.workers:
+            _recent_matches(workers)  # warm the connection pool
+            timings: list[float] = []
+            matches: dict[str, dict] = {}
+            for _ in range(args.rounds):
+                started = time.perf_counter()
+                matches = _recent_matches(workers)
+                timings.append(time.perf_counter() - started)
+            print(
+                f"{workers:>8}{statistics.median(timings) * 1000:>10.1f}"
+                f"{min(timings) * 1000:>10.1f}{len(matches):>9}"
+            )
+    finally:
+        riot.close_riot_client()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+from datetime import datetime, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from streampage.api.admin.models import (
+    CreateDuoSeasonRequest,
+    DuoSeasonResponse,
+    JobMetricsResponse,
+    JobRunResponse,
+    JobSummaryResponse,
+    ResponseMessage,
+)
+from streampage.api.middleware.authenticator import require_creator
+from streampage.db.engine import get_db
+from streampage.db.models import DuoSeason, JobRun
+from streampage.services.duo import current_duo_season
+from streampage.services.duo_seasons import SeasonError, add_season, archive_season, snapshot_season
+
+
+admin_router = APIRouter()
+
+
+def _run_to_response(run: JobRun) -> JobRunResponse:
+    duration = float(run.duration_seconds) if run.duration_seconds is not None else None
+    return JobRunResponse(
+        id=str(run.id),
+        job_name=run.job_name,
+        status=run.status,
+        started_at=run.started_at,
+        finished_at=run.finished_at,
+        duration_seconds=duration,
+        items_total=run.items_total,
+        items_succeeded=run.items_succeeded,
+        items_failed=run.items_failed,
+        items_per_minute=round(run.items_total * 60 / duration, 1) if duration else None,
+        riot_calls=run.riot_calls,
+        riot_rate_limited=run.riot_rate_limited,
+        error=run.error,
+    )
+
+
+@admin_router.get("/jobs")
+def get_job_metrics(
+    job_name: str | None = None,
+    days: int = Query(7, ge=1, le=90),
+    limit: int = Query(50, ge=1, le=500),
+    user=Depends(require_creator),
+    session: Session = Depends(get_db),
+) -> JobMetricsResponse:
+    """Background job run history and per-job totals. Only creator can view."""
+    since = datetime.utcnow() - timedelta(days=days)
+    filters = [JobRun.started_at >= since]
+    if job_name:
+        filters.append(JobRun.job_name == job_name)
+
+    summary_rows = session.execute(
+        select(
+            JobRun.job_name,
+            func.count(),
+            func.sum(case((JobRun.status == "failed", 1), else_=0)),
+            func.avg(JobRun.duration_seconds),
+            func.sum(JobRun.items_total),
+            func.sum(JobRun.items_failed),
+            func.sum(JobRun.riot_calls),
+            func.sum(JobRun.riot_rate_limited),
+            func.max(JobRun.started_at),
+        )
+        .where(*filters)
+        .group_by(JobRun.job_name)
+        .order_by(JobRun.job_name)
+    ).all()
+
+    runs = session.execute(
+        select(JobRun)
+        .where(*filters)
+        .order_by(JobRun.started_at.desc())
+        .limit(limit)
+    ).scalars().all()
+
+    return JobMetricsResponse(
+        since=since,
+        summaries=[
+            JobSummaryResponse(
+                job_name=name,
+                runs=count,
+                failed_runs=failed or 0,
+                avg_duration_seconds=round(float(avg_duration), 2) if avg_duration is not None else None,
+                items_total=items_total or 0,
+                items_failed=items_failed or 0,
+                riot_calls=riot_calls or 0,
+                riot_rate_limited=riot_rate_limited or 0,
+                last_started_at=last_started_at,
+            )
+            for name, count, failed, avg_duration, items_total, items_failed,
+                riot_calls, riot_rate_limited, last_started_at in summary_rows
+        ],
+        runs=[_run_to_response(run) for run in runs],
+    )
+
+
+def _get_season(session: Session, name: str) -> DuoSeason:
+    season = session.get(DuoSeason, name)
+    if season is None:
+        raise HTTPException(status_code=404, detail="Season not found")
+    return season
+
+
+@admin_router.get("/duo-seasons")
+def list_duo_seasons(
+    user=Depends(require_creator),
+    session: Session = Depends(get_db),
+) -> list[DuoSeasonResponse]:
+    """Ranked seasons partitioning the duo match tables. Only creator can view."""
+    current = current_duo_season(session)
+    seasons = session.execute(select(DuoSeason).order_by(DuoSeason.starts_at)).scalars().all()
+    return [
+        DuoSeasonResponse(
+            name=season.name,
+            starts_at=season.starts_at,
+            ends_at=season.ends_at,
+            archived_at=season.archived_at,
+            is_current=current is not None and season.name == current.name,
+        )
+        for season in seasons
+    ]
+
+
+@admin_router.post("/duo-seasons")
+def create_duo_season(
+    request: CreateDuoSeasonRequest,
+    user=Depends(require_creator),
+    session: Session = Depends(get_db),
+) -> ResponseMessage:
+    """Register a season and create its match partitions. Only creator can add."""
+    try:
+        season = add_season(session, request.name.strip(), request.starts_at, request.ends_at)
+    except SeasonError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    session.commit()
+    return ResponseMessage(message=f"Added season {season.name}")
+
+
+@admin_router.post("/duo-seasons/{name}/snapshot")
+def snapshot_duo_season(
+    name: str,
+    user=Depends(require_creator),
+    session: Session = Depends(get_db),
+) -> ResponseMessage:
+    """Snapshot every duo entry's record for a season. Only creator can run."""
+    try:
+        count = snapshot_season(session, _get_season(session, name))
+    except SeasonError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    session.commit()
+    return ResponseMessage(message=f"Snapshotted {count} records for season {name}")
+
+
+@admin_router.post("/duo-seasons/{name}/archive")
+def archive_duo_season(
+    name: str,
+    user=Depends(require_creator),
+    session: Session = Depends(get_db),
+) -> ResponseMessage:
+    """Snapshot a finished season and detach its match partitions. Only creator can run."""
+    try:
+        count = archive_season(session, _get_season(session, name))
+    except SeasonError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    session.commit()
+    return ResponseMessage(message=f"Archived season {name} ({count} records snapshotted)")
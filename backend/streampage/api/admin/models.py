@@ -0,0 +1,55 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class JobRunResponse(BaseModel):
+    id: str
+    job_name: str
+    status: str
+    started_at: datetime
+    finished_at: datetime | None = None
+    duration_seconds: float | None = None
+    items_total: int
+    items_succeeded: int
+    items_failed: int
+    items_per_minute: float | None = None
+    riot_calls: int
+    riot_rate_limited: int
+    error: str | None = None
+
+
+class JobSummaryResponse(BaseModel):
+    job_name: str
+    runs: int
+    failed_runs: int
+    avg_duration_seconds: float | None = None
+    items_total: int
+    items_failed: int
+    riot_calls: int
+    riot_rate_limited: int
+    last_started_at: datetime | None = None
+
+
+class JobMetricsResponse(BaseModel):
+    since: datetime
+    summaries: list[JobSummaryResponse]
+    runs: list[JobRunResponse]
+
+
+class DuoSeasonResponse(BaseModel):
+    name: str
+    starts_at: datetime
+    ends_at: datetime
+    archived_at: datetime | None = None
+    is_current: bool = False
+
+
+class CreateDuoSeasonRequest(BaseModel):
+    name: str
+    starts_at: datetime
+    ends_at: datetime
+
+
+class ResponseMessage(BaseModel):
+    message: str
@@ -3,6 +3,8 @@ from pathlib import Path
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
 from streampage.api.middleware.authenticator import get_current_user
 from streampage.api.cat.models import (
@@ -11,8 +13,9 @@ from streampage.api.cat.models import (
     CatResponse,
     CatListResponse,
 )
-from streampage.db.engine import get_db_session
+from streampage.db.engine import get_async_db, get_db
 from streampage.db.models import CatEntry, User
+from streampage.services.owner import page_owner
 from streampage.services.storage import storage_service
 
 
@@ -22,23 +25,21 @@ cat_router = APIRouter()
 ALLOWED_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif"}
 
 
-def get_rosie_user_id() -> uuid.UUID:
-    """Get rosie's user ID from the database."""
-    with get_db_session() as session:
-        rosie = session.execute(
-            select(User).where(User.username == "rosie")
-        ).scalar_one_or_none()
-        
-        if not rosie:
-            raise HTTPException(status_code=500, detail="Rosie user not found")
-        
-        return rosie.id
+def get_rosie_user_id(session: Session) -> uuid.UUID:
+    """Get rosie's user ID (cached after the first lookup)."""
+    rosie = page_owner.get(session)
+    
+    if not rosie:
+        raise HTTPException(status_code=500, detail="Rosie user not found")
+    
+    return rosie.id
 
 
 @cat_router.post("/add")
 async def add_cat_image(
     file: UploadFile = File(...),
     user: User = Depends(get_current_user),
+    session: Session = Depends(get_db),
 ) -> ResponseMessage:
     """Upload a cat image (any authenticated user)."""
     
@@ -57,17 +58,16 @@ async def add_cat_image(
     public_url = storage_service.upload_image(contents, "cats", file_ext)
     
     # Get rosie's user ID
-    rosie_id = get_rosie_user_id()
+    rosie_id = get_rosie_user_id(session)
     
     # Create database entry
-    with get_db_session() as session:
-        cat_entry = CatEntry(
-            creator_id=rosie_id,
-            contributor_id=user.id,
-            image_url=public_url,
-        )
-        session.add(cat_entry)
-        session.commit()
+    cat_entry = CatEntry(
+        creator_id=rosie_id,
+        contributor_id=user.id,
+        image_url=public_url,
+    )
+    session.add(cat_entry)
+    session.commit()
     
     return ResponseMessage(message="Successfully uploaded cat image")
 
@@ -76,57 +76,51 @@ async def add_cat_image(
 def remove_cat_image(
     request: RemoveCatRequest,
     user: User = Depends(get_current_user),
+    session: Session = Depends(get_db),
 ) -> ResponseMessage:
     """Delete a cat image (rosie or contributor only)."""
     
-    with get_db_session() as session:
-        cat_entry = session.execute(
-            select(CatEntry).where(CatEntry.id == request.cat_id)
-        ).scalar_one_or_none()
-        
-        if not cat_entry:
-            raise HTTPException(status_code=404, detail="Cat image not found")
-        
-        # Check permissions: rosie can delete any, contributors can delete their own
-        if user.username != "rosie" and cat_entry.contributor_id != user.id:
-            raise HTTPException(status_code=403, detail="Not authorized to delete this image")
-        
-        # Delete file from Supabase Storage
-        if "supabase.co" in cat_entry.image_url:
-            storage_service.delete_image(cat_entry.image_url)
-        
-        # Delete database entry
-        session.delete(cat_entry)
-        session.commit()
+    cat_entry = session.execute(
+        select(CatEntry).where(CatEntry.id == request.cat_id)
+    ).scalar_one_or_none()
+    
+    if not cat_entry:
+        raise HTTPException(status_code=404, detail="Cat image not found")
+    
+    # Check permissions: rosie can delete any, contributors can delete their own
+    if user.username != "rosie" and cat_entry.contributor_id != user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to delete this image")
+    
+    # Delete file from Supabase Storage
+    if "supabase.co" in cat_entry.image_url:
+        storage_service.delete_image(cat_entry.image_url)
+    
+    # Delete database entry
+    session.delete(cat_entry)
+    session.commit()
     
     return ResponseMessage(message="Successfully deleted cat image")
 
 
 @cat_router.get("/list")
-def get_cat_images() -> CatListResponse:
+async def get_cat_images(session: AsyncSession = Depends(get_async_db)) -> CatListResponse:
     """Get all cat images with contributor information."""
     
-    with get_db_session() as session:
-        cat_entries = session.execute(
-            select(CatEntry).order_by(CatEntry.created_at.desc())
-        ).scalars().all()
-        
-        cats = []
-        for entry in cat_entries:
-            # Fetch contributor username
-            contributor = session.execute(
-                select(User).where(User.id == entry.contributor_id)
-            ).scalar_one_or_none()
-            
-            if contributor:
-                cats.append(
-                    CatResponse(
-                        id=str(entry.id),
-                        image_url=entry.image_url,
-                        contributor_username=contributor.username,
-                        created_at=entry.created_at,
-                    )
-                )
-        
-        return CatListResponse(cats=cats)
-
+    # Join the contributor in the same query instead of one lookup per image
+    rows = (await session.execute(
+        select(CatEntry, User.username)
+        .join(User, User.id == CatEntry.contributor_id)
+        .order_by(CatEntry.created_at.desc())
+    )).all()
+    
+    cats = [
+        CatResponse(
+            id=str(entry.id),
+            image_url=entry.image_url,
+            contributor_username=contributor_username,
+            created_at=entry.created_at,
+        )
+        for entry, contributor_username in rows
+    ]
+    
+    return CatListResponse(cats=cats)
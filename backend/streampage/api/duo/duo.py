@@ -1,11 +1,10 @@
 import uuid
-import time
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import Session, selectinload
 
 from streampage.api.duo.models import (
     RecordDuoRequest,
@@ -15,112 +14,51 @@ from streampage.api.duo.models import (
     DuoEntryResponse,
     DuoEntryAccountResponse,
     DuoListResponse,
+    DuoIngestJobResponse,
+    DuoSuggestionResponse,
     TrackedAccountResponse,
     ResponseMessage,
 )
 from streampage.api.middleware.authenticator import require_creator
-from streampage.db.engine import get_db_session
-from streampage.db.models import DuoEntry, DuoEntryAccount, DuoMatch, DuoTrackedAccount, User
-from streampage.db.riot import get_puuid, get_all_ranked_match_ids, get_match_teammates, RATE_LIMIT_DELAY
+from streampage.db.engine import get_db, release_connection
+from streampage.db.enums import DuoWindow
+from streampage.db.models import DuoEntry, DuoEntryAccount, DuoIngestJob, DuoMatch, DuoSeason, DuoTrackedAccount, User
+from streampage.db.riot import get_puuid
+from streampage.services.duo import (
+    current_duo_season,
+    current_season_bounds,
+    duo_records_between,
+    naive_utc,
+    recalculate_duo_entry,
+    season_duo_records,
+    suggest_duo_partners,
+)
+from streampage.services.duo_ingest import enqueue_duo_ingest, latest_duo_ingest
+from streampage.services.owner import OwnerIdentity, page_owner
 
 logger = logging.getLogger(__name__)
 
 duo_router = APIRouter()
 
 
-def _get_rosie(session) -> User:
-    rosie = session.execute(
-        select(User).where(User.username == "rosie")
-    ).scalar_one_or_none()
+def _get_rosie(session) -> OwnerIdentity:
+    rosie = page_owner.get(session)
     if not rosie:
         raise HTTPException(status_code=500, detail="Rosie user not found")
     return rosie
 
 
-def _recalculate_duo_entries(session, owner_id: uuid.UUID) -> int:
-    """Recount wins/losses for every duo entry from stored matches."""
-    session.expire_all()
-
-    entries = session.execute(
-        select(DuoEntry)
-        .options(selectinload(DuoEntry.accounts))
-        .where(DuoEntry.owner_id == owner_id)
-    ).scalars().all()
-
-    matches = session.execute(
-        select(DuoMatch).where(DuoMatch.owner_id == owner_id)
-    ).scalars().all()
-
-    logger.info("Recalculating duo entries: %d entries, %d matches", len(entries), len(matches))
-
-    updated = 0
-    for entry in entries:
-        names = {a.summoner_name.strip().lower() for a in entry.accounts}
-        wins = 0
-        losses = 0
-        for m in matches:
-            if names & set(m.teammates):
-                if m.win:
-                    wins += 1
-                else:
-                    losses += 1
-        if entry.wins != wins or entry.losses != losses:
-            logger.info("Entry %s (%s): %d-%d -> %d-%d", entry.id, names, entry.wins, entry.losses, wins, losses)
-            entry.wins = wins
-            entry.losses = losses
-            updated += 1
-
-    logger.info("Recalculation complete: %d entries updated", updated)
-    return updated
-
-
-def _fetch_and_store_matches(session, account: DuoTrackedAccount) -> int:
-    """Fetch new ranked matches for the tracked account and store them.
-
-    Returns the number of newly stored matches.
-    """
-    existing_ids = set(
-        session.execute(
-            select(DuoMatch.match_id).where(DuoMatch.owner_id == account.owner_id)
-        ).scalars().all()
-    )
-
-    new_match_ids = get_all_ranked_match_ids(account.puuid, known_ids=existing_ids)
-    stored = 0
-
-    for i, match_id in enumerate(new_match_ids):
-        if match_id in existing_ids:
-            continue
-        if i > 0:
-            time.sleep(RATE_LIMIT_DELAY)
-        try:
-            result = get_match_teammates(match_id, account.puuid)
-            if result is None:
-                continue
-            win, teammates, played_at = result
-            session.add(DuoMatch(
-                match_id=match_id,
-                owner_id=account.owner_id,
-                win=win,
-                teammates=teammates,
-                played_at=played_at,
-            ))
-            stored += 1
-        except Exception:
-            logger.warning("Failed to process match %s", match_id)
-
-    account.last_updated = datetime.utcnow()
-    return stored
-
-
-def _entry_to_response(e: DuoEntry) -> DuoEntryResponse:
+def _entry_to_response(e: DuoEntry, wins: int | None = None, losses: int | None = None) -> DuoEntryResponse:
+    """Build an entry response; wins/losses override the all-time record for windowed lists."""
+    wins = e.wins if wins is None else wins
+    losses = e.losses if losses is None else losses
     return DuoEntryResponse(
         id=str(e.id),
         name=e.display_name,
-        wins=e.wins,
-        losses=e.losses,
-        games_played=e.wins + e.losses,
-        result=f"{e.wins}-{e.losses}",
+        wins=wins,
+        losses=losses,
+        games_played=wins + losses,
+        result=f"{wins}-{losses}",
         note=e.note,
         accounts=[
             DuoEntryAccountResponse(id=str(a.id), summoner_name=a.summoner_name)
@@ -130,147 +68,266 @@ def _entry_to_response(e: DuoEntry) -> DuoEntryResponse:
     )
 
 
+def _ingest_to_response(job: DuoIngestJob, message: str | None = None) -> DuoIngestJobResponse:
+    remaining = job.matches_total - job.matches_fetched if job.matches_total is not None else None
+    if message is None:
+        if job.status == "queued":
+            message = "Waiting to fetch matches"
+        elif job.status == "running":
+            message = f"Fetched {job.matches_fetched} of {job.matches_total if job.matches_total is not None else '?'} matches"
+        elif job.status == "succeeded":
+            message = f"Fetched {job.matches_stored} new matches"
+        else:
+            message = f"Failed to fetch matches: {job.error}"
+
+    return DuoIngestJobResponse(
+        id=str(job.id),
+        status=job.status,
+        message=message,
+        matches_total=job.matches_total,
+        matches_fetched=job.matches_fetched,
+        matches_remaining=remaining,
+        matches_stored=job.matches_stored,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+def _format_date(dt: datetime | None) -> str | None:
+    return f"{dt.month}/{dt.day}/{dt.year}" if dt else None
+
+
+def _window_bounds(
+    window: DuoWindow,
+    start: datetime | None,
+    end: datetime | None,
+) -> tuple[datetime, datetime | None]:
+    """Resolve a rolling or custom /list window to a [since, until) range of played_at."""
+    now = datetime.utcnow()
+    if window == DuoWindow.WEEK:
+        return now - timedelta(days=7), None
+    if window == DuoWindow.MONTH:
+        return now - timedelta(days=30), None
+
+    if start is None:
+        raise HTTPException(status_code=400, detail="A custom window requires a start")
+    since = naive_utc(start)
+    until = naive_utc(end) if end is not None else None
+    if until is not None and until <= since:
+        raise HTTPException(status_code=400, detail="End must be after start")
+    return since, until
+
+
 @duo_router.get("/list")
-def list_duos() -> DuoListResponse:
-    with get_db_session() as session:
-        rosie = _get_rosie(session)
+def list_duos(
+    window: DuoWindow = Query(DuoWindow.ALL),
+    start: datetime | None = Query(None),
+    end: datetime | None = Query(None),
+    season: str | None = Query(None),
+    session: Session = Depends(get_db),
+) -> DuoListResponse:
+    """Duo records, all-time or for matches played in a window.
+
+    Windows: 7d, 30d, season (the current one, or ?season=<name> for a past
+    one, served from its snapshot once archived) or custom start/end.
+    """
+    rosie = _get_rosie(session)
 
-        entries = session.execute(
-            select(DuoEntry)
-            .options(selectinload(DuoEntry.accounts))
-            .where(DuoEntry.owner_id == rosie.id)
-            .order_by((DuoEntry.wins + DuoEntry.losses).desc())
-        ).scalars().all()
+    entries = session.execute(
+        select(DuoEntry)
+        .options(selectinload(DuoEntry.accounts))
+        .where(DuoEntry.owner_id == rosie.id)
+        .order_by((DuoEntry.wins + DuoEntry.losses).desc())
+    ).scalars().all()
 
+    if window == DuoWindow.ALL:
         since_dt = session.execute(
             select(func.min(DuoEntry.created_at))
             .where(DuoEntry.owner_id == rosie.id)
         ).scalar()
 
-    since_str = f"{since_dt.month}/{since_dt.day}/{since_dt.year}" if since_dt else None
+        return DuoListResponse(
+            entries=[_entry_to_response(e) for e in entries],
+            since=_format_date(since_dt),
+            window=window.value,
+        )
+
+    if window == DuoWindow.SEASON:
+        duo_season = session.get(DuoSeason, season) if season else current_duo_season(session)
+        if season and duo_season is None:
+            raise HTTPException(status_code=404, detail="Season not found")
+        if duo_season is None:
+            since, until = current_season_bounds(session)
+            records = duo_records_between(session, rosie.id, since, until)
+        else:
+            since, until = duo_season.starts_at, duo_season.ends_at
+            records = season_duo_records(session, rosie.id, duo_season)
+    else:
+        since, until = _window_bounds(window, start, end)
+        records = duo_records_between(session, rosie.id, since, until)
+    windowed = sorted(
+        ((e, *records[e.id]) for e in entries if e.id in records),
+        key=lambda row: row[1] + row[2],
+        reverse=True,
+    )
 
     return DuoListResponse(
-        entries=[_entry_to_response(e) for e in entries],
-        since=since_str,
+        entries=[_entry_to_response(e, wins, losses) for e, wins, losses in windowed],
+        since=_format_date(since),
+        until=_format_date(until),
+        window=window.value,
     )
 
 
 @duo_router.get("/account")
 def get_account(
     user: User = Depends(require_creator),
+    session: Session = Depends(get_db),
 ) -> TrackedAccountResponse | None:
-    with get_db_session() as session:
-        account = session.execute(
-            select(DuoTrackedAccount).where(DuoTrackedAccount.owner_id == user.id)
-        ).scalar_one_or_none()
+    account = session.execute(
+        select(DuoTrackedAccount).where(DuoTrackedAccount.owner_id == user.id)
+    ).scalar_one_or_none()
 
-        if not account:
-            return None
+    if not account:
+        return None
 
-        match_count = session.execute(
-            select(func.count()).select_from(DuoMatch).where(DuoMatch.owner_id == user.id)
-        ).scalar() or 0
+    match_count = session.execute(
+        select(func.count()).select_from(DuoMatch).where(DuoMatch.owner_id == user.id)
+    ).scalar() or 0
+
+    job = latest_duo_ingest(session, user.id)
 
     return TrackedAccountResponse(
         game_name=account.game_name,
         tag_line=account.tag_line,
         last_updated=account.last_updated,
         match_count=match_count,
+        ingest=_ingest_to_response(job) if job else None,
     )
 
 
-@duo_router.post("/account")
+@duo_router.post("/account", status_code=202)
 def set_account(
     request: SetAccountRequest,
     user: User = Depends(require_creator),
-) -> ResponseMessage:
+    session: Session = Depends(get_db),
+) -> DuoIngestJobResponse:
     game_name = request.game_name.strip()
     tag_line = request.tag_line.strip()
     if not game_name or not tag_line:
         raise HTTPException(status_code=400, detail="Game name and tag are required")
 
+    # Don't hold a pool connection (from the auth lookup) through the Riot call.
+    release_connection(session)
     try:
         puuid = get_puuid(game_name, tag_line)
     except Exception:
         raise HTTPException(status_code=400, detail=f"Could not resolve {game_name}#{tag_line}")
 
-    with get_db_session() as session:
-        existing = session.execute(
-            select(DuoTrackedAccount).where(DuoTrackedAccount.owner_id == user.id)
-        ).scalar_one_or_none()
+    existing = session.execute(
+        select(DuoTrackedAccount).where(DuoTrackedAccount.owner_id == user.id)
+    ).scalar_one_or_none()
 
-        if existing:
-            existing.puuid = puuid
-            existing.game_name = game_name
-            existing.tag_line = tag_line
-            account = existing
-        else:
-            account = DuoTrackedAccount(
-                owner_id=user.id,
-                puuid=puuid,
-                game_name=game_name,
-                tag_line=tag_line,
-            )
-            session.add(account)
-            session.flush()
-
-        stored = _fetch_and_store_matches(session, account)
+    if existing:
+        existing.puuid = puuid
+        existing.game_name = game_name
+        existing.tag_line = tag_line
+        account = existing
+    else:
+        account = DuoTrackedAccount(
+            owner_id=user.id,
+            puuid=puuid,
+            game_name=game_name,
+            tag_line=tag_line,
+        )
+        session.add(account)
         session.flush()
-        _recalculate_duo_entries(session, user.id)
-        session.commit()
 
-    return ResponseMessage(message=f"Set account {game_name}#{tag_line}, fetched {stored} matches")
+    # Matches are fetched by the background worker; poll GET /account/ingest.
+    job = enqueue_duo_ingest(session, user.id, recalculate=True)
+    session.commit()
+
+    return _ingest_to_response(job, f"Set account {game_name}#{tag_line}, fetching matches in the background")
 
 
-@duo_router.post("/account/update")
+@duo_router.post("/account/update", status_code=202)
 def update_account(
     user: User = Depends(require_creator),
-) -> ResponseMessage:
-    with get_db_session() as session:
-        account = session.execute(
-            select(DuoTrackedAccount).where(DuoTrackedAccount.owner_id == user.id)
-        ).scalar_one_or_none()
+    session: Session = Depends(get_db),
+) -> DuoIngestJobResponse:
+    account = session.execute(
+        select(DuoTrackedAccount).where(DuoTrackedAccount.owner_id == user.id)
+    ).scalar_one_or_none()
 
-        if not account:
-            raise HTTPException(status_code=404, detail="No tracked account set")
+    if not account:
+        raise HTTPException(status_code=404, detail="No tracked account set")
+
+    job = enqueue_duo_ingest(session, user.id)
+    session.commit()
+
+    return _ingest_to_response(job, "Fetching new matches in the background")
 
-        stored = _fetch_and_store_matches(session, account)
-        session.flush()
-        updated = _recalculate_duo_entries(session, user.id)
-        session.commit()
 
-    return ResponseMessage(message=f"Fetched {stored} new matches, updated {updated} duo entries")
+@duo_router.get("/account/ingest")
+def get_account_ingest(
+    user: User = Depends(require_creator),
+    session: Session = Depends(get_db),
+) -> DuoIngestJobResponse | None:
+    """Progress of the most recent match ingestion (matches fetched/remaining)."""
+    job = latest_duo_ingest(session, user.id)
+    return _ingest_to_response(job) if job else None
+
+
+@duo_router.get("/suggestions")
+def get_suggestions(
+    min_games: int = Query(2, ge=1),
+    limit: int = Query(20, ge=1, le=100),
+    user: User = Depends(require_creator),
+    session: Session = Depends(get_db),
+) -> list[DuoSuggestionResponse]:
+    """Frequent teammates from stored matches that aren't linked to a duo entry yet."""
+    return [
+        DuoSuggestionResponse(
+            summoner_name=name,
+            games_played=games,
+            wins=wins,
+            losses=games - wins,
+            last_played_at=last_played_at,
+        )
+        for name, games, wins, last_played_at in suggest_duo_partners(session, user.id, min_games, limit)
+    ]
 
 
 @duo_router.post("/record")
 def record_duo(
     request: RecordDuoRequest,
     user: User = Depends(require_creator),
+    session: Session = Depends(get_db),
 ) -> ResponseMessage:
     name = request.name.strip()
     if not name:
         raise HTTPException(status_code=400, detail="Name cannot be empty")
 
-    with get_db_session() as session:
-        entry = DuoEntry(
-            owner_id=user.id,
-            name=None,
-            wins=0,
-            losses=0,
-        )
-        session.add(entry)
-        session.flush()
+    entry = DuoEntry(
+        owner_id=user.id,
+        name=None,
+        wins=0,
+        losses=0,
+    )
+    session.add(entry)
+    session.flush()
 
-        session.add(DuoEntryAccount(
-            entry_id=entry.id,
-            summoner_name=name,
-        ))
-        session.flush()
+    session.add(DuoEntryAccount(
+        entry_id=entry.id,
+        summoner_name=name,
+    ))
 
-        _recalculate_duo_entries(session, user.id)
-        session.commit()
+    recalculate_duo_entry(session, entry)
+    session.commit()
 
-        wins, losses = entry.wins, entry.losses
+    wins, losses = entry.wins, entry.losses
 
     return ResponseMessage(message=f"Added duo partner {name} ({wins}-{losses})")
 
@@ -279,22 +336,22 @@ def record_duo(
 def delete_duo(
     entry_id: uuid.UUID,
     user: User = Depends(require_creator),
+    session: Session = Depends(get_db),
 ) -> ResponseMessage:
-    with get_db_session() as session:
-        entry = session.execute(
-            select(DuoEntry).where(
-                DuoEntry.id == entry_id,
-                DuoEntry.owner_id == user.id,
-            )
-        ).scalar_one_or_none()
+    entry = session.execute(
+        select(DuoEntry).where(
+            DuoEntry.id == entry_id,
+            DuoEntry.owner_id == user.id,
+        )
+    ).scalar_one_or_none()
 
-        if not entry:
-            raise HTTPException(status_code=404, detail="Entry not found")
+    if not entry:
+        raise HTTPException(status_code=404, detail="Entry not found")
 
-        name = entry.display_name
-        session.delete(entry)
-        session.commit()
-        return ResponseMessage(message=f"Deleted {name}")
+    name = entry.display_name
+    session.delete(entry)
+    session.commit()
+    return ResponseMessage(message=f"Deleted {name}")
 
 
 @duo_router.put("/{entry_id}")
@@ -302,27 +359,27 @@ def update_duo(
     entry_id: uuid.UUID,
     request: UpdateDuoRequest,
     user: User = Depends(require_creator),
+    session: Session = Depends(get_db),
 ) -> ResponseMessage:
-    with get_db_session() as session:
-        entry = session.execute(
-            select(DuoEntry)
-            .options(selectinload(DuoEntry.accounts))
-            .where(
-                DuoEntry.id == entry_id,
-                DuoEntry.owner_id == user.id,
-            )
-        ).scalar_one_or_none()
+    entry = session.execute(
+        select(DuoEntry)
+        .options(selectinload(DuoEntry.accounts))
+        .where(
+            DuoEntry.id == entry_id,
+            DuoEntry.owner_id == user.id,
+        )
+    ).scalar_one_or_none()
 
-        if not entry:
-            raise HTTPException(status_code=404, detail="Entry not found")
+    if not entry:
+        raise HTTPException(status_code=404, detail="Entry not found")
 
-        if request.name is not None:
-            entry.name = request.name.strip() or None
-        if request.note is not None:
-            entry.note = request.note
+    if request.name is not None:
+        entry.name = request.name.strip() or None
+    if request.note is not None:
+        entry.note = request.note
 
-        session.commit()
-        return ResponseMessage(message=f"Updated {entry.display_name}")
+    session.commit()
+    return ResponseMessage(message=f"Updated {entry.display_name}")
 
 
 @duo_router.post("/{entry_id}/account")
@@ -330,37 +387,36 @@ def add_entry_account(
     entry_id: uuid.UUID,
     request: AddAccountRequest,
     user: User = Depends(require_creator),
+    session: Session = Depends(get_db),
 ) -> ResponseMessage:
     summoner_name = request.summoner_name.strip()
     if not summoner_name:
         raise HTTPException(status_code=400, detail="Summoner name cannot be empty")
 
-    with get_db_session() as session:
-        entry = session.execute(
-            select(DuoEntry).where(
-                DuoEntry.id == entry_id,
-                DuoEntry.owner_id == user.id,
-            )
-        ).scalar_one_or_none()
+    entry = session.execute(
+        select(DuoEntry).where(
+            DuoEntry.id == entry_id,
+            DuoEntry.owner_id == user.id,
+        )
+    ).scalar_one_or_none()
 
-        if not entry:
-            raise HTTPException(status_code=404, detail="Entry not found")
+    if not entry:
+        raise HTTPException(status_code=404, detail="Entry not found")
 
-        existing = session.execute(
-            select(DuoEntryAccount).where(
-                DuoEntryAccount.entry_id == entry_id,
-                DuoEntryAccount.summoner_name == summoner_name,
-            )
-        ).scalar_one_or_none()
+    existing = session.execute(
+        select(DuoEntryAccount).where(
+            DuoEntryAccount.entry_id == entry_id,
+            DuoEntryAccount.summoner_name == summoner_name,
+        )
+    ).scalar_one_or_none()
 
-        if existing:
-            raise HTTPException(status_code=409, detail=f"{summoner_name} already linked")
+    if existing:
+        raise HTTPException(status_code=409, detail=f"{summoner_name} already linked")
 
-        session.add(DuoEntryAccount(entry_id=entry_id, summoner_name=summoner_name))
-        session.flush()
+    session.add(DuoEntryAccount(entry_id=entry_id, summoner_name=summoner_name))
 
-        _recalculate_duo_entries(session, user.id)
-        session.commit()
+    recalculate_duo_entry(session, entry)
+    session.commit()
 
     return ResponseMessage(message=f"Added account {summoner_name}")
 
@@ -370,38 +426,37 @@ def remove_entry_account(
     entry_id: uuid.UUID,
     account_id: uuid.UUID,
     user: User = Depends(require_creator),
+    session: Session = Depends(get_db),
 ) -> ResponseMessage:
-    with get_db_session() as session:
-        entry = session.execute(
-            select(DuoEntry)
-            .options(selectinload(DuoEntry.accounts))
-            .where(
-                DuoEntry.id == entry_id,
-                DuoEntry.owner_id == user.id,
-            )
-        ).scalar_one_or_none()
-
-        if not entry:
-            raise HTTPException(status_code=404, detail="Entry not found")
-
-        account = session.execute(
-            select(DuoEntryAccount).where(
-                DuoEntryAccount.id == account_id,
-                DuoEntryAccount.entry_id == entry_id,
-            )
-        ).scalar_one_or_none()
-
-        if not account:
-            raise HTTPException(status_code=404, detail="Account not found")
-
-        if len(entry.accounts) <= 1:
-            raise HTTPException(status_code=400, detail="Cannot remove the last account")
-
-        name = account.summoner_name
-        session.delete(account)
-        session.flush()
+    entry = session.execute(
+        select(DuoEntry)
+        .options(selectinload(DuoEntry.accounts))
+        .where(
+            DuoEntry.id == entry_id,
+            DuoEntry.owner_id == user.id,
+        )
+    ).scalar_one_or_none()
+
+    if not entry:
+        raise HTTPException(status_code=404, detail="Entry not found")
+
+    account = session.execute(
+        select(DuoEntryAccount).where(
+            DuoEntryAccount.id == account_id,
+            DuoEntryAccount.entry_id == entry_id,
+        )
+    ).scalar_one_or_none()
+
+    if not account:
+        raise HTTPException(status_code=404, detail="Account not found")
+
+    if len(entry.accounts) <= 1:
+        raise HTTPException(status_code=400, detail="Cannot remove the last account")
+
+    name = account.summoner_name
+    session.delete(account)
 
-        _recalculate_duo_entries(session, user.id)
-        session.commit()
+    recalculate_duo_entry(session, entry)
+    session.commit()
 
     return ResponseMessage(message=f"Removed account {name}")
@@ -41,6 +41,30 @@ class DuoEntryResponse(BaseModel):
 class DuoListResponse(BaseModel):
     entries: list[DuoEntryResponse]
     since: str | None = None
+    until: str | None = None
+    window: str = "all"
+
+
+class DuoSuggestionResponse(BaseModel):
+    summoner_name: str
+    games_played: int
+    wins: int
+    losses: int
+    last_played_at: datetime
+
+
+class DuoIngestJobResponse(BaseModel):
+    id: str
+    status: str
+    message: str
+    matches_total: int | None = None
+    matches_fetched: int = 0
+    matches_remaining: int | None = None
+    matches_stored: int = 0
+    error: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
 
 
 class TrackedAccountResponse(BaseModel):
@@ -48,6 +72,7 @@ class TrackedAccountResponse(BaseModel):
     tag_line: str
     last_updated: datetime | None = None
     match_count: int = 0
+    ingest: DuoIngestJobResponse | None = None
 
 
 class ResponseMessage(BaseModel):
@@ -2,6 +2,7 @@ import uuid
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select, func
+from sqlalchemy.orm import Session
 
 from streampage.api.first.models import (
     RecordFirstRequest,
@@ -11,38 +12,35 @@ from streampage.api.first.models import (
     ResponseMessage,
 )
 from streampage.api.middleware.authenticator import require_creator
-from streampage.db.engine import get_db_session
+from streampage.db.engine import get_db
 from streampage.db.models import FirstEntry, User
+from streampage.services.owner import page_owner
 
 
 first_router = APIRouter()
 
 
-def _get_rosie_id() -> uuid.UUID:
-    with get_db_session() as session:
-        rosie = session.execute(
-            select(User).where(User.username == "rosie")
-        ).scalar_one_or_none()
-        if not rosie:
-            raise HTTPException(status_code=500, detail="Rosie user not found")
-        return rosie.id
+def _get_rosie_id(session: Session) -> uuid.UUID:
+    rosie = page_owner.get(session)
+    if not rosie:
+        raise HTTPException(status_code=500, detail="Rosie user not found")
+    return rosie.id
 
 
 @first_router.get("/list")
-def list_firsts() -> FirstListResponse:
-    owner_id = _get_rosie_id()
+def list_firsts(session: Session = Depends(get_db)) -> FirstListResponse:
+    owner_id = _get_rosie_id(session)
 
-    with get_db_session() as session:
-        entries = session.execute(
-            select(FirstEntry)
-            .where(FirstEntry.owner_id == owner_id)
-            .order_by(FirstEntry.first_count.desc())
-        ).scalars().all()
+    entries = session.execute(
+        select(FirstEntry)
+        .where(FirstEntry.owner_id == owner_id)
+        .order_by(FirstEntry.first_count.desc())
+    ).scalars().all()
 
-        since_dt = session.execute(
-            select(func.min(FirstEntry.created_at))
-            .where(FirstEntry.owner_id == owner_id)
-        ).scalar()
+    since_dt = session.execute(
+        select(func.min(FirstEntry.created_at))
+        .where(FirstEntry.owner_id == owner_id)
+    ).scalar()
 
     since_str = f"{since_dt.month}/{since_dt.day}/{since_dt.year}" if since_dt else None
 
@@ -64,49 +62,49 @@ def list_firsts() -> FirstListResponse:
 def record_first(
     request: RecordFirstRequest,
     user: User = Depends(require_creator),
+    session: Session = Depends(get_db),
 ) -> ResponseMessage:
     name = request.name.strip()
     if not name:
         raise HTTPException(status_code=400, detail="Name cannot be empty")
 
-    with get_db_session() as session:
-        existing = session.execute(
-            select(FirstEntry).where(
-                FirstEntry.owner_id == user.id,
-                FirstEntry.name == name,
-            )
-        ).scalar_one_or_none()
-
-        if existing:
-            existing.first_count += 1
-            session.commit()
-            return ResponseMessage(message=f"Incremented {name} to {existing.first_count}")
+    existing = session.execute(
+        select(FirstEntry).where(
+            FirstEntry.owner_id == user.id,
+            FirstEntry.name == name,
+        )
+    ).scalar_one_or_none()
 
-        entry = FirstEntry(owner_id=user.id, name=name)
-        session.add(entry)
+    if existing:
+        existing.first_count += 1
         session.commit()
-        return ResponseMessage(message=f"Recorded first for {name}")
+        return ResponseMessage(message=f"Incremented {name} to {existing.first_count}")
+
+    entry = FirstEntry(owner_id=user.id, name=name)
+    session.add(entry)
+    session.commit()
+    return ResponseMessage(message=f"Recorded first for {name}")
 
 
 @first_router.delete("/{entry_id}")
 def delete_first(
     entry_id: uuid.UUID,
     user: User = Depends(require_creator),
+    session: Session = Depends(get_db),
 ) -> ResponseMessage:
-    with get_db_session() as session:
-        entry = session.execute(
-            select(FirstEntry).where(
-                FirstEntry.id == entry_id,
-                FirstEntry.owner_id == user.id,
-            )
-        ).scalar_one_or_none()
+    entry = session.execute(
+        select(FirstEntry).where(
+            FirstEntry.id == entry_id,
+            FirstEntry.owner_id == user.id,
+        )
+    ).scalar_one_or_none()
 
-        if not entry:
-            raise HTTPException(status_code=404, detail="Entry not found")
+    if not entry:
+        raise HTTPException(status_code=404, detail="Entry not found")
 
-        session.delete(entry)
-        session.commit()
-        return ResponseMessage(message=f"Deleted {entry.name}")
+    session.delete(entry)
+    session.commit()
+    return ResponseMessage(message=f"Deleted {entry.name}")
 
 
 @first_router.put("/{entry_id}")
@@ -114,24 +112,24 @@ def update_first(
     entry_id: uuid.UUID,
     request: UpdateFirstRequest,
     user: User = Depends(require_creator),
+    session: Session = Depends(get_db),
 ) -> ResponseMessage:
-    with get_db_session() as session:
-        entry = session.execute(
-            select(FirstEntry).where(
-                FirstEntry.id == entry_id,
-                FirstEntry.owner_id == user.id,
-            )
-        ).scalar_one_or_none()
-
-        if not entry:
-            raise HTTPException(status_code=404, detail="Entry not found")
-
-        if request.name is not None:
-            entry.name = request.name.strip()
-        if request.first_count is not None:
-            if request.first_count < 0:
-                raise HTTPException(status_code=400, detail="Count cannot be negative")
-            entry.first_count = request.first_count
-
-        session.commit()
-        return ResponseMessage(message=f"Updated {entry.name}")
+    entry = session.execute(
+        select(FirstEntry).where(
+            FirstEntry.id == entry_id,
+            FirstEntry.owner_id == user.id,
+        )
+    ).scalar_one_or_none()
+
+    if not entry:
+        raise HTTPException(status_code=404, detail="Entry not found")
+
+    if request.name is not None:
+        entry.name = request.name.strip()
+    if request.first_count is not None:
+        if request.first_count < 0:
+            raise HTTPException(status_code=400, detail="Count cannot be negative")
+        entry.first_count = request.first_count
+
+    session.commit()
+    return ResponseMessage(message=f"Updated {entry.name}")
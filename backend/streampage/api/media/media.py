@@ -1,8 +1,11 @@
 from typing import Optional
 import uuid
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 
-from streampage.api.middleware.authenticator import get_current_user, get_optional_current_user
+from streampage.api.middleware.authenticator import get_current_user, get_optional_current_user_async
 from streampage.api.media.models import (
     AddMediaRequest,
     RemoveMediaRequest,
@@ -14,7 +17,7 @@ from streampage.api.media.models import (
     MediaResponse,
     MediaListResponse,
 )
-from streampage.db.engine import get_db_session
+from streampage.db.engine import get_async_db, get_db
 from streampage.db.models import Media, MediaUpvote, User
 
 
@@ -32,176 +35,178 @@ def require_rosie(user: User) -> User:
 def add_media(
     request: AddMediaRequest,
     user=Depends(get_current_user),
+    session: Session = Depends(get_db),
 ) -> ResponseMessage:
     """Add a new media entry (any logged-in user)."""
     
-    with get_db_session() as session:
-        # Get max display_order to add at the end
-        max_order = session.query(Media).filter(
-            Media.category == request.category
-        ).count()
-
-        entry = Media(
-            category=request.category,
-            name=request.name,
-            info=request.info,
-            url=request.url,
-            display_order=max_order,
-            contributor_id=user.id,
-        )
-        session.add(entry)
-        session.commit()
+    # Get max display_order to add at the end
+    max_order = session.query(Media).filter(
+        Media.category == request.category
+    ).count()
 
-        return ResponseMessage(message="Successfully added media")
+    entry = Media(
+        category=request.category,
+        name=request.name,
+        info=request.info,
+        url=request.url,
+        display_order=max_order,
+        contributor_id=user.id,
+    )
+    session.add(entry)
+    session.commit()
+
+    return ResponseMessage(message="Successfully added media")
 
 
 @media_router.delete("/remove")
 def remove_media(
     request: RemoveMediaRequest,
     user=Depends(get_current_user),
+    session: Session = Depends(get_db),
 ) -> ResponseMessage:
     """Remove a media entry (rosie only)."""
     require_rosie(user)
     
-    with get_db_session() as session:
-        entry = session.query(Media).filter(Media.id == request.media_id).first()
-        if not entry:
-            raise HTTPException(status_code=404, detail="Media not found")
+    entry = session.query(Media).filter(Media.id == request.media_id).first()
+    if not entry:
+        raise HTTPException(status_code=404, detail="Media not found")
 
-        session.delete(entry)
-        session.commit()
+    session.delete(entry)
+    session.commit()
 
-        return ResponseMessage(message="Successfully removed media")
+    return ResponseMessage(message="Successfully removed media")
 
 
 @media_router.put("/edit")
 def edit_media(
     request: EditMediaRequest,
     user=Depends(get_current_user),
+    session: Session = Depends(get_db),
 ) -> ResponseMessage:
     """Edit a media entry (rosie only)."""
     require_rosie(user)
     
-    with get_db_session() as session:
-        entry = session.query(Media).filter(Media.id == request.media_id).first()
-        if not entry:
-            raise HTTPException(status_code=404, detail="Media not found")
-
-        # Update only provided fields
-        if request.category is not None:
-            entry.category = request.category
-        if request.name is not None:
-            entry.name = request.name
-        if request.info is not None:
-            entry.info = request.info
-        if request.url is not None:
-            entry.url = request.url
+    entry = session.query(Media).filter(Media.id == request.media_id).first()
+    if not entry:
+        raise HTTPException(status_code=404, detail="Media not found")
 
-        session.commit()
+    # Update only provided fields
+    if request.category is not None:
+        entry.category = request.category
+    if request.name is not None:
+        entry.name = request.name
+    if request.info is not None:
+        entry.info = request.info
+    if request.url is not None:
+        entry.url = request.url
+
+    session.commit()
 
-        return ResponseMessage(message="Successfully updated media")
+    return ResponseMessage(message="Successfully updated media")
 
 
 @media_router.post("/upvote")
 def upvote_media(
     request: UpvoteMediaRequest,
     user=Depends(get_current_user),
+    session: Session = Depends(get_db),
 ) -> ResponseMessage:
     """Toggle upvote on a media entry (any logged-in user)."""
-    with get_db_session() as session:
-        # Check if media exists
-        media = session.query(Media).filter(Media.id == request.media_id).first()
-        if not media:
-            raise HTTPException(status_code=404, detail="Media not found")
-
-        # Check if user already upvoted
-        existing_upvote = session.query(MediaUpvote).filter(
-            MediaUpvote.media_id == request.media_id,
-            MediaUpvote.user_id == user.id,
-        ).first()
-
-        if existing_upvote:
-            # Remove upvote (toggle off)
-            session.delete(existing_upvote)
-            session.commit()
-            return ResponseMessage(message="Upvote removed")
-        else:
-            # Add upvote
-            upvote = MediaUpvote(
-                media_id=media.id,
-                user_id=user.id,
-            )
-            session.add(upvote)
-            session.commit()
-            return ResponseMessage(message="Upvote added")
+    # Check if media exists
+    media = session.query(Media).filter(Media.id == request.media_id).first()
+    if not media:
+        raise HTTPException(status_code=404, detail="Media not found")
+
+    # Check if user already upvoted
+    existing_upvote = session.query(MediaUpvote).filter(
+        MediaUpvote.media_id == request.media_id,
+        MediaUpvote.user_id == user.id,
+    ).first()
+
+    if existing_upvote:
+        # Remove upvote (toggle off)
+        session.delete(existing_upvote)
+        session.commit()
+        return ResponseMessage(message="Upvote removed")
+    else:
+        # Add upvote
+        upvote = MediaUpvote(
+            media_id=media.id,
+            user_id=user.id,
+        )
+        session.add(upvote)
+        session.commit()
+        return ResponseMessage(message="Upvote added")
 
 
 @media_router.get("/list")
-def get_media_list(
+async def get_media_list(
     category: Optional[str] = None,
-    user: Optional[User] = Depends(get_optional_current_user),
+    user: Optional[User] = Depends(get_optional_current_user_async),
+    session: AsyncSession = Depends(get_async_db),
 ) -> MediaListResponse:
     """Get all media entries, optionally filtered by category."""
-    with get_db_session() as session:
-        query = session.query(Media)
-        
-        if category:
-            query = query.filter(Media.category == category)
-        
-        entries = query.order_by(Media.display_order).all()
-
-        # Get the set of media IDs the current user has upvoted
-        user_upvoted_media_ids = set()
-        if user:
-            user_upvotes = session.query(MediaUpvote.media_id).filter(
-                MediaUpvote.user_id == user.id
-            ).all()
-            user_upvoted_media_ids = {upvote.media_id for upvote in user_upvotes}
-
-        media_list = []
-        for entry in entries:
-            # Count upvotes
-            upvote_count = len(entry.upvotes)
-            # Check if current user has upvoted this media
-            has_upvoted = entry.id in user_upvoted_media_ids
-            # Get contributor username
-            contributor_username = entry.contributor.username if entry.contributor else None
-
-            media_list.append(
-                MediaResponse(
-                    id=str(entry.id),
-                    category=entry.category.value,
-                    name=entry.name,
-                    info=entry.info,
-                    url=entry.url,
-                    display_order=entry.display_order,
-                    upvote_count=upvote_count,
-                    user_has_upvoted=has_upvoted,
-                    contributor_username=contributor_username,
-                )
+    stmt = select(Media).options(
+        selectinload(Media.upvotes),
+        selectinload(Media.contributor),
+    )
+    
+    if category:
+        stmt = stmt.where(Media.category == category)
+    
+    entries = (await session.execute(stmt.order_by(Media.display_order))).scalars().all()
+
+    # Get the set of media IDs the current user has upvoted
+    user_upvoted_media_ids = set()
+    if user:
+        user_upvoted_media_ids = set((await session.execute(
+            select(MediaUpvote.media_id).where(MediaUpvote.user_id == user.id)
+        )).scalars().all())
+
+    media_list = []
+    for entry in entries:
+        # Count upvotes
+        upvote_count = len(entry.upvotes)
+        # Check if current user has upvoted this media
+        has_upvoted = entry.id in user_upvoted_media_ids
+        # Get contributor username
+        contributor_username = entry.contributor.username if entry.contributor else None
+
+        media_list.append(
+            MediaResponse(
+                id=str(entry.id),
+                category=entry.category.value,
+                name=entry.name,
+                info=entry.info,
+                url=entry.url,
+                display_order=entry.display_order,
+                upvote_count=upvote_count,
+                user_has_upvoted=has_upvoted,
+                contributor_username=contributor_username,
             )
+        )
 
-        return MediaListResponse(media=media_list)
+    return MediaListResponse(media=media_list)
 
 
 @media_router.post("/sort")
 def sort_media(
     request: SortMediaRequest,
     user=Depends(get_current_user),
+    session: Session = Depends(get_db),
 ) -> ResponseMessage:
     """Update the display order of media entries (rosie only)."""
     require_rosie(user)
     
-    with get_db_session() as session:
-        # Update display_order for each media item
-        for index, media_id in enumerate(request.media_ids):
-            entry = session.query(Media).filter(Media.id == media_id).first()
-            if entry:
-                entry.display_order = index
+    # Update display_order for each media item
+    for index, media_id in enumerate(request.media_ids):
+        entry = session.query(Media).filter(Media.id == media_id).first()
+        if entry:
+            entry.display_order = index
 
-        session.commit()
+    session.commit()
 
-        return ResponseMessage(message="Successfully sorted media")
+    return ResponseMessage(message="Successfully sorted media")
 
 
 @media_router.patch("/{media_id}")
@@ -209,57 +214,57 @@ def update_media(
     media_id: str,
     request: UpdateMediaRequest,
     user=Depends(get_current_user),
+    session: Session = Depends(get_db),
 ) -> ResponseMessage:
     """Update a media entry's name and/or info. Only the contributor can update."""
-    with get_db_session() as session:
-        try:
-            media_uuid = uuid.UUID(media_id)
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid media ID format")
-        
-        entry = session.query(Media).filter(Media.id == media_uuid).first()
-        if not entry:
-            raise HTTPException(status_code=404, detail="Media not found")
-        
-        # Check if user is the contributor or rosie (admin)
-        if entry.contributor_id != user.id and user.username != "rosie":
-            raise HTTPException(status_code=403, detail="Only the contributor can update this media")
-        
-        # Update only provided fields
-        if request.name is not None:
-            entry.name = request.name
-        if request.info is not None:
-            entry.info = request.info
-        if request.url is not None:
-            entry.url = request.url
-        
-        session.commit()
-        
-        return ResponseMessage(message="Successfully updated media")
+    try:
+        media_uuid = uuid.UUID(media_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid media ID format")
+    
+    entry = session.query(Media).filter(Media.id == media_uuid).first()
+    if not entry:
+        raise HTTPException(status_code=404, detail="Media not found")
+    
+    # Check if user is the contributor or rosie (admin)
+    if entry.contributor_id != user.id and user.username != "rosie":
+        raise HTTPException(status_code=403, detail="Only the contributor can update this media")
+    
+    # Update only provided fields
+    if request.name is not None:
+        entry.name = request.name
+    if request.info is not None:
+        entry.info = request.info
+    if request.url is not None:
+        entry.url = request.url
+    
+    session.commit()
+    
+    return ResponseMessage(message="Successfully updated media")
 
 
 @media_router.delete("/{media_id}")
 def delete_media(
     media_id: str,
     user=Depends(get_current_user),
+    session: Session = Depends(get_db),
 ) -> ResponseMessage:
     """Delete a media entry. Only the contributor can delete."""
-    with get_db_session() as session:
-        try:
-            media_uuid = uuid.UUID(media_id)
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid media ID format")
-        
-        entry = session.query(Media).filter(Media.id == media_uuid).first()
-        if not entry:
-            raise HTTPException(status_code=404, detail="Media not found")
-        
-        # Check if user is the contributor or rosie (admin)
-        if entry.contributor_id != user.id and user.username != "rosie":
-            raise HTTPException(status_code=403, detail="Only the contributor can delete this media")
-        
-        session.delete(entry)
-        session.commit()
-        
-        return ResponseMessage(message="Successfully deleted media")
+    try:
+        media_uuid = uuid.UUID(media_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid media ID format")
+    
+    entry = session.query(Media).filter(Media.id == media_uuid).first()
+    if not entry:
+        raise HTTPException(status_code=404, detail="Media not found")
+    
+    # Check if user is the contributor or rosie (admin)
+    if entry.contributor_id != user.id and user.username != "rosie":
+        raise HTTPException(status_code=403, detail="Only the contributor can delete this media")
+    
+    session.delete(entry)
+    session.commit()
+    
+    return ResponseMessage(message="Successfully deleted media")
 
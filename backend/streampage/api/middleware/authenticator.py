@@ -1,4 +1,5 @@
 import logging
+import uuid
 from datetime import datetime
 from datetime import timedelta
 from datetime import timezone
@@ -8,14 +9,20 @@ import jwt
 logger = logging.getLogger(__name__)
 from fastapi import Depends
 from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
 from streampage.config import ALGORITHM
 from streampage.config import OAUTH2_SCHEME
 from streampage.config import OAUTH2_SCHEME_OPTIONAL
 from streampage.config import SECRET_KEY
-from streampage.db.engine import get_db_session
+from streampage.db.engine import get_async_db
+from streampage.db.engine import get_db
 from streampage.db.models import User
 from streampage.db.models import UserLogin
+from streampage.services.owner import OWNER_USERNAME
+from streampage.services.user_cache import user_cache
 
 
 def _encode_token(token_data: dict) -> str:
@@ -25,11 +32,17 @@ def _encode_token(token_data: dict) -> str:
     return encoded
 
 
+def _is_creator(username: str) -> bool:
+    return username.lower() == OWNER_USERNAME
+
+
 def create_access_token(user_login: UserLogin) -> tuple[str, datetime]:
     expires_at = datetime.now(timezone.utc) + timedelta(minutes=15)
 
     token_data = {
         "username": user_login.username,
+        "user_id": str(user_login.user_id),
+        "creator": _is_creator(user_login.username),
         "type": "access",
         "exp": expires_at,
     }
@@ -41,6 +54,7 @@ def create_refresh_token(user_login: UserLogin) -> tuple[str, datetime]:
 
     token_data = {
         "username": user_login.username,
+        "user_id": str(user_login.user_id),
         "type": "refresh",
         "exp": expires_at,
     }
@@ -69,9 +83,27 @@ def validate_refresh_token(token: str) -> str:
     return username
 
 
-def get_current_user(token: str = Depends(OAUTH2_SCHEME)) -> User:
+def _token_user_id(payload: dict) -> uuid.UUID | None:
+    """Return the user id claim, or None for tokens issued before it existed."""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        return uuid.UUID(payload["user_id"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _user_query(payload: dict, username: str):
+    """Select the token's user, requiring that it still has a login."""
+    stmt = select(User).join(User.logins)
+    user_id = _token_user_id(payload)
+    if user_id is not None:
+        return stmt.where(User.id == user_id)
+    return stmt.where(User.username == username)
+
+
+def get_token_payload(token: str = Depends(OAUTH2_SCHEME)) -> dict:
+    """Decode the bearer token (once per request; FastAPI caches dependencies)."""
+    try:
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except jwt.ExpiredSignatureError:
         logger.error("Token has expired")
         raise HTTPException(status_code=401, detail="Token has expired")
@@ -84,31 +116,41 @@ def get_current_user(token: str = Depends(OAUTH2_SCHEME)) -> User:
             status_code=401, detail=f"Error getting current user: {str(e)}"
         )
 
+
+def get_current_user(
+    payload: dict = Depends(get_token_payload),
+    db: Session = Depends(get_db),
+) -> User:
     username = payload.get("username")
     if not isinstance(username, str) or username is None:
         raise HTTPException(status_code=401, detail="Can't get username from payload")
 
-    with get_db_session() as db:
-        try:
-            user_login = (
-                db.query(User)
-                .join(User.logins)
-                .filter(User.username == username)
-                .first()
-            )
-            if user_login is None:
-                raise HTTPException(status_code=401, detail="Can't get user")
-            return user_login
-        except Exception as e:
-            logger.error(f"Database error in get_current_user: {str(e)}")
-            raise HTTPException(status_code=401, detail="Database error")
-
-
-def get_optional_current_user(token: str | None = Depends(OAUTH2_SCHEME_OPTIONAL)) -> User | None:
-    """Get the current user if authenticated, otherwise return None."""
+    user_id = _token_user_id(payload)
+    if user_id is not None:
+        cached = user_cache.get(user_id)
+        if cached is not None:
+            return cached
+
+    try:
+        user = db.execute(_user_query(payload, username)).scalars().first()
+    except Exception as e:
+        logger.error(f"Database error in get_current_user: {str(e)}")
+        raise HTTPException(status_code=401, detail="Database error")
+    if user is None:
+        raise HTTPException(status_code=401, detail="Can't get user")
+
+    # End the read transaction so the request session hands its connection
+    # back to the pool while the handler does non-DB work (uploads, etc.).
+    db.commit()
+    user_cache.put(user)
+    return user
+
+
+def _optional_token_payload(token: str | None) -> tuple[dict, str] | None:
+    """Decode an optional bearer token, returning (payload, username) or None."""
     if not token:
         return None
-    
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except (jwt.ExpiredSignatureError, jwt.InvalidTokenError, Exception):
@@ -117,25 +159,76 @@ def get_optional_current_user(token: str | None = Depends(OAUTH2_SCHEME_OPTIONAL
     username = payload.get("username")
     if not isinstance(username, str) or username is None:
         return None
+    return payload, username
+
 
-    with get_db_session() as db:
-        try:
-            user = (
-                db.query(User)
-                .join(User.logins)
-                .filter(User.username == username)
-                .first()
-            )
-            return user
-        except Exception:
-            return None
+def _cached_token_user(payload: dict) -> User | None:
+    user_id = _token_user_id(payload)
+    return user_cache.get(user_id) if user_id is not None else None
 
 
-def require_creator(user: User = Depends(get_current_user)) -> User:
+def get_optional_current_user(
+    token: str | None = Depends(OAUTH2_SCHEME_OPTIONAL),
+    db: Session = Depends(get_db),
+) -> User | None:
+    """Get the current user if authenticated, otherwise return None."""
+    decoded = _optional_token_payload(token)
+    if decoded is None:
+        return None
+    payload, username = decoded
+
+    cached = _cached_token_user(payload)
+    if cached is not None:
+        return cached
+
+    try:
+        user = db.execute(_user_query(payload, username)).scalars().first()
+        db.commit()
+    except Exception:
+        db.rollback()
+        return None
+    if user is not None:
+        user_cache.put(user)
+    return user
+
+
+async def get_optional_current_user_async(
+    token: str | None = Depends(OAUTH2_SCHEME_OPTIONAL),
+    db: AsyncSession = Depends(get_async_db),
+) -> User | None:
+    """Async-session variant of get_optional_current_user for async routes."""
+    decoded = _optional_token_payload(token)
+    if decoded is None:
+        return None
+    payload, username = decoded
+
+    cached = _cached_token_user(payload)
+    if cached is not None:
+        return cached
+
+    try:
+        user = (await db.execute(_user_query(payload, username))).scalars().first()
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        return None
+    if user is not None:
+        user_cache.put(user)
+    return user
+
+
+def require_creator(
+    user: User = Depends(get_current_user),
+    payload: dict = Depends(get_token_payload),
+) -> User:
     """Require that the current user is the creator (rosie).
     
+    Authorises from the token's ``creator`` claim; tokens issued before the
+    claim existed fall back to the resolved username.
+    
     Args:
         user: The authenticated user from get_current_user
+        payload: The decoded access token
         
     Returns:
         The user if they are the creator
@@ -143,7 +236,10 @@ def require_creator(user: User = Depends(get_current_user)) -> User:
     Raises:
         HTTPException: 403 if the user is not the creator
     """
-    if user.username.lower() != "rosie":
+    creator = payload.get("creator")
+    if not isinstance(creator, bool):
+        creator = _is_creator(user.username)
+    if not creator:
         raise HTTPException(
             status_code=403, 
             detail="Only the page creator can perform this action"
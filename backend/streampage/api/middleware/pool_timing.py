@@ -0,0 +1,48 @@
+import logging
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from streampage.config import DB_HOLD_WARN_MS
+from streampage.db.engine import PoolHoldStats, pool_hold_stats
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimingMiddleware:
+    """Measure how long each request keeps sync pool connections checked out.
+
+    Requests over DB_HOLD_WARN_MS are logged. With send_header, responses also
+    carry ``Server-Timing: db-pool;dur=<ms>`` (connections checked back in
+    before the response started); keep that off in production, where it
+    would expose internal timings to anyone. Pure ASGI so it adds no task or
+    response wrapping per request; only installed when DB_POOL_TIMING is set.
+    """
+
+    def __init__(self, app: ASGIApp, send_header: bool = False):
+        self.app = app
+        self.send_header = send_header
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = PoolHoldStats()
+        token = pool_hold_stats.set(stats)
+
+        async def send_with_timing(message: Message) -> None:
+            if self.send_header and message["type"] == "http.response.start":
+                value = f'db-pool;dur={stats.held_seconds * 1000:.1f};desc="{stats.checkouts} checkouts"'
+                message["headers"] = [*message.get("headers", []), (b"server-timing", value.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            pool_hold_stats.reset(token)
+            held_ms = stats.held_seconds * 1000
+            if held_ms > DB_HOLD_WARN_MS:
+                logger.warning(
+                    "%s %s held pool connections for %.0fms (%d checkouts, longest %.0fms)",
+                    scope["method"], scope["path"], held_ms, stats.checkouts, stats.longest_seconds * 1000,
+                )
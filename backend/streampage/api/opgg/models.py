@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Optional
 from pydantic import BaseModel
 
@@ -59,3 +60,15 @@ class OpggAccountResponse(BaseModel):
 class OpggAccountsResponse(BaseModel):
     accounts: list[OpggAccountResponse]
 
+
+class OpggRefreshJobResponse(BaseModel):
+    id: str
+    status: str
+    message: str
+    accounts_total: int | None = None
+    accounts_refreshed: int = 0
+    accounts_failed: int = 0
+    retry_after_seconds: int = 0
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
@@ -2,6 +2,9 @@ from typing import Optional
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
 from streampage.api.middleware.authenticator import get_current_user, require_creator
 from streampage.api.riot.models import (
@@ -14,9 +17,10 @@ from streampage.api.riot.models import (
     ResponseMessage,
     UpdateIntListEntryRequest,
 )
-from streampage.db.engine import get_db_session
+from streampage.db.engine import get_async_db, get_db, release_connection
 from streampage.db.models import IntListEntry, SummonerData, User
-from streampage.db.riot import get_puuid, fetch_and_store_summoner_data
+from streampage.db.riot import fetch_summoner_data, get_puuid, store_summoner_data
+from streampage.services.owner import page_owner
 
 
 riot_router = APIRouter()
@@ -25,143 +29,149 @@ riot_router = APIRouter()
 def add_to_int_list(
     add_to_int_list_request: AddToIntListRequest,
     user=Depends(get_current_user),
+    session: Session = Depends(get_db),
 ) -> ResponseMessage:
-    with get_db_session() as session:
-        # Lookup rosie's user_id (hardcoded page owner for now)
-        rosie_user = session.query(User).filter(User.username == "rosie").first()
-        if not rosie_user:
-            return ResponseMessage(message="Page owner not found")
-        
-        summoners_puuid = get_puuid(
-            add_to_int_list_request.summoner_name, 
-            add_to_int_list_request.tagline
-        )
-        if not summoners_puuid:
-            return ResponseMessage(message="Invalid summoner name or tagline")
-
-        # Fetch and store summoner data (this will also give us the rank)
-        summoner_data = fetch_and_store_summoner_data(
-            session,
-            summoners_puuid,
-            add_to_int_list_request.summoner_name,
-            add_to_int_list_request.tagline,
-        )
-        
-        # Format rank_when_added from fetched data
-        rank_when_added = None
-        if summoner_data.tier:
-            rank_when_added = f"{summoner_data.tier} {summoner_data.rank or ''} {summoner_data.league_points or 0}LP"
-
-        entry = IntListEntry(
-            page_owner_id=rosie_user.id,
-            contributor_id=user.id,
-            puuid=summoners_puuid,
-            summoner_name=add_to_int_list_request.summoner_name,
-            summoner_tag=add_to_int_list_request.tagline,
-            user_reason=add_to_int_list_request.user_reason,
-            rank_when_added=rank_when_added,
-        )
-        session.add(entry)
-        session.commit()
-
-        return ResponseMessage(message="Successfully added to int list")
+    # Lookup rosie's user_id (hardcoded page owner for now)
+    rosie_user = page_owner.get(session)
+    if not rosie_user:
+        return ResponseMessage(message="Page owner not found")
+    # Don't hold a pool connection through the Riot calls below.
+    release_connection(session)
+    
+    summoners_puuid = get_puuid(
+        add_to_int_list_request.summoner_name, 
+        add_to_int_list_request.tagline
+    )
+    if not summoners_puuid:
+        return ResponseMessage(message="Invalid summoner name or tagline")
+
+    # Fetch and store summoner data (this will also give us the rank)
+    stored = session.get(SummonerData, summoners_puuid)
+    release_connection(session)
+    fetched = fetch_summoner_data(
+        summoners_puuid,
+        add_to_int_list_request.summoner_name,
+        add_to_int_list_request.tagline,
+        stored,
+        puuid_verified=True,
+    )
+    summoner_data = store_summoner_data(session, summoners_puuid, fetched)
+    
+    # Format rank_when_added from fetched data
+    rank_when_added = None
+    if summoner_data.tier:
+        rank_when_added = f"{summoner_data.tier} {summoner_data.rank or ''} {summoner_data.league_points or 0}LP"
+
+    entry = IntListEntry(
+        page_owner_id=rosie_user.id,
+        contributor_id=user.id,
+        puuid=summoners_puuid,
+        summoner_name=add_to_int_list_request.summoner_name,
+        summoner_tag=add_to_int_list_request.tagline,
+        user_reason=add_to_int_list_request.user_reason,
+        rank_when_added=rank_when_added,
+    )
+    session.add(entry)
+    session.commit()
+
+    return ResponseMessage(message="Successfully added to int list")
 
 
 @riot_router.get("/int_list")
-def get_int_list(
+async def get_int_list(
     contributor_id: Optional[str] = None,
+    session: AsyncSession = Depends(get_async_db),
 ) -> IntListResponse:
     """Get int list entries for rosie's page, optionally filtered by contributor.
     
     Displays stored summoner data from the database. No automatic refresh.
     """
-    with get_db_session() as session:
-        # Find rosie (hardcoded page owner)
-        rosie_user = session.query(User).filter(User.username == "rosie").first()
-        if not rosie_user:
-            return IntListResponse(entries=[])
-        
-        # Query entries for rosie's page, join with contributor user
-        query = session.query(IntListEntry, User).join(
-            User, IntListEntry.contributor_id == User.id
-        ).filter(IntListEntry.page_owner_id == rosie_user.id)
-        
-        # Optionally filter by contributor
-        if contributor_id:
-            query = query.filter(IntListEntry.contributor_id == contributor_id)
-        
-        results = query.all()
-        
-        entries = []
-        for entry, contributor_user in results:
-            # Get stored summoner data
-            summoner_data = session.query(SummonerData).filter(SummonerData.puuid == entry.puuid).first()
-            
-            # Format current rank from stored data
-            current_rank = "UNRANKED"
-            recent_matches = []
-            
-            if summoner_data:
-                if summoner_data.tier:
-                    current_rank = f"{summoner_data.tier} {summoner_data.rank or ''} {summoner_data.league_points or 0}LP"
-                
-                # Convert stored match data to RecentMatch models
-                if summoner_data.recent_matches:
-                    recent_matches = [
-                        RecentMatch(
-                            champion_id=match.get("champion_id", 0),
-                            champion_name=match.get("champion_name", "Unknown"),
-                            win=match.get("win", False),
-                            kills=match.get("kills", 0),
-                            deaths=match.get("deaths", 0),
-                            assists=match.get("assists", 0),
-                        )
-                        for match in summoner_data.recent_matches
-                    ]
+    # Find rosie (hardcoded page owner)
+    rosie_user = await page_owner.get_async(session)
+    if not rosie_user:
+        return IntListResponse(entries=[])
+    
+    # Query entries for rosie's page, join with contributor user and the
+    # stored summoner data in the same round trip
+    stmt = (
+        select(IntListEntry, User, SummonerData)
+        .join(User, IntListEntry.contributor_id == User.id)
+        .outerjoin(SummonerData, SummonerData.puuid == IntListEntry.puuid)
+        .where(IntListEntry.page_owner_id == rosie_user.id)
+    )
+    
+    # Optionally filter by contributor
+    if contributor_id:
+        stmt = stmt.where(IntListEntry.contributor_id == contributor_id)
+    
+    results = (await session.execute(stmt)).all()
+    
+    entries = []
+    for entry, contributor_user, summoner_data in results:
+        # Format current rank from stored data
+        current_rank = "UNRANKED"
+        recent_matches = []
+        
+        if summoner_data:
+            if summoner_data.tier:
+                current_rank = f"{summoner_data.tier} {summoner_data.rank or ''} {summoner_data.league_points or 0}LP"
             
-            entries.append(
-                IntListEntryResponse(
-                    id=str(entry.id),
-                    summoner_name=entry.summoner_name,
-                    summoner_tag=entry.summoner_tag,
-                    user_reason=entry.user_reason,
-                    contributor_username=contributor_user.username,
-                    rank_when_added=entry.rank_when_added,
-                    current_rank=current_rank,
-                    recent_matches=recent_matches,
-                )
+            # Convert stored match data to RecentMatch models
+            if summoner_data.recent_matches:
+                recent_matches = [
+                    RecentMatch(
+                        champion_id=match.get("champion_id", 0),
+                        champion_name=match.get("champion_name", "Unknown"),
+                        win=match.get("win", False),
+                        kills=match.get("kills", 0),
+                        deaths=match.get("deaths", 0),
+                        assists=match.get("assists", 0),
+                    )
+                    for match in summoner_data.recent_matches
+                ]
+        
+        entries.append(
+            IntListEntryResponse(
+                id=str(entry.id),
+                summoner_name=entry.summoner_name,
+                summoner_tag=entry.summoner_tag,
+                user_reason=entry.user_reason,
+                contributor_username=contributor_user.username,
+                rank_when_added=entry.rank_when_added,
+                current_rank=current_rank,
+                recent_matches=recent_matches,
             )
-        
-        return IntListResponse(entries=entries)
+        )
+    
+    return IntListResponse(entries=entries)
 
 
 @riot_router.get("/int_list/contributors")
-def get_int_list_contributors() -> IntListContributorsResponse:
+def get_int_list_contributors(session: Session = Depends(get_db)) -> IntListContributorsResponse:
     """Get unique contributors to rosie's int list."""
-    with get_db_session() as session:
-        # Find rosie (hardcoded page owner)
-        rosie_user = session.query(User).filter(User.username == "rosie").first()
-        if not rosie_user:
-            return IntListContributorsResponse(contributors=[])
-        
-        # Get distinct contributors for rosie's page
-        results = (
-            session.query(User)
-            .join(IntListEntry, IntListEntry.contributor_id == User.id)
-            .filter(IntListEntry.page_owner_id == rosie_user.id)
-            .distinct()
-            .all()
+    # Find rosie (hardcoded page owner)
+    rosie_user = page_owner.get(session)
+    if not rosie_user:
+        return IntListContributorsResponse(contributors=[])
+    
+    # Get distinct contributors for rosie's page
+    results = (
+        session.query(User)
+        .join(IntListEntry, IntListEntry.contributor_id == User.id)
+        .filter(IntListEntry.page_owner_id == rosie_user.id)
+        .distinct()
+        .all()
+    )
+    
+    contributors = [
+        IntListContributor(
+            user_id=str(user.id),
+            username=user.username,
         )
-        
-        contributors = [
-            IntListContributor(
-                user_id=str(user.id),
-                username=user.username,
-            )
-            for user in results
-        ]
-        
-        return IntListContributorsResponse(contributors=contributors)
+        for user in results
+    ]
+    
+    return IntListContributorsResponse(contributors=contributors)
 
 
 @riot_router.patch("/int_list/{entry_id}")
@@ -169,45 +179,45 @@ def update_int_list_entry(
     entry_id: str,
     request: UpdateIntListEntryRequest,
     user=Depends(get_current_user),
+    session: Session = Depends(get_db),
 ) -> ResponseMessage:
     """Update the reason for an int list entry. Only the contributor or rosie can update."""
-    with get_db_session() as session:
-        try:
-            entry_uuid = uuid.UUID(entry_id)
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid entry ID format")
-        
-        entry = session.query(IntListEntry).filter(IntListEntry.id == entry_uuid).first()
-        if not entry:
-            raise HTTPException(status_code=404, detail="Entry not found")
-        
-        if user.id != entry.contributor_id and user.username != "rosie":
-            raise HTTPException(status_code=403, detail="Only the contributor or rosie can update this entry")
-        
-        entry.user_reason = request.user_reason
-        session.commit()
-        
-        return ResponseMessage(message="Entry updated successfully")
+    try:
+        entry_uuid = uuid.UUID(entry_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid entry ID format")
+    
+    entry = session.query(IntListEntry).filter(IntListEntry.id == entry_uuid).first()
+    if not entry:
+        raise HTTPException(status_code=404, detail="Entry not found")
+    
+    if user.id != entry.contributor_id and user.username != "rosie":
+        raise HTTPException(status_code=403, detail="Only the contributor or rosie can update this entry")
+    
+    entry.user_reason = request.user_reason
+    session.commit()
+    
+    return ResponseMessage(message="Entry updated successfully")
 
 
 @riot_router.delete("/int_list/{entry_id}")
 def delete_int_list_entry(
     entry_id: str,
     user= Depends(get_current_user),
+    session: Session = Depends(get_db),
 ) -> ResponseMessage:
     """Delete an int list entry. Only creator can delete."""
-    with get_db_session() as session:
-        try:
-            entry_uuid = uuid.UUID(entry_id)
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid entry ID format")
-        
-        entry = session.query(IntListEntry).filter(IntListEntry.id == entry_uuid).first()
-        if not entry:
-            raise HTTPException(status_code=404, detail="Entry not found")
-        if user.id != entry.contributor_id and user.username != "rosie":
-            raise HTTPException(status_code=403, detail="Only the contributor or rosie can delete this entry")
-        session.delete(entry)
-        session.commit()
-        
-        return ResponseMessage(message="Entry deleted successfully")
+    try:
+        entry_uuid = uuid.UUID(entry_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid entry ID format")
+    
+    entry = session.query(IntListEntry).filter(IntListEntry.id == entry_uuid).first()
+    if not entry:
+        raise HTTPException(status_code=404, detail="Entry not found")
+    if user.id != entry.contributor_id and user.username != "rosie":
+        raise HTTPException(status_code=403, detail="Only the contributor or rosie can delete this entry")
+    session.delete(entry)
+    session.commit()
+    
+    return ResponseMessage(message="Entry deleted successfully")
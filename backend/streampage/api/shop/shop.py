@@ -6,6 +6,7 @@ from pathlib import Path
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
 from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, selectinload
 
 from streampage.api.middleware.authenticator import require_creator
@@ -29,7 +30,7 @@ from streampage.api.shop.models import (
     ResponseMessage,
     WaitlistEntry,
 )
-from streampage.db.engine import get_db_session
+from streampage.db.engine import get_async_db, get_db, get_db_session
 from streampage.db.enums import ProductCategory, ProductMediaType, OrderStatus, ShippingMethod
 from streampage.db.models import (
     Product,
@@ -46,6 +47,7 @@ from streampage.services.email import (
     send_order_admin_notification_email,
     send_order_receipt_email,
 )
+from streampage.services.owner import page_owner
 from streampage.services.paypal import paypal_service
 from streampage.services.storage import (
     storage_service,
@@ -174,54 +176,56 @@ async def create_product(
     quantity: int = Form(0),
     description: str | None = Form(None),
     user: User = Depends(require_creator),
+    session: Session = Depends(get_db),
 ):
-    with get_db_session() as session:
-        slug = _ensure_unique_slug(session, _slugify(name))
-
-        product = Product(
-            name=name,
-            category=category,
-            slug=slug,
-            description=description,
-            price=price,
-            quantity=quantity,
-        )
-        session.add(product)
-        session.commit()
-        session.refresh(product)
-        # Trigger media load (will be empty for a freshly created product).
-        _ = list(product.media)
-        return _product_to_response(product)
+    slug = _ensure_unique_slug(session, _slugify(name))
+
+    product = Product(
+        name=name,
+        category=category,
+        slug=slug,
+        description=description,
+        price=price,
+        quantity=quantity,
+    )
+    session.add(product)
+    session.commit()
+    session.refresh(product)
+    # Trigger media load (will be empty for a freshly created product).
+    _ = list(product.media)
+    return _product_to_response(product)
 
 
 @shop_router.get("/products", response_model=list[ProductResponse])
-def list_products(
+async def list_products(
     category: ProductCategory | None = Query(None),
     active_only: bool = Query(True),
+    session: AsyncSession = Depends(get_async_db),
 ):
-    with get_db_session() as session:
-        stmt = (
-            select(Product)
-            .options(selectinload(Product.media))
-            .order_by(
-                Product.category,
-                Product.created_at.desc(),
-            )
+    stmt = (
+        select(Product)
+        .options(selectinload(Product.media))
+        .order_by(
+            Product.category,
+            Product.created_at.desc(),
         )
-        if category:
-            stmt = stmt.where(Product.category == category)
-        if active_only:
-            stmt = stmt.where(Product.is_active == True)
+    )
+    if category:
+        stmt = stmt.where(Product.category == category)
+    if active_only:
+        stmt = stmt.where(Product.is_active == True)
 
-        products = session.execute(stmt).scalars().all()
-        return [_product_to_response(p) for p in products]
+    products = (await session.execute(stmt)).scalars().all()
+    return [_product_to_response(p) for p in products]
 
 
 @shop_router.get("/products/{product_id}", response_model=ProductResponse)
-def get_product(product_id: str):
-    with get_db_session() as session:
-        product = _load_product(session, product_id)
-        return _product_to_response(product)
+def get_product(
+    product_id: str,
+    session: Session = Depends(get_db),
+):
+    product = _load_product(session, product_id)
+    return _product_to_response(product)
 
 
 @shop_router.put("/products/{product_id}", response_model=ProductResponse)
@@ -234,34 +238,35 @@ async def update_product(
     description: str | None = Form(None),
     is_active: bool | None = Form(None),
     user: User = Depends(require_creator),
+    session: Session = Depends(get_db),
 ):
-    with get_db_session() as session:
-        product = _load_product(session, product_id)
-
-        if name is not None:
-            product.name = name
-            product.slug = _ensure_unique_slug(session, _slugify(name), exclude_id=product.id)
-        if category is not None:
-            product.category = category
-        if price is not None:
-            product.price = price
-        if quantity is not None:
-            product.quantity = quantity
-        if description is not None:
-            product.description = description
-        if is_active is not None:
-            product.is_active = is_active
-
-        session.commit()
-        session.refresh(product)
-        _ = list(product.media)
-        return _product_to_response(product)
+    product = _load_product(session, product_id)
+
+    if name is not None:
+        product.name = name
+        product.slug = _ensure_unique_slug(session, _slugify(name), exclude_id=product.id)
+    if category is not None:
+        product.category = category
+    if price is not None:
+        product.price = price
+    if quantity is not None:
+        product.quantity = quantity
+    if description is not None:
+        product.description = description
+    if is_active is not None:
+        product.is_active = is_active
+
+    session.commit()
+    session.refresh(product)
+    _ = list(product.media)
+    return _product_to_response(product)
 
 
 @shop_router.delete("/products/{product_id}", response_model=ResponseMessage)
 def delete_product(
     product_id: str,
     user: User = Depends(require_creator),
+    session: Session = Depends(get_db),
 ):
     """Hard-delete a product and all of its media.
 
@@ -270,26 +275,25 @@ def delete_product(
     ``order_item`` rows reference the product so historical orders stay intact;
     callers should deactivate such products instead.
     """
-    with get_db_session() as session:
-        product = _load_product(session, product_id)
-
-        order_item_count = session.execute(
-            select(func.count())
-            .select_from(OrderItem)
-            .where(OrderItem.product_id == product.id)
-        ).scalar() or 0
-        if order_item_count > 0:
-            raise HTTPException(
-                status_code=400,
-                detail=(
-                    "Product is referenced by existing orders and cannot be "
-                    "fully deleted. Deactivate it instead."
-                ),
-            )
+    product = _load_product(session, product_id)
+
+    order_item_count = session.execute(
+        select(func.count())
+        .select_from(OrderItem)
+        .where(OrderItem.product_id == product.id)
+    ).scalar() or 0
+    if order_item_count > 0:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                "Product is referenced by existing orders and cannot be "
+                "fully deleted. Deactivate it instead."
+            ),
+        )
 
-        media_urls = [m.url for m in product.media if m.url]
-        session.delete(product)
-        session.commit()
+    media_urls = [m.url for m in product.media if m.url]
+    session.delete(product)
+    session.commit()
 
     for url in media_urls:
         if "supabase.co" in url:
@@ -340,6 +344,7 @@ async def upload_product_media(
     is_featured: bool = Form(False),
     display_order: int | None = Form(None),
     user: User = Depends(require_creator),
+    session: Session = Depends(get_db),
 ):
     if not file.filename:
         raise HTTPException(status_code=400, detail="File is required")
@@ -358,36 +363,35 @@ async def upload_product_media(
     else:
         url = storage_service.upload_video(contents, "shop/products", ext)
 
-    with get_db_session() as session:
-        product = _load_product(session, product_id)
-
-        if display_order is None:
-            current_max = session.execute(
-                select(func.max(ProductMedia.display_order)).where(
-                    ProductMedia.product_id == product.id
-                )
-            ).scalar()
-            order_val = (current_max + 1) if current_max is not None else 0
-        else:
-            order_val = display_order
+    product = _load_product(session, product_id)
 
-        media = ProductMedia(
-            product_id=product.id,
-            url=url,
-            media_type=media_type,
-            display_order=order_val,
-            is_featured=False,
-        )
-        session.add(media)
-        session.flush()
+    if display_order is None:
+        current_max = session.execute(
+            select(func.max(ProductMedia.display_order)).where(
+                ProductMedia.product_id == product.id
+            )
+        ).scalar()
+        order_val = (current_max + 1) if current_max is not None else 0
+    else:
+        order_val = display_order
+
+    media = ProductMedia(
+        product_id=product.id,
+        url=url,
+        media_type=media_type,
+        display_order=order_val,
+        is_featured=False,
+    )
+    session.add(media)
+    session.flush()
 
-        if is_featured:
-            _clear_other_featured(session, product.id, keep_id=media.id)
-            media.is_featured = True
+    if is_featured:
+        _clear_other_featured(session, product.id, keep_id=media.id)
+        media.is_featured = True
 
-        session.commit()
-        session.refresh(media)
-        return _media_to_response(media)
+    session.commit()
+    session.refresh(media)
+    return _media_to_response(media)
 
 
 @shop_router.patch(
@@ -399,30 +403,30 @@ def update_product_media(
     media_id: str,
     body: ProductMediaUpdate,
     user: User = Depends(require_creator),
+    session: Session = Depends(get_db),
 ):
-    with get_db_session() as session:
-        media = session.execute(
-            select(ProductMedia).where(
-                ProductMedia.id == uuid.UUID(media_id),
-                ProductMedia.product_id == uuid.UUID(product_id),
-            )
-        ).scalar_one_or_none()
-        if not media:
-            raise HTTPException(status_code=404, detail="Media not found")
+    media = session.execute(
+        select(ProductMedia).where(
+            ProductMedia.id == uuid.UUID(media_id),
+            ProductMedia.product_id == uuid.UUID(product_id),
+        )
+    ).scalar_one_or_none()
+    if not media:
+        raise HTTPException(status_code=404, detail="Media not found")
 
-        if body.display_order is not None:
-            media.display_order = body.display_order
+    if body.display_order is not None:
+        media.display_order = body.display_order
 
-        if body.is_featured is not None:
-            if body.is_featured:
-                _clear_other_featured(session, media.product_id, keep_id=media.id)
-                media.is_featured = True
-            else:
-                media.is_featured = False
+    if body.is_featured is not None:
+        if body.is_featured:
+            _clear_other_featured(session, media.product_id, keep_id=media.id)
+            media.is_featured = True
+        else:
+            media.is_featured = False
 
-        session.commit()
-        session.refresh(media)
-        return _media_to_response(media)
+    session.commit()
+    session.refresh(media)
+    return _media_to_response(media)
 
 
 @shop_router.delete(
@@ -433,20 +437,20 @@ def delete_product_media(
     product_id: str,
     media_id: str,
     user: User = Depends(require_creator),
+    session: Session = Depends(get_db),
 ):
-    with get_db_session() as session:
-        media = session.execute(
-            select(ProductMedia).where(
-                ProductMedia.id == uuid.UUID(media_id),
-                ProductMedia.product_id == uuid.UUID(product_id),
-            )
-        ).scalar_one_or_none()
-        if not media:
-            raise HTTPException(status_code=404, detail="Media not found")
+    media = session.execute(
+        select(ProductMedia).where(
+            ProductMedia.id == uuid.UUID(media_id),
+            ProductMedia.product_id == uuid.UUID(product_id),
+        )
+    ).scalar_one_or_none()
+    if not media:
+        raise HTTPException(status_code=404, detail="Media not found")
 
-        url = media.url
-        session.delete(media)
-        session.commit()
+    url = media.url
+    session.delete(media)
+    session.commit()
 
     if url and "supabase.co" in url:
         storage_service.delete_object(url)
@@ -462,23 +466,23 @@ def reorder_product_media(
     product_id: str,
     body: ProductMediaReorderRequest,
     user: User = Depends(require_creator),
+    session: Session = Depends(get_db),
 ):
-    with get_db_session() as session:
-        product = _load_product(session, product_id)
+    product = _load_product(session, product_id)
 
-        media_by_id = {m.id: m for m in product.media}
-        for entry in body.order:
-            mid = uuid.UUID(entry.id)
-            if mid not in media_by_id:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Media {entry.id} does not belong to this product",
-                )
-            media_by_id[mid].display_order = entry.display_order
+    media_by_id = {m.id: m for m in product.media}
+    for entry in body.order:
+        mid = uuid.UUID(entry.id)
+        if mid not in media_by_id:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Media {entry.id} does not belong to this product",
+            )
+        media_by_id[mid].display_order = entry.display_order
 
-        session.commit()
-        session.refresh(product)
-        return [_media_to_response(m) for m in product.media]
+    session.commit()
+    session.refresh(product)
+    return [_media_to_response(m) for m in product.media]
 
 
 # ---------------------------------------------------------------------------
@@ -680,30 +684,33 @@ def _insert_customizations(
 def list_orders(
     status: OrderStatus | None = Query(None),
     user: User = Depends(require_creator),
+    session: Session = Depends(get_db),
 ):
     """List every order for admin fulfillment. Newest first."""
-    with get_db_session() as session:
-        stmt = select(Order).order_by(Order.created_at.desc())
-        if status is not None:
-            stmt = stmt.where(Order.status == status)
+    stmt = select(Order).order_by(Order.created_at.desc())
+    if status is not None:
+        stmt = stmt.where(Order.status == status)
 
-        orders = session.execute(stmt).scalars().all()
-        if not orders:
-            return []
+    orders = session.execute(stmt).scalars().all()
+    if not orders:
+        return []
 
-        order_ids = [o.id for o in orders]
-        count_rows = session.execute(
-            select(OrderItem.order_id, func.count(OrderItem.id))
-            .where(OrderItem.order_id.in_(order_ids))
-            .group_by(OrderItem.order_id)
-        ).all()
-        count_map = {row[0]: row[1] for row in count_rows}
+    order_ids = [o.id for o in orders]
+    count_rows = session.execute(
+        select(OrderItem.order_id, func.count(OrderItem.id))
+        .where(OrderItem.order_id.in_(order_ids))
+        .group_by(OrderItem.order_id)
+    ).all()
+    count_map = {row[0]: row[1] for row in count_rows}
 
-        return [_order_to_summary(o, count_map.get(o.id, 0)) for o in orders]
+    return [_order_to_summary(o, count_map.get(o.id, 0)) for o in orders]
 
 
 @shop_router.get("/orders/{order_id}", response_model=OrderDetail)
-def get_order(order_id: str):
+def get_order(
+    order_id: str,
+    session: Session = Depends(get_db),
+):
     """Return a single order by its internal UUID.
 
     Public endpoint: the UUID itself acts as an unguessable bearer token so the
@@ -712,29 +719,28 @@ def get_order(order_id: str):
     a v4 UUID.
     """
     order_uuid = _parse_order_uuid(order_id)
-    with get_db_session() as session:
-        order = session.execute(
-            select(Order).where(Order.id == order_uuid)
-        ).scalar_one_or_none()
-        if not order:
-            raise HTTPException(status_code=404, detail="Order not found")
-
-        items = session.execute(
-            select(OrderItem).where(OrderItem.order_id == order.id)
-        ).scalars().all()
+    order = session.execute(
+        select(Order).where(Order.id == order_uuid)
+    ).scalar_one_or_none()
+    if not order:
+        raise HTTPException(status_code=404, detail="Order not found")
 
-        product_ids = {item.product_id for item in items}
-        product_map: dict[uuid.UUID, Product] = {}
-        if product_ids:
-            products = session.execute(
-                select(Product).where(Product.id.in_(product_ids))
-            ).scalars().all()
-            product_map = {p.id: p for p in products}
+    items = session.execute(
+        select(OrderItem).where(OrderItem.order_id == order.id)
+    ).scalars().all()
 
-        custom_map = _load_customizations_for_items(
-            session, [item.id for item in items]
-        )
-        return _order_to_detail(order, items, product_map, custom_map)
+    product_ids = {item.product_id for item in items}
+    product_map: dict[uuid.UUID, Product] = {}
+    if product_ids:
+        products = session.execute(
+            select(Product).where(Product.id.in_(product_ids))
+        ).scalars().all()
+        product_map = {p.id: p for p in products}
+
+    custom_map = _load_customizations_for_items(
+        session, [item.id for item in items]
+    )
+    return _order_to_detail(order, items, product_map, custom_map)
 
 
 @shop_router.patch("/orders/{order_id}", response_model=OrderDetail)
@@ -742,54 +748,54 @@ def update_order(
     order_id: str,
     body: OrderUpdateRequest,
     user: User = Depends(require_creator),
+    session: Session = Depends(get_db),
 ):
     """Admin update for status and shipping/tracking fields."""
     order_uuid = _parse_order_uuid(order_id)
-    with get_db_session() as session:
-        order = session.execute(
-            select(Order).where(Order.id == order_uuid)
-        ).scalar_one_or_none()
-        if not order:
-            raise HTTPException(status_code=404, detail="Order not found")
-
-        if body.status is not None:
-            order.status = body.status
-            # Auto-stamp shipped_at the first time the order moves to SHIPPED so
-            # admins don't have to fill it in manually. Explicit shipped_at in
-            # the same payload still wins (handled below).
-            if body.status == OrderStatus.SHIPPED and order.shipped_at is None:
-                order.shipped_at = datetime.utcnow()
-
-        if body.tracking_number is not None:
-            order.tracking_number = body.tracking_number or None
-        if body.tracking_carrier is not None:
-            order.tracking_carrier = body.tracking_carrier or None
-        if body.tracking_url is not None:
-            order.tracking_url = body.tracking_url or None
-        if body.notes is not None:
-            order.notes = body.notes or None
-        if body.shipped_at is not None:
-            order.shipped_at = body.shipped_at
-
-        session.commit()
-        session.refresh(order)
-
-        items = session.execute(
-            select(OrderItem).where(OrderItem.order_id == order.id)
-        ).scalars().all()
+    order = session.execute(
+        select(Order).where(Order.id == order_uuid)
+    ).scalar_one_or_none()
+    if not order:
+        raise HTTPException(status_code=404, detail="Order not found")
 
-        product_ids = {item.product_id for item in items}
-        product_map: dict[uuid.UUID, Product] = {}
-        if product_ids:
-            products = session.execute(
-                select(Product).where(Product.id.in_(product_ids))
-            ).scalars().all()
-            product_map = {p.id: p for p in products}
+    if body.status is not None:
+        order.status = body.status
+        # Auto-stamp shipped_at the first time the order moves to SHIPPED so
+        # admins don't have to fill it in manually. Explicit shipped_at in
+        # the same payload still wins (handled below).
+        if body.status == OrderStatus.SHIPPED and order.shipped_at is None:
+            order.shipped_at = datetime.utcnow()
+
+    if body.tracking_number is not None:
+        order.tracking_number = body.tracking_number or None
+    if body.tracking_carrier is not None:
+        order.tracking_carrier = body.tracking_carrier or None
+    if body.tracking_url is not None:
+        order.tracking_url = body.tracking_url or None
+    if body.notes is not None:
+        order.notes = body.notes or None
+    if body.shipped_at is not None:
+        order.shipped_at = body.shipped_at
+
+    session.commit()
+    session.refresh(order)
+
+    items = session.execute(
+        select(OrderItem).where(OrderItem.order_id == order.id)
+    ).scalars().all()
 
-        custom_map = _load_customizations_for_items(
-            session, [item.id for item in items]
-        )
-        return _order_to_detail(order, items, product_map, custom_map)
+    product_ids = {item.product_id for item in items}
+    product_map: dict[uuid.UUID, Product] = {}
+    if product_ids:
+        products = session.execute(
+            select(Product).where(Product.id.in_(product_ids))
+        ).scalars().all()
+        product_map = {p.id: p for p in products}
+
+    custom_map = _load_customizations_for_items(
+        session, [item.id for item in items]
+    )
+    return _order_to_detail(order, items, product_map, custom_map)
 
 
 def _validate_checkout_request(
@@ -1145,11 +1151,9 @@ async def capture_order(paypal_order_id: str, request: OrderCreateRequest):
 
                 admin_email = SHOP_ADMIN_EMAIL
                 if not admin_email:
-                    creator = session.execute(
-                        select(User).where(func.lower(User.username) == "rosie")
-                    ).scalar_one_or_none()
-                    if creator and creator.email:
-                        admin_email = creator.email
+                    owner = page_owner.get(session)
+                    if owner and owner.email:
+                        admin_email = owner.email
                 if admin_email:
                     send_order_admin_notification_email(admin_email, email_ctx)
                 else:
@@ -1214,6 +1218,7 @@ async def capture_order(paypal_order_id: str, request: OrderCreateRequest):
 def create_custom_order(
     request: OrderCreateRequest,
     user: User = Depends(require_creator),
+    session: Session = Depends(get_db),
 ):
     """Admin-only: record an in-person/cash order without PayPal.
 
@@ -1229,140 +1234,137 @@ def create_custom_order(
     product_ids = [uuid.UUID(item.product_id) for item in request.items]
     qty_map = {uuid.UUID(item.product_id): item.quantity for item in request.items}
 
-    with get_db_session() as session:
-        products = session.execute(
-            select(Product).where(Product.id.in_(product_ids)).with_for_update()
-        ).scalars().all()
+    products = session.execute(
+        select(Product).where(Product.id.in_(product_ids)).with_for_update()
+    ).scalars().all()
 
-        if len(products) != len(product_ids):
-            raise HTTPException(status_code=400, detail="One or more products not found")
+    if len(products) != len(product_ids):
+        raise HTTPException(status_code=400, detail="One or more products not found")
 
-        total = 0.0
-        for product in products:
-            requested_qty = qty_map[product.id]
+    total = 0.0
+    for product in products:
+        requested_qty = qty_map[product.id]
 
-            if not product.is_active:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Product '{product.name}' is no longer available",
-                )
-            if product.quantity < requested_qty:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Not enough stock for '{product.name}' (available: {product.quantity})",
-                )
+        if not product.is_active:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Product '{product.name}' is no longer available",
+            )
+        if product.quantity < requested_qty:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Not enough stock for '{product.name}' (available: {product.quantity})",
+            )
 
-            total += float(product.price) * requested_qty
-
-        cust = request.customer
-        order = Order(
-            paypal_order_id=None,
-            status=OrderStatus.IN_PERSON,
-            customer_first_name=cust.first_name,
-            customer_last_name=cust.last_name,
-            customer_email=cust.email,
-            customer_discord_handle=cust.discord_handle,
-            shipping_street=cust.shipping_street,
-            shipping_city=cust.shipping_city,
-            shipping_state=cust.shipping_state,
-            shipping_zip=cust.shipping_zip,
-            shipping_country=cust.shipping_country,
-            notes=(cust.notes or None),
-            total_amount=total,
-        )
-        session.add(order)
-        session.flush()
+        total += float(product.price) * requested_qty
 
-        product_map = {p.id: p for p in products}
-        grouped_customizations = _validate_customizations(
-            qty_map, product_map, request.customizations
-        )
+    cust = request.customer
+    order = Order(
+        paypal_order_id=None,
+        status=OrderStatus.IN_PERSON,
+        customer_first_name=cust.first_name,
+        customer_last_name=cust.last_name,
+        customer_email=cust.email,
+        customer_discord_handle=cust.discord_handle,
+        shipping_street=cust.shipping_street,
+        shipping_city=cust.shipping_city,
+        shipping_state=cust.shipping_state,
+        shipping_zip=cust.shipping_zip,
+        shipping_country=cust.shipping_country,
+        notes=(cust.notes or None),
+        total_amount=total,
+    )
+    session.add(order)
+    session.flush()
 
-        items: list[OrderItem] = []
-        items_by_product_id: dict[uuid.UUID, OrderItem] = {}
-        for product in products:
-            qty = qty_map[product.id]
-            item = OrderItem(
-                order_id=order.id,
-                product_id=product.id,
-                quantity=qty,
-                unit_price=float(product.price),
-            )
-            session.add(item)
-            items.append(item)
-            items_by_product_id[product.id] = item
-            product.quantity -= qty
-        session.flush()
-
-        _insert_customizations(
-            session,
-            order,
-            items_by_product_id,
-            grouped_customizations,
+    product_map = {p.id: p for p in products}
+    grouped_customizations = _validate_customizations(
+        qty_map, product_map, request.customizations
+    )
+
+    items: list[OrderItem] = []
+    items_by_product_id: dict[uuid.UUID, OrderItem] = {}
+    for product in products:
+        qty = qty_map[product.id]
+        item = OrderItem(
+            order_id=order.id,
+            product_id=product.id,
+            quantity=qty,
+            unit_price=float(product.price),
         )
+        session.add(item)
+        items.append(item)
+        items_by_product_id[product.id] = item
+        product.quantity -= qty
+    session.flush()
+
+    _insert_customizations(
+        session,
+        order,
+        items_by_product_id,
+        grouped_customizations,
+    )
 
-        session.commit()
-        session.refresh(order)
+    session.commit()
+    session.refresh(order)
 
-        try:
-            order_url = (
-                f"{FRONTEND_URL.rstrip('/')}/shop/orders/{order.id}"
-                if FRONTEND_URL
-                else None
-            )
-            email_ctx = OrderEmailContext(
-                order_id_short=str(order.id)[:8],
-                customer_first_name=order.customer_first_name,
-                customer_last_name=order.customer_last_name,
-                customer_email=order.customer_email,
-                customer_discord_handle=order.customer_discord_handle,
-                total_amount=float(order.total_amount),
-                shipping_address_lines=[
-                    order.shipping_street,
-                    f"{order.shipping_city}, {order.shipping_state} {order.shipping_zip}",
-                    order.shipping_country,
-                ],
-                items=[
-                    OrderEmailLineItem(
-                        name=product_map[item.product_id].name,
-                        quantity=item.quantity,
-                        unit_price=float(item.unit_price),
-                        line_total=float(item.unit_price) * item.quantity,
-                    )
-                    for item in items
-                ],
-                order_url=order_url,
-            )
+    try:
+        order_url = (
+            f"{FRONTEND_URL.rstrip('/')}/shop/orders/{order.id}"
+            if FRONTEND_URL
+            else None
+        )
+        email_ctx = OrderEmailContext(
+            order_id_short=str(order.id)[:8],
+            customer_first_name=order.customer_first_name,
+            customer_last_name=order.customer_last_name,
+            customer_email=order.customer_email,
+            customer_discord_handle=order.customer_discord_handle,
+            total_amount=float(order.total_amount),
+            shipping_address_lines=[
+                order.shipping_street,
+                f"{order.shipping_city}, {order.shipping_state} {order.shipping_zip}",
+                order.shipping_country,
+            ],
+            items=[
+                OrderEmailLineItem(
+                    name=product_map[item.product_id].name,
+                    quantity=item.quantity,
+                    unit_price=float(item.unit_price),
+                    line_total=float(item.unit_price) * item.quantity,
+                )
+                for item in items
+            ],
+            order_url=order_url,
+        )
 
-            if order.customer_email:
-                send_order_receipt_email(order.customer_email, email_ctx)
-
-            admin_email = SHOP_ADMIN_EMAIL
-            if not admin_email:
-                creator = session.execute(
-                    select(User).where(func.lower(User.username) == "rosie")
-                ).scalar_one_or_none()
-                if creator and creator.email:
-                    admin_email = creator.email
-            if admin_email:
-                send_order_admin_notification_email(admin_email, email_ctx)
-        except Exception:
-            logger.warning(
-                "Failed to dispatch custom-order confirmation emails for order %s",
-                order.id,
-                exc_info=True,
-            )
+        if order.customer_email:
+            send_order_receipt_email(order.customer_email, email_ctx)
 
-        items_for_response = session.execute(
-            select(OrderItem).where(OrderItem.order_id == order.id)
-        ).scalars().all()
-        custom_map = _load_customizations_for_items(
-            session, [i.id for i in items_for_response]
-        )
-        return _order_to_detail(
-            order, items_for_response, product_map, custom_map
+        admin_email = SHOP_ADMIN_EMAIL
+        if not admin_email:
+            owner = page_owner.get(session)
+            if owner and owner.email:
+                admin_email = owner.email
+        if admin_email:
+            send_order_admin_notification_email(admin_email, email_ctx)
+    except Exception:
+        logger.warning(
+            "Failed to dispatch custom-order confirmation emails for order %s",
+            order.id,
+            exc_info=True,
         )
 
+    items_for_response = session.execute(
+        select(OrderItem).where(OrderItem.order_id == order.id)
+    ).scalars().all()
+    custom_map = _load_customizations_for_items(
+        session, [i.id for i in items_for_response]
+    )
+    return _order_to_detail(
+        order, items_for_response, product_map, custom_map
+    )
+
 
 # ---------------------------------------------------------------------------
 # Custom-card-art queue
@@ -1453,6 +1455,7 @@ def _sum_order_quantity(session: Session, order_id: uuid.UUID) -> int:
 def list_customizations(
     status: OrderStatus | None = Query(None),
     user: User = Depends(require_creator),
+    session: Session = Depends(get_db),
 ):
     """Admin fulfillment queue covering every line item across every order.
 
@@ -1463,66 +1466,65 @@ def list_customizations(
     by the parent order's creation time so the oldest unfinished work is at
     the top.
     """
-    with get_db_session() as session:
-        items_stmt = (
-            select(OrderItem, Order, Product)
-            .join(Order, Order.id == OrderItem.order_id)
-            .join(Product, Product.id == OrderItem.product_id)
+    items_stmt = (
+        select(OrderItem, Order, Product)
+        .join(Order, Order.id == OrderItem.order_id)
+        .join(Product, Product.id == OrderItem.product_id)
+    )
+    if status is not None:
+        items_stmt = items_stmt.where(Order.status == status)
+
+    item_rows = session.execute(items_stmt).all()
+    if not item_rows:
+        return []
+
+    item_ids = [i.id for i, _, _ in item_rows]
+    customizations = session.execute(
+        select(OrderCustomization)
+        .where(OrderCustomization.order_item_id.in_(item_ids))
+        .order_by(
+            OrderCustomization.is_complete.asc(),
+            OrderCustomization.created_at.asc(),
         )
-        if status is not None:
-            items_stmt = items_stmt.where(Order.status == status)
-
-        item_rows = session.execute(items_stmt).all()
-        if not item_rows:
-            return []
-
-        item_ids = [i.id for i, _, _ in item_rows]
-        customizations = session.execute(
-            select(OrderCustomization)
-            .where(OrderCustomization.order_item_id.in_(item_ids))
-            .order_by(
-                OrderCustomization.is_complete.asc(),
-                OrderCustomization.created_at.asc(),
-            )
-        ).scalars().all()
-        customs_by_item: dict[uuid.UUID, list[OrderCustomization]] = {}
-        for c in customizations:
-            customs_by_item.setdefault(c.order_item_id, []).append(c)
-
-        # Per-order totals so each row can show the full order's physical
-        # unit count (sum of every OrderItem.quantity in the order).
-        order_ids = {o.id for _, o, _ in item_rows}
-        totals_rows = session.execute(
-            select(OrderItem.order_id, func.coalesce(func.sum(OrderItem.quantity), 0))
-            .where(OrderItem.order_id.in_(order_ids))
-            .group_by(OrderItem.order_id)
-        ).all()
-        totals_by_order = {oid: int(qty) for oid, qty in totals_rows}
-
-        result: list[CustomizationQueueRow] = []
-        for item, order, product in item_rows:
-            total_qty = totals_by_order.get(order.id, 0)
-            if product.category == ProductCategory.CUSTOM:
-                for c in customs_by_item.get(item.id, []):
-                    result.append(
-                        _customization_to_queue_row(
-                            c, order, product.name, total_qty
-                        )
-                    )
-            else:
+    ).scalars().all()
+    customs_by_item: dict[uuid.UUID, list[OrderCustomization]] = {}
+    for c in customizations:
+        customs_by_item.setdefault(c.order_item_id, []).append(c)
+
+    # Per-order totals so each row can show the full order's physical
+    # unit count (sum of every OrderItem.quantity in the order).
+    order_ids = {o.id for _, o, _ in item_rows}
+    totals_rows = session.execute(
+        select(OrderItem.order_id, func.coalesce(func.sum(OrderItem.quantity), 0))
+        .where(OrderItem.order_id.in_(order_ids))
+        .group_by(OrderItem.order_id)
+    ).all()
+    totals_by_order = {oid: int(qty) for oid, qty in totals_rows}
+
+    result: list[CustomizationQueueRow] = []
+    for item, order, product in item_rows:
+        total_qty = totals_by_order.get(order.id, 0)
+        if product.category == ProductCategory.CUSTOM:
+            for c in customs_by_item.get(item.id, []):
                 result.append(
-                    _orderitem_to_queue_row(
-                        item, order, product.name, total_qty
+                    _customization_to_queue_row(
+                        c, order, product.name, total_qty
                     )
                 )
+        else:
+            result.append(
+                _orderitem_to_queue_row(
+                    item, order, product.name, total_qty
+                )
+            )
 
-        # Stable sort: to-do first, then oldest order first.
-        result.sort(key=lambda r: (r.is_complete, r.order_created_at))
-        return result
+    # Stable sort: to-do first, then oldest order first.
+    result.sort(key=lambda r: (r.is_complete, r.order_created_at))
+    return result
 
 
 @shop_router.get("/waitlist", response_model=list[WaitlistEntry])
-def list_waitlist():
+async def list_waitlist(session: AsyncSession = Depends(get_async_db)):
     """Public, no-auth slim view of every custom-card-art request.
 
     Returns just enough fields to power the public waitlist UI on ``/shop``
@@ -1530,33 +1532,32 @@ def list_waitlist():
     full names, emails, or shipping addresses. Sorted FIFO (oldest order
     first); the frontend reverses for the newest-first gallery.
     """
-    with get_db_session() as session:
-        rows = session.execute(
-            select(OrderCustomization, Order)
-            .join(Order, Order.id == OrderCustomization.order_id)
-            .join(OrderItem, OrderItem.id == OrderCustomization.order_item_id)
-            .join(Product, Product.id == OrderItem.product_id)
-            .where(Product.category == ProductCategory.CUSTOM)
-            .order_by(
-                Order.created_at.asc(),
-                OrderCustomization.created_at.asc(),
-            )
-        ).all()
-
-        return [
-            WaitlistEntry(
-                id=str(c.id),
-                card_name=c.card_name,
-                image_url=c.image_url,
-                is_complete=c.is_complete,
-                customer_discord_handle=o.customer_discord_handle,
-                order_created_at=o.created_at,
-                created_at=c.created_at,
-                completed_at=c.completed_at,
-                notes=c.notes,
-            )
-            for c, o in rows
-        ]
+    rows = (await session.execute(
+        select(OrderCustomization, Order)
+        .join(Order, Order.id == OrderCustomization.order_id)
+        .join(OrderItem, OrderItem.id == OrderCustomization.order_item_id)
+        .join(Product, Product.id == OrderItem.product_id)
+        .where(Product.category == ProductCategory.CUSTOM)
+        .order_by(
+            Order.created_at.asc(),
+            OrderCustomization.created_at.asc(),
+        )
+    )).all()
+
+    return [
+        WaitlistEntry(
+            id=str(c.id),
+            card_name=c.card_name,
+            image_url=c.image_url,
+            is_complete=c.is_complete,
+            customer_discord_handle=o.customer_discord_handle,
+            order_created_at=o.created_at,
+            created_at=c.created_at,
+            completed_at=c.completed_at,
+            notes=c.notes,
+        )
+        for c, o in rows
+    ]
 
 
 def _parse_customization_uuid(customization_id: str) -> uuid.UUID:
@@ -1609,31 +1610,31 @@ def update_customization(
     customization_id: str,
     body: CustomizationUpdateRequest,
     _: User = Depends(require_creator),
+    session: Session = Depends(get_db),
 ):
     """Toggle the ``is_complete`` flag on a single card art request."""
     cust_uuid = _parse_customization_uuid(customization_id)
 
-    with get_db_session() as session:
-        customization, order, product = _load_customization_with_order(
-            session, cust_uuid
-        )
+    customization, order, product = _load_customization_with_order(
+        session, cust_uuid
+    )
 
-        if body.is_complete is not None:
-            if body.is_complete and not customization.is_complete:
-                customization.completed_at = datetime.utcnow()
-            elif not body.is_complete:
-                customization.completed_at = None
-            customization.is_complete = body.is_complete
-
-        if body.notes is not None:
-            customization.notes = body.notes if body.notes else None
-
-        session.commit()
-        session.refresh(customization)
-        total_qty = _sum_order_quantity(session, order.id)
-        return _customization_to_queue_row(
-            customization, order, product.name, total_qty
-        )
+    if body.is_complete is not None:
+        if body.is_complete and not customization.is_complete:
+            customization.completed_at = datetime.utcnow()
+        elif not body.is_complete:
+            customization.completed_at = None
+        customization.is_complete = body.is_complete
+
+    if body.notes is not None:
+        customization.notes = body.notes if body.notes else None
+
+    session.commit()
+    session.refresh(customization)
+    total_qty = _sum_order_quantity(session, order.id)
+    return _customization_to_queue_row(
+        customization, order, product.name, total_qty
+    )
 
 
 @shop_router.post(
@@ -1644,6 +1645,7 @@ async def upload_customization_image(
     customization_id: str,
     file: UploadFile = File(...),
     user: User = Depends(require_creator),
+    session: Session = Depends(get_db),
 ):
     """Attach (or replace) the finished card-art image for a customization.
 
@@ -1668,19 +1670,18 @@ async def upload_customization_image(
     new_url = storage_service.upload_image(contents, "shop/customizations", ext)
 
     cust_uuid = _parse_customization_uuid(customization_id)
-    with get_db_session() as session:
-        customization, order, product = _load_customization_with_order(
-            session, cust_uuid
-        )
+    customization, order, product = _load_customization_with_order(
+        session, cust_uuid
+    )
 
-        previous_url = customization.image_url
-        customization.image_url = new_url
-        session.commit()
-        session.refresh(customization)
-        total_qty = _sum_order_quantity(session, order.id)
-        response = _customization_to_queue_row(
-            customization, order, product.name, total_qty
-        )
+    previous_url = customization.image_url
+    customization.image_url = new_url
+    session.commit()
+    session.refresh(customization)
+    total_qty = _sum_order_quantity(session, order.id)
+    response = _customization_to_queue_row(
+        customization, order, product.name, total_qty
+    )
 
     if previous_url and previous_url != new_url and "supabase.co" in previous_url:
         storage_service.delete_object(previous_url)
@@ -1695,23 +1696,23 @@ async def upload_customization_image(
 def delete_customization_image(
     customization_id: str,
     user: User = Depends(require_creator),
+    session: Session = Depends(get_db),
 ):
     """Remove the attached image (best-effort delete from storage)."""
     cust_uuid = _parse_customization_uuid(customization_id)
 
-    with get_db_session() as session:
-        customization, order, product = _load_customization_with_order(
-            session, cust_uuid
-        )
+    customization, order, product = _load_customization_with_order(
+        session, cust_uuid
+    )
 
-        previous_url = customization.image_url
-        customization.image_url = None
-        session.commit()
-        session.refresh(customization)
-        total_qty = _sum_order_quantity(session, order.id)
-        response = _customization_to_queue_row(
-            customization, order, product.name, total_qty
-        )
+    previous_url = customization.image_url
+    customization.image_url = None
+    session.commit()
+    session.refresh(customization)
+    total_qty = _sum_order_quantity(session, order.id)
+    response = _customization_to_queue_row(
+        customization, order, product.name, total_qty
+    )
 
     if previous_url and "supabase.co" in previous_url:
         storage_service.delete_object(previous_url)
@@ -1726,6 +1727,7 @@ def update_order_item(
     order_item_id: str,
     body: CustomizationUpdateRequest,
     user: User = Depends(require_creator),
+    session: Session = Depends(get_db),
 ):
     """Toggle ``is_complete`` on a non-custom order item (sticker/token/etc.).
 
@@ -1734,16 +1736,15 @@ def update_order_item(
     """
     item_uuid = _parse_order_item_uuid(order_item_id)
 
-    with get_db_session() as session:
-        item, order, product = _load_order_item_with_order(session, item_uuid)
+    item, order, product = _load_order_item_with_order(session, item_uuid)
 
-        if body.is_complete is not None:
-            item.is_complete = body.is_complete
+    if body.is_complete is not None:
+        item.is_complete = body.is_complete
 
-        session.commit()
-        session.refresh(item)
-        total_qty = _sum_order_quantity(session, order.id)
-        return _orderitem_to_queue_row(item, order, product.name, total_qty)
+    session.commit()
+    session.refresh(item)
+    total_qty = _sum_order_quantity(session, order.id)
+    return _orderitem_to_queue_row(item, order, product.name, total_qty)
 
 
 # ---------------------------------------------------------------------------
@@ -1756,11 +1757,9 @@ def submit_contact(body: ContactRequest):
     admin_email = SHOP_ADMIN_EMAIL
     if not admin_email:
         with get_db_session() as session:
-            creator = session.execute(
-                select(User).where(func.lower(User.username) == "rosie")
-            ).scalar_one_or_none()
-            if creator and creator.email:
-                admin_email = creator.email
+            owner = page_owner.get(session)
+            if owner and owner.email:
+                admin_email = owner.email
 
     if not admin_email:
         logger.warning(
@@ -13,7 +13,6 @@ from streampage.api.middleware.authenticator import (
     validate_refresh_token,
     get_current_user,
     require_creator,
-    get_optional_current_user,
 )
 from streampage.api.user.auth import hash_password, verify_password
 from streampage.api.user.models import (
@@ -28,92 +27,102 @@ from streampage.api.user.models import (
     SocialLinkResponse,
 )
 from streampage.db.enums import Platform
-from streampage.db.engine import get_db_session
-from sqlalchemy import func
+from streampage.db.engine import get_async_db, get_db
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 from streampage.db.models import User, UserLogin, Biography, Social, FeaturedImages
+from streampage.services.owner import page_owner
 from streampage.services.storage import storage_service
+from streampage.services.user_cache import user_cache
 
 users_router = APIRouter()
 
 
 @users_router.post("/register")
-def register(request: AuthenticateRequest) -> TokenPairResponse:
-    with get_db_session() as session:
-        existing_user = session.query(User).filter(User.username == request.username).first()
-        if existing_user:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Username already exists",
-            )
+def register(
+    request: AuthenticateRequest,
+    session: Session = Depends(get_db),
+) -> TokenPairResponse:
+    existing_user = session.query(User).filter(User.username == request.username).first()
+    if existing_user:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Username already exists",
+        )
 
-        user = User(username=request.username)
-        session.add(user)
-        session.flush()
+    user = User(username=request.username)
+    session.add(user)
+    session.flush()
 
-        hashed_password = hash_password(request.password)
-        user_login = UserLogin(user=user, password=hashed_password)
-        session.add(user_login)
-        session.commit()
+    hashed_password = hash_password(request.password)
+    user_login = UserLogin(user=user, password=hashed_password)
+    session.add(user_login)
+    session.commit()
 
-        access_token, _ = create_access_token(user_login)
-        refresh_token, _ = create_refresh_token(user_login)
+    access_token, _ = create_access_token(user_login)
+    refresh_token, _ = create_refresh_token(user_login)
 
-        return TokenPairResponse(
-            access_token=access_token,
-            refresh_token=refresh_token,
-        )
+    return TokenPairResponse(
+        access_token=access_token,
+        refresh_token=refresh_token,
+    )
 
 
 @users_router.post("/login")
-def login(request: AuthenticateRequest) -> TokenPairResponse:
-    with get_db_session() as session:
-        user_login = (
-            session.query(UserLogin)
-            .filter(func.lower(UserLogin.username) == request.username.lower())
-            .first()
-        )
+def login(
+    request: AuthenticateRequest,
+    session: Session = Depends(get_db),
+) -> TokenPairResponse:
+    user_login = (
+        session.query(UserLogin)
+        .filter(func.lower(UserLogin.username) == request.username.lower())
+        .first()
+    )
 
-        if not user_login:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid username or password",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+    if not user_login:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid username or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
-        if not verify_password(request.password, user_login.password):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid username or password",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+    if not verify_password(request.password, user_login.password):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid username or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
-        access_token, _ = create_access_token(user_login)
-        refresh_token, _ = create_refresh_token(user_login)
+    access_token, _ = create_access_token(user_login)
+    refresh_token, _ = create_refresh_token(user_login)
 
-        return TokenPairResponse(access_token=access_token, refresh_token=refresh_token)
+    return TokenPairResponse(access_token=access_token, refresh_token=refresh_token)
 
 
 @users_router.post("/refresh")
-def refresh(request: RefreshRequest) -> TokenPairResponse:
+def refresh(
+    request: RefreshRequest,
+    session: Session = Depends(get_db),
+) -> TokenPairResponse:
     """Exchange a valid refresh token for a new access + refresh token pair."""
     username = validate_refresh_token(request.refresh_token)
 
-    with get_db_session() as session:
-        user_login = (
-            session.query(UserLogin)
-            .filter(func.lower(UserLogin.username) == username.lower())
-            .first()
+    user_login = (
+        session.query(UserLogin)
+        .filter(func.lower(UserLogin.username) == username.lower())
+        .first()
+    )
+    if not user_login:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
         )
-        if not user_login:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found",
-            )
 
-        access_token, _ = create_access_token(user_login)
-        new_refresh_token, _ = create_refresh_token(user_login)
+    access_token, _ = create_access_token(user_login)
+    new_refresh_token, _ = create_refresh_token(user_login)
 
-        return TokenPairResponse(access_token=access_token, refresh_token=new_refresh_token)
+    return TokenPairResponse(access_token=access_token, refresh_token=new_refresh_token)
 
 
 @users_router.get("/user")
@@ -136,92 +145,99 @@ def get_user_with_jwt(current_user=Depends(get_current_user)) -> UserResponse:
 
 
 @users_router.get("/public-profile")
-def get_public_profile(
-    user=Depends(get_optional_current_user)
+async def get_public_profile(
+    session: AsyncSession = Depends(get_async_db),
 ) -> PublicProfileResponse:
     """Get page owner's (rosie's) public profile. Available to all users."""
-    with get_db_session() as session:
-        # Find rosie (hardcoded page owner)
-        rosie_user = session.query(User).filter(User.username == "rosie").first()
-        if not rosie_user:
-            raise HTTPException(status_code=404, detail="Page owner not found")
-        
-        # Get biography
-        bio = session.query(Biography).filter(Biography.user_id == rosie_user.id).first()
-        biography = bio.content if bio and bio.content else None
-        
-        # Get social links
-        socials = session.query(Social).filter(Social.user_id == rosie_user.id).all()
-        social_links = [
-            SocialLinkResponse(platform=social.platform.value, url=social.url)
-            for social in socials
-        ] if socials else None
-        
-        # Get featured images (use first one if available)
-        featured_images_entry = session.query(FeaturedImages).filter(
-            FeaturedImages.user_id == rosie_user.id
-        ).first()
-        featured_image = (
-            featured_images_entry.images[0] 
-            if featured_images_entry and featured_images_entry.images 
-            else None
-        )
-        
-        return PublicProfileResponse(
-            display_name=rosie_user.display_name,
-            birthday=rosie_user.birthday,
-            profile_picture=rosie_user.profile_picture,
-            biography=biography,
-            social_links=social_links,
-            featured_image=featured_image,
-        )
+    # Find rosie (hardcoded page owner)
+    owner = await page_owner.get_async(session)
+    rosie_user = await session.get(User, owner.id) if owner else None
+    if not rosie_user:
+        raise HTTPException(status_code=404, detail="Page owner not found")
+    
+    # Get biography
+    bio = (await session.execute(
+        select(Biography).where(Biography.user_id == rosie_user.id)
+    )).scalars().first()
+    biography = bio.content if bio and bio.content else None
+    
+    # Get social links
+    socials = (await session.execute(
+        select(Social).where(Social.user_id == rosie_user.id)
+    )).scalars().all()
+    social_links = [
+        SocialLinkResponse(platform=social.platform.value, url=social.url)
+        for social in socials
+    ] if socials else None
+    
+    # Get featured images (use first one if available)
+    featured_images_entry = (await session.execute(
+        select(FeaturedImages).where(FeaturedImages.user_id == rosie_user.id)
+    )).scalars().first()
+    featured_image = (
+        featured_images_entry.images[0] 
+        if featured_images_entry and featured_images_entry.images 
+        else None
+    )
+    
+    return PublicProfileResponse(
+        display_name=rosie_user.display_name,
+        birthday=rosie_user.birthday,
+        profile_picture=rosie_user.profile_picture,
+        biography=biography,
+        social_links=social_links,
+        featured_image=featured_image,
+    )
 
 
 @users_router.put("/profile")
 def update_profile(
     request: UpdateProfileRequest,
-    current_user: User = Depends(require_creator)
+    current_user: User = Depends(require_creator),
+    session: Session = Depends(get_db),
 ) -> UserResponse:
     """Update user profile. Only creator can update."""
-    with get_db_session() as session:
-        user = session.query(User).filter(User.id == current_user.id).first()
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-        
-        # Update user fields
-        if request.display_name is not None:
-            user.display_name = request.display_name
-        if request.birthday is not None:
-            user.birthday = request.birthday
-        if request.email is not None:
-            user.email = request.email
-
-        # Update biography if provided
-        if request.biography is not None:
-            bio = session.query(Biography).filter(Biography.user_id == user.id).first()
-            if bio:
-                bio.content = request.biography
-            else:
-                bio = Biography(user_id=user.id, content=request.biography)
-                session.add(bio)
-        
-        session.commit()
-        session.refresh(user)
-        
-        return UserResponse(
-            id=user.id,
-            username=user.username,
-            email=user.email,
-            display_name=user.display_name,
-            birthday=user.birthday,
-            profile_picture=user.profile_picture,
-        )
+    user = session.query(User).filter(User.id == current_user.id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    # Update user fields
+    if request.display_name is not None:
+        user.display_name = request.display_name
+    if request.birthday is not None:
+        user.birthday = request.birthday
+    if request.email is not None:
+        user.email = request.email
+
+    # Update biography if provided
+    if request.biography is not None:
+        bio = session.query(Biography).filter(Biography.user_id == user.id).first()
+        if bio:
+            bio.content = request.biography
+        else:
+            bio = Biography(user_id=user.id, content=request.biography)
+            session.add(bio)
+    
+    session.commit()
+    session.refresh(user)
+    page_owner.invalidate()
+    user_cache.invalidate(user.id)
+    
+    return UserResponse(
+        id=user.id,
+        username=user.username,
+        email=user.email,
+        display_name=user.display_name,
+        birthday=user.birthday,
+        profile_picture=user.profile_picture,
+    )
 
 
 @users_router.post("/profile-picture")
 async def upload_profile_picture(
     file: UploadFile = File(...),
-    current_user: User = Depends(require_creator)
+    current_user: User = Depends(require_creator),
+    session: Session = Depends(get_db),
 ) -> ResponseMessage:
     """Upload a new profile picture. Only creator can upload."""
     
@@ -243,15 +259,15 @@ async def upload_profile_picture(
     public_url = storage_service.upload_image(contents, "profile", file_extension)
     
     # Update user's profile_picture in database
-    with get_db_session() as session:
-        user = session.query(User).filter(User.id == current_user.id).first()
-        if user:
-            # Delete old image from Supabase if it exists
-            if user.profile_picture and "supabase.co" in user.profile_picture:
-                storage_service.delete_image(user.profile_picture)
-            
-            user.profile_picture = public_url
-            session.commit()
+    user = session.query(User).filter(User.id == current_user.id).first()
+    if user:
+        # Delete old image from Supabase if it exists
+        if user.profile_picture and "supabase.co" in user.profile_picture:
+            storage_service.delete_image(user.profile_picture)
+        
+        user.profile_picture = public_url
+        session.commit()
+        user_cache.invalidate(user.id)
     
     return ResponseMessage(message="Profile picture uploaded successfully")
 
@@ -259,7 +275,8 @@ async def upload_profile_picture(
 @users_router.post("/featured-image")
 async def upload_featured_image(
     file: UploadFile = File(...),
-    current_user: User = Depends(require_creator)
+    current_user: User = Depends(require_creator),
+    session: Session = Depends(get_db),
 ) -> ResponseMessage:
     """Upload a new featured image for the main card. Only creator can upload."""
     
@@ -281,29 +298,28 @@ async def upload_featured_image(
     public_url = storage_service.upload_image(contents, "featured", file_extension)
     
     # Store the URL in the FeaturedImages table
-    with get_db_session() as session:
-        featured_images = session.query(FeaturedImages).filter(
-            FeaturedImages.user_id == current_user.id
-        ).first()
-        
-        if featured_images:
-            # Delete old image from Supabase if it exists
-            if featured_images.images and len(featured_images.images) > 0:
-                old_url = featured_images.images[0]
-                if "supabase.co" in old_url:
-                    storage_service.delete_image(old_url)
-            
-            # Update existing entry - replace the first image
-            featured_images.images = [public_url]
-        else:
-            # Create new entry
-            featured_images = FeaturedImages(
-                user_id=current_user.id,
-                images=[public_url]
-            )
-            session.add(featured_images)
+    featured_images = session.query(FeaturedImages).filter(
+        FeaturedImages.user_id == current_user.id
+    ).first()
+    
+    if featured_images:
+        # Delete old image from Supabase if it exists
+        if featured_images.images and len(featured_images.images) > 0:
+            old_url = featured_images.images[0]
+            if "supabase.co" in old_url:
+                storage_service.delete_image(old_url)
         
-        session.commit()
+        # Update existing entry - replace the first image
+        featured_images.images = [public_url]
+    else:
+        # Create new entry
+        featured_images = FeaturedImages(
+            user_id=current_user.id,
+            images=[public_url]
+        )
+        session.add(featured_images)
+    
+    session.commit()
     
     return ResponseMessage(message=public_url)
 
@@ -311,7 +327,8 @@ async def upload_featured_image(
 @users_router.put("/social-links")
 def update_social_links(
     request: UpdateSocialLinksRequest,
-    current_user: User = Depends(require_creator)
+    current_user: User = Depends(require_creator),
+    session: Session = Depends(get_db),
 ) -> ResponseMessage:
     """Update user's social links. Only creator can update."""
     
@@ -324,20 +341,19 @@ def update_social_links(
                 detail=f"Invalid platform: {link.platform}. Valid platforms: {', '.join(valid_platforms)}"
             )
     
-    with get_db_session() as session:
-        # Delete existing social links for the user
-        session.query(Social).filter(Social.user_id == current_user.id).delete()
-        
-        # Add new social links
-        for link in request.social_links:
-            platform_enum = Platform(link.platform.lower())
-            social = Social(
-                user_id=current_user.id,
-                platform=platform_enum,
-                url=link.url
-            )
-            session.add(social)
-        
-        session.commit()
+    # Delete existing social links for the user
+    session.query(Social).filter(Social.user_id == current_user.id).delete()
+    
+    # Add new social links
+    for link in request.social_links:
+        platform_enum = Platform(link.platform.lower())
+        social = Social(
+            user_id=current_user.id,
+            platform=platform_enum,
+            url=link.url
+        )
+        session.add(social)
+    
+    session.commit()
     
     return ResponseMessage(message="Social links updated successfully")
@@ -22,6 +22,21 @@ else:
 if DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
+# Sync SQLAlchemy pool per process. The background worker sizes its own pool
+# from WORKER_DB_POOL_SIZE / WORKER_DB_MAX_OVERFLOW instead (see streampage/worker.py).
+DB_POOL_SIZE: Final[int] = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW: Final[int] = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+# The asyncpg engine used by the async read routes has its own pool, on top
+# of the sync one; defaults to the same size. Keep the sum of both (times web
+# workers and replicas) under Postgres' max_connections.
+ASYNC_DB_POOL_SIZE: Final[int] = int(os.getenv("ASYNC_DB_POOL_SIZE", str(DB_POOL_SIZE)))
+ASYNC_DB_MAX_OVERFLOW: Final[int] = int(os.getenv("ASYNC_DB_MAX_OVERFLOW", str(DB_MAX_OVERFLOW)))
+# Per-request pool checkout timing (off by default). When on, requests that
+# keep sync pool connections checked out longer than DB_HOLD_WARN_MS in total
+# are logged, and outside Railway responses report it in a Server-Timing header.
+DB_POOL_TIMING: bool = os.getenv("DB_POOL_TIMING", "false").lower() in ("true", "1", "yes")
+DB_HOLD_WARN_MS: Final[int] = int(os.getenv("DB_HOLD_WARN_MS", "500"))
+
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:3000")
 
 SECRET_KEY: Final[str] = os.getenv("SECRET_KEY", "2cb48b02c2191d966bad7116")
@@ -30,6 +45,34 @@ OAUTH2_SCHEME = OAuth2PasswordBearer(tokenUrl="users/login")
 OAUTH2_SCHEME_OPTIONAL = OAuth2PasswordBearer(tokenUrl="users/login", auto_error=False)
 
 RIOT_API_KEY: Final[str] = os.getenv("RIOT_API_KEY", "")
+RIOT_HTTP_TIMEOUT: Final[float] = float(os.getenv("RIOT_HTTP_TIMEOUT", "10"))
+RIOT_HTTP_CONNECT_TIMEOUT: Final[float] = float(os.getenv("RIOT_HTTP_CONNECT_TIMEOUT", "5"))
+RIOT_HTTP_MAX_CONNECTIONS: Final[int] = int(os.getenv("RIOT_HTTP_MAX_CONNECTIONS", "10"))
+# Match-detail requests in flight per summoner refresh (keep <= RIOT_HTTP_MAX_CONNECTIONS).
+RIOT_MATCH_FETCH_CONCURRENCY: Final[int] = int(os.getenv("RIOT_MATCH_FETCH_CONCURRENCY", "5"))
+# How long a resolved Riot ID -> PUUID mapping is trusted before re-checking it.
+RIOT_PUUID_RESOLVE_TTL_HOURS: Final[int] = int(os.getenv("RIOT_PUUID_RESOLVE_TTL_HOURS", "168"))
+# Summoners refreshed concurrently by the scheduled refresh (paced by the Riot rate limiter).
+SCHEDULER_REFRESH_WORKERS: Final[int] = int(os.getenv("SCHEDULER_REFRESH_WORKERS", "4"))
+# How often the background worker looks for accounts due a refresh.
+REFRESH_TICK_MINUTES: Final[int] = int(os.getenv("REFRESH_TICK_MINUTES", "5"))
+# How often the background worker polls for queued duo match ingestion jobs.
+DUO_INGEST_POLL_SECONDS: Final[int] = int(os.getenv("DUO_INGEST_POLL_SECONDS", "5"))
+# A running ingestion job with no committed batch for this long is assumed dead and re-queued.
+DUO_INGEST_STALE_MINUTES: Final[int] = int(os.getenv("DUO_INGEST_STALE_MINUTES", "10"))
+# Minimum time between on-demand /opgg/refresh runs for one owner.
+OPGG_REFRESH_COOLDOWN_SECONDS: Final[int] = int(os.getenv("OPGG_REFRESH_COOLDOWN_SECONDS", "300"))
+# How often the background worker polls for queued /opgg/refresh jobs.
+OPGG_REFRESH_POLL_SECONDS: Final[int] = int(os.getenv("OPGG_REFRESH_POLL_SECONDS", "5"))
+# Refresh workers (scheduled and /opgg/refresh) + the leader lock connection
+# + the entry streaming cursor + duo ingestion.
+WORKER_DB_POOL_SIZE: Final[int] = int(os.getenv("WORKER_DB_POOL_SIZE", str(SCHEDULER_REFRESH_WORKERS * 2 + 3)))
+WORKER_DB_MAX_OVERFLOW: Final[int] = int(os.getenv("WORKER_DB_MAX_OVERFLOW", "2"))
+# Start (UTC date) of the ranked season used until a duo_season row covers today.
+RIOT_SEASON_START: Final[str] = os.getenv("RIOT_SEASON_START", "2026-01-08")
+RIOT_HTTP2: bool = os.getenv("RIOT_HTTP2", "true").lower() in ("true", "1", "yes")
+# App rate limit assumed until Riot's X-App-Rate-Limit header is seen ("count:seconds,...").
+RIOT_APP_RATE_LIMIT: Final[str] = os.getenv("RIOT_APP_RATE_LIMIT", "20:1,100:120")
 
 SMTP_HOST: Final[str] = os.getenv("SMTP_HOST", "")
 SMTP_PORT: Final[int] = int(os.getenv("SMTP_PORT", "587"))
@@ -1,13 +1,24 @@
 import logging
 import os
-from collections.abc import Generator
+import time
+from collections.abc import AsyncGenerator, Generator
+from contextvars import ContextVar
+from dataclasses import dataclass
 from functools import lru_cache
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
-from streampage.config import DATABASE_URL, IS_RAILWAY
+from streampage.config import (
+    ASYNC_DB_MAX_OVERFLOW,
+    ASYNC_DB_POOL_SIZE,
+    DATABASE_URL,
+    DB_MAX_OVERFLOW,
+    DB_POOL_SIZE,
+    IS_RAILWAY,
+)
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -20,6 +31,56 @@ logging.getLogger("sqlalchemy.pool").setLevel(logging.WARNING)
 logging.getLogger("sqlalchemy.orm").setLevel(logging.WARNING)
 
 
+_pool_size = DB_POOL_SIZE
+_max_overflow = DB_MAX_OVERFLOW
+
+
+@dataclass
+class PoolHoldStats:
+    """Sync pool connections checked out (and for how long) on behalf of one request."""
+
+    checkouts: int = 0
+    held_seconds: float = 0.0
+    longest_seconds: float = 0.0
+
+
+# Set per request by PoolTimingMiddleware (streampage/api/middleware/
+# pool_timing.py), which is only installed when DB_POOL_TIMING is enabled;
+# otherwise it stays None and the pool listeners below record nothing. They
+# add to whichever stats object was current when a connection was checked out.
+pool_hold_stats: ContextVar[PoolHoldStats | None] = ContextVar("pool_hold_stats", default=None)
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+    connection_record.info["checked_out_at"] = time.perf_counter()
+    connection_record.info["hold_stats"] = pool_hold_stats.get()
+
+
+def _on_checkin(dbapi_connection, connection_record) -> None:
+    if connection_record is None:  # detached connection
+        return
+    checked_out_at = connection_record.info.pop("checked_out_at", None)
+    stats = connection_record.info.pop("hold_stats", None)
+    if checked_out_at is None or stats is None:
+        return
+    held = time.perf_counter() - checked_out_at
+    stats.checkouts += 1
+    stats.held_seconds += held
+    stats.longest_seconds = max(stats.longest_seconds, held)
+
+
+def configure_pool(pool_size: int, max_overflow: int) -> None:
+    """Override the sync pool size for this process (e.g. the background worker).
+
+    Must be called before the engine is first used.
+    """
+    global _pool_size, _max_overflow
+    if get_engine.cache_info().currsize:
+        raise RuntimeError("configure_pool() called after the engine was created")
+    _pool_size = pool_size
+    _max_overflow = max_overflow
+
+
 @lru_cache()
 def get_engine():
     """Lazily create and cache the database engine."""
@@ -40,11 +101,13 @@ def get_engine():
     engine = create_engine(
         DATABASE_URL,
         pool_pre_ping=True,
-        pool_size=5,
-        max_overflow=10,
+        pool_size=_pool_size,
+        max_overflow=_max_overflow,
         connect_args=connect_args,
         echo=False,
     )
+    event.listen(engine, "checkout", _on_checkout)
+    event.listen(engine, "checkin", _on_checkin)
     
     # Test connection
     try:
@@ -58,18 +121,28 @@ def get_engine():
     return engine
 
 
-def get_session_local():
-    """Get the session factory."""
-    return sessionmaker(
+@lru_cache()
+def get_session_local() -> sessionmaker[Session]:
+    """Lazily create and cache the session factory."""
+    session_local = sessionmaker(
         bind=get_engine(),
         autocommit=False,
         autoflush=False,
         expire_on_commit=False,
     )
+    # Track flushed-but-uncommitted writes for release_connection().
+    event.listen(session_local, "after_flush", _mark_flushed)
+    event.listen(session_local, "after_commit", _clear_flushed)
+    event.listen(session_local, "after_rollback", _clear_flushed)
+    return session_local
 
 
 def get_db() -> Generator[Session, None, None]:
-    """Provide a database session for FastAPI dependency injection."""
+    """Provide a request-scoped database session for FastAPI dependency injection.
+
+    FastAPI caches dependencies per request, so the auth dependencies and the
+    route handler all receive this same session (and pool connection).
+    """
     SessionLocal = get_session_local()
     db = SessionLocal()
     try:
@@ -82,7 +155,87 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def _mark_flushed(session: Session, flush_context) -> None:
+    session.info["flushed_writes"] = True
+
+
+def _clear_flushed(session: Session, *args) -> None:
+    session.info.pop("flushed_writes", None)
+
+
+def release_connection(session: Session) -> None:
+    """End the session's read-only transaction so its pool connection goes back to the pool.
+
+    Call from an endpoint before slow work that doesn't need the database
+    (Riot API calls) so the connection isn't held, idle in transaction, for
+    the duration. Loaded objects stay usable (expire_on_commit=False) and the
+    session checks out a connection again on its next query.
+
+    Raises RuntimeError if the session has pending or flushed writes, since
+    releasing would commit them in the middle of the caller's unit of work.
+    """
+    if session.new or session.dirty or session.deleted or session.info.get("flushed_writes"):
+        raise RuntimeError("release_connection() called with uncommitted writes")
+    session.commit()
+
+
 def get_db_session() -> Session:
-    """Get a new database session. Remember to close after use!"""
+    """Get a new database session outside of a request. Remember to close after use!"""
     SessionLocal = get_session_local()
     return SessionLocal()
+
+
+def _async_database_url() -> str:
+    """Rewrite DATABASE_URL to use the asyncpg driver."""
+    scheme, _, rest = DATABASE_URL.partition("://")
+    return f"postgresql+asyncpg://{rest}" if scheme.startswith("postgresql") else DATABASE_URL
+
+
+@lru_cache()
+def get_async_engine() -> AsyncEngine:
+    """Lazily create and cache the asyncpg engine used by async routes.
+
+    Sized by ASYNC_DB_POOL_SIZE / ASYNC_DB_MAX_OVERFLOW (defaulting to the
+    sync pool's settings); it has its own pool, so the hot read paths no
+    longer compete with the threadpool-bound sync handlers for connections.
+    """
+    logger.info(f"Creating async database engine (Railway: {IS_RAILWAY})")
+
+    # asyncpg takes different connect kwargs than psycopg2.
+    connect_args: dict = {"timeout": 10}
+    if IS_RAILWAY:
+        connect_args.update({
+            "ssl": "require",
+            "server_settings": {"application_name": "ros_backend_async"},
+        })
+
+    return create_async_engine(
+        _async_database_url(),
+        pool_pre_ping=True,
+        pool_size=ASYNC_DB_POOL_SIZE,
+        max_overflow=ASYNC_DB_MAX_OVERFLOW,
+        connect_args=connect_args,
+        echo=False,
+    )
+
+
+@lru_cache()
+def get_async_session_local() -> async_sessionmaker[AsyncSession]:
+    """Lazily create and cache the async session factory."""
+    return async_sessionmaker(
+        bind=get_async_engine(),
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Provide a request-scoped async session for FastAPI dependency injection."""
+    AsyncSessionLocal = get_async_session_local()
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except SQLAlchemyError as e:
+            await db.rollback()
+            logger.error(f"Database error: {str(e)}")
+            raise
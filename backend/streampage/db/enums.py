@@ -64,3 +64,10 @@ class ShippingMethod(PyEnum):
     NO_TRACKING = "no_tracking"
     PICKUP = "pickup"
 
+
+class DuoWindow(PyEnum):
+    ALL = "all"
+    WEEK = "7d"
+    MONTH = "30d"
+    SEASON = "season"
+    CUSTOM = "custom"
@@ -185,7 +185,32 @@ class SummonerData(Base):
     # Format: [{"match_id": str, "champion_id": int, "champion_name": str, "win": bool, ...}, ...]
     recent_matches: Mapped[list | None] = mapped_column(JSONB, nullable=True)
     
+    # Last time the data changed (unchanged refreshes don't touch the row)
     last_updated: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    # Last time the PUUID was re-resolved from the Riot ID
+    puuid_resolved_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # When the background refresh should next check this summoner (set from its activity tier)
+    next_refresh_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+
+class Match(Base):
+    """Immutable store of finished Riot matches, keyed by match ID.
+
+    Finished matches never change, so each one is downloaded once and shared
+    by int list/OPGG refreshes and duo tracking. Only the participant fields
+    the site reads are kept, not the full match-v5 payload.
+    """
+    __tablename__ = "match"
+
+    match_id: Mapped[str] = mapped_column(String, primary_key=True)  # Riot match ID (e.g., "NA1_123456789")
+    queue_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    played_at: Mapped[datetime] = mapped_column(DateTime)
+
+    # Format: [{"puuid": str, "team_id": int, "win": bool, "champion_id": int, "champion_name": str,
+    #           "kills": int, "deaths": int, "assists": int, "game_name": str, "tag_line": str}, ...]
+    participants: Mapped[list] = mapped_column(JSONB)
+
+    fetched_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
 
 class HiddenMatch(Base):
@@ -199,6 +224,81 @@ class HiddenMatch(Base):
     match_id: Mapped[str] = mapped_column(String, index=True)  # Riot match ID (e.g., "NA1_123456789")
 
 
+class OpggRefreshJob(Base):
+    """An on-demand refresh of the owner's OPGG accounts, run by the background worker.
+
+    At most one job per owner is queued or running at a time (enforced by a
+    partial unique index), so concurrent refresh clicks coalesce into it.
+    """
+    __tablename__ = "opgg_refresh_job"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        PGUUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    owner_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("user.id"))
+    requested_by: Mapped[uuid.UUID | None] = mapped_column(ForeignKey("user.id"), nullable=True)
+    status: Mapped[str] = mapped_column(String(20), default="queued")  # queued, running, succeeded, failed
+    accounts_total: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    accounts_refreshed: Mapped[int] = mapped_column(Integer, default=0)
+    accounts_failed: Mapped[int] = mapped_column(Integer, default=0)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # Bumped as accounts finish; a running job that stops heartbeating is reclaimed.
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index(
+            "uq_opgg_refresh_job_owner_active",
+            "owner_id",
+            unique=True,
+            postgresql_where=text("status IN ('queued', 'running')"),
+        ),
+        Index("ix_opgg_refresh_job_owner_created_at", "owner_id", "created_at"),
+    )
+
+
+class RiotRateLimitBucket(Base):
+    """Shared request counter for one Riot rate-limit window.
+
+    One row per (host, scope, window), e.g. ``americas.api.riotgames.com|app|120``.
+    Rows are locked while a request is admitted so every worker/replica draws
+    from the same budget.
+    """
+    __tablename__ = "riot_rate_limit_bucket"
+
+    bucket: Mapped[str] = mapped_column(String(200), primary_key=True)
+    window_started_at: Mapped[datetime] = mapped_column(DateTime)
+    request_count: Mapped[int] = mapped_column(Integer, default=0)
+    blocked_until: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+
+class JobRun(Base):
+    """One execution of a background job, kept for throughput/failure metrics."""
+    __tablename__ = "job_run"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        PGUUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    job_name: Mapped[str] = mapped_column(String(100))
+    status: Mapped[str] = mapped_column(String(20))  # succeeded, failed
+    started_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    duration_seconds: Mapped[float | None] = mapped_column(Numeric(10, 2), nullable=True)
+
+    items_total: Mapped[int] = mapped_column(Integer, default=0)
+    items_succeeded: Mapped[int] = mapped_column(Integer, default=0)
+    items_failed: Mapped[int] = mapped_column(Integer, default=0)
+    riot_calls: Mapped[int] = mapped_column(Integer, default=0)
+    riot_rate_limited: Mapped[int] = mapped_column(Integer, default=0)  # 429 responses
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    __table_args__ = (
+        Index("ix_job_run_job_name_started_at", "job_name", "started_at"),
+    )
+
+
 class Media(Base):
     """Media entries for movies, TV shows, kdramas, anime, and YouTube."""
     __tablename__ = "media"
@@ -418,15 +518,112 @@ class DuoTrackedAccount(Base):
     last_updated: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
 
+class DuoIngestJob(Base):
+    """A queued backfill of the tracked account's ranked matches.
+
+    Enqueued by the /duos/account endpoints and run by the background worker,
+    which commits matches in batches and records its progress here.
+    """
+    __tablename__ = "duo_ingest_job"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        PGUUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    owner_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("user.id"))
+    status: Mapped[str] = mapped_column(String(20), default="queued")  # queued, running, succeeded, failed
+    # Recount every duo entry once ingestion finishes (the tracked account changed).
+    recalculate: Mapped[bool] = mapped_column(Boolean, default=False)
+    matches_total: Mapped[int | None] = mapped_column(Integer, nullable=True)  # None until the ID list is fetched
+    matches_fetched: Mapped[int] = mapped_column(Integer, default=0)
+    matches_stored: Mapped[int] = mapped_column(Integer, default=0)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # Bumped with every committed batch; a running job that stops heartbeating is reclaimed.
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_duo_ingest_job_status_created_at", "status", "created_at"),
+        Index("ix_duo_ingest_job_owner_created_at", "owner_id", "created_at"),
+        # At most one queued job per owner, so concurrent enqueues coalesce.
+        Index(
+            "uq_duo_ingest_job_owner_queued",
+            "owner_id",
+            unique=True,
+            postgresql_where=text("status = 'queued'"),
+        ),
+    )
+
+
+class DuoSeason(Base):
+    """A ranked season. duo_match and duo_match_teammate are partitioned by it.
+
+    Each season gets its own partition of both tables over [starts_at,
+    ends_at) of played_at (see services/duo_seasons.py); archiving a season
+    snapshots its records into DuoSeasonRecord and detaches its partitions.
+    """
+    __tablename__ = "duo_season"
+
+    name: Mapped[str] = mapped_column(String(20), primary_key=True)  # e.g. "2026"
+    starts_at: Mapped[datetime] = mapped_column(DateTime)
+    ends_at: Mapped[datetime] = mapped_column(DateTime)  # exclusive
+    archived_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+
+class DuoSeasonRecord(Base):
+    """A duo entry's record for one season, snapshotted from its matches."""
+    __tablename__ = "duo_season_record"
+
+    season: Mapped[str] = mapped_column(ForeignKey("duo_season.name"), primary_key=True)
+    entry_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("duo_entry.id", ondelete="CASCADE"), primary_key=True
+    )
+    owner_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("user.id"))
+    wins: Mapped[int] = mapped_column(Integer, default=0)
+    losses: Mapped[int] = mapped_column(Integer, default=0)
+    snapshotted_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
 class DuoMatch(Base):
-    """A stored ranked match from the owner's match history."""
+    """A stored ranked match from the owner's match history.
+
+    Range-partitioned on played_at, one partition per DuoSeason, so the
+    partition key is part of the primary key.
+    """
     __tablename__ = "duo_match"
 
     match_id: Mapped[str] = mapped_column(String, primary_key=True)
     owner_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("user.id"), primary_key=True)
     win: Mapped[bool] = mapped_column(Boolean)
     teammates: Mapped[list] = mapped_column(JSONB)
-    played_at: Mapped[datetime] = mapped_column(DateTime)
+    played_at: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+
+    __table_args__ = (
+        # Time-windowed records (/duos/list?window=7d etc.).
+        Index("ix_duo_match_owner_played_at", "owner_id", "played_at"),
+        {"postgresql_partition_by": "RANGE (played_at)"},
+    )
+
+
+class DuoMatchTeammate(Base):
+    """One teammate (lowercase "name#tag") of the owner in a stored DuoMatch.
+
+    Normalized copy of DuoMatch.teammates so duo records can be counted with
+    a GROUP BY join against DuoEntryAccount in the database. Carries the
+    match's played_at so it is partitioned by season alongside duo_match.
+    """
+    __tablename__ = "duo_match_teammate"
+
+    owner_id: Mapped[uuid.UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True)
+    match_id: Mapped[str] = mapped_column(String, primary_key=True)
+    teammate_name: Mapped[str] = mapped_column(String, primary_key=True)
+    played_at: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+
+    __table_args__ = (
+        Index("ix_duo_match_teammate_owner_name", "owner_id", "teammate_name"),
+        {"postgresql_partition_by": "RANGE (played_at)"},
+    )
 
 
 class DuoEntry(Base):
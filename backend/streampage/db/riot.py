@@ -1,16 +1,35 @@
 from __future__ import annotations
 
+import contextvars
 import logging
-import time
+import threading
 import httpx
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Optional
 from urllib.parse import quote
 
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
-from streampage.config import RIOT_API_KEY
-from streampage.db.models import IntListEntry, OpggEntry, SummonerData
+from streampage.config import (
+    RIOT_API_KEY,
+    RIOT_HTTP2,
+    RIOT_HTTP_CONNECT_TIMEOUT,
+    RIOT_HTTP_MAX_CONNECTIONS,
+    RIOT_HTTP_TIMEOUT,
+    RIOT_MATCH_FETCH_CONCURRENCY,
+    RIOT_PUUID_RESOLVE_TTL_HOURS,
+    RIOT_SEASON_START,
+)
+from streampage.db.engine import get_db_session
+from streampage.db.models import DuoTrackedAccount, IntListEntry, Match, OpggEntry, SummonerData
+from streampage.services.rate_limiter import riot_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -18,19 +37,86 @@ RIOT_ACCOUNT_API_BASE = "https://americas.api.riotgames.com"
 RIOT_NA_API_BASE = "https://na1.api.riotgames.com"
 RIOT_AUTH_HEADERS = {"X-Riot-Token": RIOT_API_KEY}
 
-RATE_LIMIT_DELAY = 1.3  # seconds between match detail requests
+# Rate limit method names, one per Riot endpoint (each has its own budget).
+ACCOUNT_BY_RIOT_ID = "account-v1.by-riot-id"
+LEAGUE_ENTRIES_BY_PUUID = "league-v4.entries.by-puuid"
+MATCH_IDS_BY_PUUID = "match-v5.ids.by-puuid"
+MATCH_BY_ID = "match-v5.match"
 
 
-def _riot_get(client: httpx.Client, url: str, **kwargs) -> httpx.Response:
-    """GET with automatic retry on 429 rate limits."""
+@lru_cache()
+def get_riot_client() -> httpx.Client:
+    """Lazily create and cache the process-wide Riot API client.
+
+    One pooled keep-alive client is shared by every caller (httpx clients are
+    thread-safe), so a summoner refresh reuses warm TCP/TLS connections to
+    americas/na1 instead of handshaking once per request.
+    """
+    return httpx.Client(
+        headers=RIOT_AUTH_HEADERS,
+        http2=RIOT_HTTP2,
+        timeout=httpx.Timeout(RIOT_HTTP_TIMEOUT, connect=RIOT_HTTP_CONNECT_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=RIOT_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=RIOT_HTTP_MAX_CONNECTIONS,
+            keepalive_expiry=60,
+        ),
+    )
+
+
+def close_riot_client() -> None:
+    """Close the shared Riot client if it was ever created."""
+    if get_riot_client.cache_info().currsize:
+        get_riot_client().close()
+        get_riot_client.cache_clear()
+
+
+class RiotCallCounter:
+    """Count of Riot requests and 429s made during one job run."""
+
+    def __init__(self):
+        self.calls = 0
+        self.rate_limited = 0
+        self._lock = threading.Lock()
+
+    def record(self, status_code: int) -> None:
+        with self._lock:
+            self.calls += 1
+            if status_code == 429:
+                self.rate_limited += 1
+
+    def snapshot(self) -> tuple[int, int]:
+        with self._lock:
+            return self.calls, self.rate_limited
+
+
+# Set by track_job_run for the duration of a run, so concurrent jobs each
+# count only their own calls. Thread pools that call Riot on a run's behalf
+# submit work through contextvars.copy_context() to carry it along.
+current_riot_call_counter: ContextVar[RiotCallCounter | None] = ContextVar(
+    "current_riot_call_counter", default=None
+)
+
+
+def _riot_get(url: str, method: str, **kwargs) -> httpx.Response:
+    """GET through the shared rate limiter, retrying on 429 rate limits.
+
+    Every call waits for room in the app and per-method budgets (shared by all
+    workers), and each response's rate limit headers are fed back to the
+    limiter so it tracks what Riot has actually counted.
+    """
+    client = get_riot_client()
     max_retries = 3
     for attempt in range(max_retries):
-        response = client.get(url, headers=RIOT_AUTH_HEADERS, **kwargs)
+        riot_rate_limiter.acquire(url, method)
+        response = client.get(url, **kwargs)
+        counter = current_riot_call_counter.get()
+        if counter is not None:
+            counter.record(response.status_code)
+        riot_rate_limiter.record(url, method, response)
         if response.status_code != 429:
             return response
-        retry_after = int(response.headers.get("Retry-After", "5"))
-        logger.info("Rate limited, waiting %ds (attempt %d/%d)", retry_after, attempt + 1, max_retries)
-        time.sleep(retry_after)
+        logger.info("Rate limited on %s (attempt %d/%d)", method, attempt + 1, max_retries)
     return response
 
 
@@ -39,96 +125,179 @@ def get_puuid(game_name: str, tag_line: str) -> str:
     encoded_name = quote(game_name)
     url = f"{RIOT_ACCOUNT_API_BASE}/riot/account/v1/accounts/by-riot-id/{encoded_name}/{tag_line}"
     
-    with httpx.Client() as client:
-        response = client.get(url, headers=RIOT_AUTH_HEADERS)
-        response.raise_for_status()
-        data = response.json()
-        return data["puuid"]
-
-
-def get_rank_by_puuid(puuid: str) -> Optional[str]:
-    """Get ranked solo/duo rank for a player by PUUID. Returns formatted rank string like 'DIAMOND IV 25LP'."""
-    url = f"{RIOT_NA_API_BASE}/lol/league/v4/entries/by-puuid/{puuid}"
-    
-    with httpx.Client() as client:
-        response = client.get(url, headers=RIOT_AUTH_HEADERS)
-        if response.status_code != 200:
-            return None
-        data = response.json()
-        
-        # Find solo/duo queue entry
-        for entry in data:
-            if entry.get("queueType") == "RANKED_SOLO_5x5":
-                tier = entry.get("tier", "UNRANKED")
-                rank = entry.get("rank", "")
-                lp = entry.get("leaguePoints", 0)
-                return f"{tier} {rank} {lp}LP"
-        
-        return "UNRANKED"
+    response = _riot_get(url, ACCOUNT_BY_RIOT_ID)
+    response.raise_for_status()
+    data = response.json()
+    return data["puuid"]
 
 
 def get_last_10_match_ids(puuid: str) -> list[str]:
     """Get the last 10 ranked match IDs for a player."""
     url = f"{RIOT_ACCOUNT_API_BASE}/lol/match/v5/matches/by-puuid/{puuid}/ids"
     
-    with httpx.Client() as client:
-        response = client.get(
-            url, 
-            headers=RIOT_AUTH_HEADERS,
-            params={
-                "type": "ranked",
-                "count": 10,
-            },
-        )
-        if response.status_code != 200:
-            return []
-        return response.json()
+    response = _riot_get(
+        url,
+        MATCH_IDS_BY_PUUID,
+        params={
+            "type": "ranked",
+            "count": 10,
+        },
+    )
+    if response.status_code != 200:
+        return []
+    return response.json()
+
+
+def _participant_row(participant: dict) -> dict:
+    """Reduce a match-v5 participant to the fields stored in the match table."""
+    return {
+        "puuid": participant.get("puuid"),
+        "team_id": participant.get("teamId"),
+        "win": participant.get("win", False),
+        "champion_id": participant.get("championId"),
+        "champion_name": participant.get("championName"),
+        "kills": participant.get("kills", 0),
+        "deaths": participant.get("deaths", 0),
+        "assists": participant.get("assists", 0),
+        "game_name": participant.get("riotIdGameName", ""),
+        "tag_line": participant.get("riotIdTagline", ""),
+    }
+
+
+def _download_match(match_id: str) -> Optional[dict]:
+    """Download a match from Riot and return it as match table row values."""
+    url = f"{RIOT_ACCOUNT_API_BASE}/lol/match/v5/matches/{match_id}"
+
+    response = _riot_get(url, MATCH_BY_ID)
+    if response.status_code != 200:
+        return None
+    info = response.json().get("info", {})
+
+    game_creation_ms = info.get("gameCreation", 0)
+    return {
+        "match_id": match_id,
+        "queue_id": info.get("queueId"),
+        "played_at": datetime.utcfromtimestamp(game_creation_ms / 1000) if game_creation_ms else datetime.utcnow(),
+        "participants": [_participant_row(p) for p in info.get("participants", [])],
+        "fetched_at": datetime.utcnow(),
+    }
+
+
+def _load_stored_matches(match_ids: list[str]) -> dict[str, dict]:
+    """Read already-downloaded matches from the match table."""
+    try:
+        with get_db_session() as session:
+            rows = session.execute(
+                select(Match).where(Match.match_id.in_(match_ids))
+            ).scalars().all()
+            return {
+                row.match_id: {
+                    "match_id": row.match_id,
+                    "queue_id": row.queue_id,
+                    "played_at": row.played_at,
+                    "participants": row.participants,
+                    "fetched_at": row.fetched_at,
+                }
+                for row in rows
+            }
+    except SQLAlchemyError as e:
+        logger.warning("Match store unavailable, downloading all matches: %s", e)
+        return {}
+
+
+def _store_matches(matches: list[dict]) -> None:
+    """Insert newly downloaded matches; rows another worker stored win."""
+    try:
+        with get_db_session() as session:
+            session.execute(
+                insert(Match).values(matches).on_conflict_do_nothing(index_elements=["match_id"])
+            )
+            session.commit()
+    except SQLAlchemyError as e:
+        logger.warning("Failed to store %d downloaded matches: %s", len(matches), e)
 
 
-def get_match_details(match_id: str, puuid: str) -> Optional[dict]:
-    """Get champion ID, win/loss, and KDA for a specific match and player.
+def get_matches(match_ids: list[str], max_workers: int = RIOT_MATCH_FETCH_CONCURRENCY) -> dict[str, dict]:
+    """Get matches by ID, downloading only the ones not already stored.
     
-    Returns: {"match_id": str, "champion_id": int, "champion_name": str, "win": bool, "kills": int, "deaths": int, "assists": int} or None
-    """
-    url = f"{RIOT_ACCOUNT_API_BASE}/lol/match/v5/matches/{match_id}"
+    Stored matches come from the match table; the rest are downloaded
+    concurrently on a small thread pool (each call still waits its turn in
+    the rate limiter) and saved for every later caller. A match that fails to
+    download is left out without affecting the others.
     
-    with httpx.Client() as client:
-        response = client.get(url, headers=RIOT_AUTH_HEADERS)
-        if response.status_code != 200:
+    Returns: {match_id: {"match_id": str, "queue_id": int, "played_at": datetime, "participants": [...]}}
+    """
+    if not match_ids:
+        return {}
+
+    matches = _load_stored_matches(match_ids)
+    missing = [mid for mid in dict.fromkeys(match_ids) if mid not in matches]
+    if not missing:
+        return matches
+
+    def fetch(match_id: str) -> Optional[dict]:
+        try:
+            return _download_match(match_id)
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Failed to fetch match %s: %s", match_id, e)
             return None
-        data = response.json()
-        
-        # Find the participant matching the puuid
-        participants = data.get("info", {}).get("participants", [])
-        for participant in participants:
-            if participant.get("puuid") == puuid:
-                return {
-                    "match_id": match_id,
-                    "champion_id": participant.get("championId"),
-                    "champion_name": participant.get("championName"),
-                    "win": participant.get("win", False),
-                    "kills": participant.get("kills", 0),
-                    "deaths": participant.get("deaths", 0),
-                    "assists": participant.get("assists", 0),
-                }
-        
-        return None
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(missing)))) as pool:
+        futures = [pool.submit(contextvars.copy_context().run, fetch, match_id) for match_id in missing]
+        downloaded = [m for m in (future.result() for future in futures) if m]
+
+    if downloaded:
+        _store_matches(downloaded)
+        matches.update((m["match_id"], m) for m in downloaded)
+    return matches
 
 
-def get_recent_matches(puuid: str) -> list[dict]:
-    """Get details for the last 10 matches.
+def _player_match_details(match: dict, puuid: str) -> Optional[dict]:
+    for participant in match["participants"]:
+        if participant.get("puuid") == puuid:
+            return {
+                "match_id": match["match_id"],
+                "champion_id": participant.get("champion_id"),
+                "champion_name": participant.get("champion_name"),
+                "win": participant.get("win", False),
+                "kills": participant.get("kills", 0),
+                "deaths": participant.get("deaths", 0),
+                "assists": participant.get("assists", 0),
+            }
+    return None
+
+
+class _PuuidRejected(Exception):
+    """Riot rejected a stored PUUID (e.g. it was issued under another API key project)."""
+
+
+# Riot answers 400 ("Exception decrypting") or 404 for PUUIDs it can't decode.
+PUUID_REJECTED_STATUSES = (400, 404)
+
+
+def _fetch_ranked_data(puuid: str) -> Optional[dict]:
+    """Like get_ranked_data_by_puuid, but raises _PuuidRejected if Riot rejects the PUUID."""
+    url = f"{RIOT_NA_API_BASE}/lol/league/v4/entries/by-puuid/{puuid}"
     
-    Returns: list of {"match_id": str, "champion_id": int, "champion_name": str, "win": bool, "kills": int, "deaths": int, "assists": int}
-    """
-    match_ids = get_last_10_match_ids(puuid)
-    matches = []
+    response = _riot_get(url, LEAGUE_ENTRIES_BY_PUUID)
+    if response.status_code in PUUID_REJECTED_STATUSES:
+        raise _PuuidRejected(puuid)
+    if response.status_code != 200:
+        return None
+    data = response.json()
     
-    for match_id in match_ids:
-        details = get_match_details(match_id, puuid)
-        if details:
-            matches.append(details)
+    # Find solo/duo queue entry
+    for entry in data:
+        if entry.get("queueType") == "RANKED_SOLO_5x5":
+            return {
+                "tier": entry.get("tier"),
+                "rank": entry.get("rank"),
+                "league_points": entry.get("leaguePoints", 0),
+                "wins": entry.get("wins", 0),
+                "losses": entry.get("losses", 0),
+            }
     
-    return matches
+    return None
 
 
 def get_ranked_data_by_puuid(puuid: str) -> Optional[dict]:
@@ -136,25 +305,9 @@ def get_ranked_data_by_puuid(puuid: str) -> Optional[dict]:
     
     Returns: {"tier": str, "rank": str, "league_points": int, "wins": int, "losses": int} or None
     """
-    url = f"{RIOT_NA_API_BASE}/lol/league/v4/entries/by-puuid/{puuid}"
-    
-    with httpx.Client() as client:
-        response = client.get(url, headers=RIOT_AUTH_HEADERS)
-        if response.status_code != 200:
-            return None
-        data = response.json()
-        
-        # Find solo/duo queue entry
-        for entry in data:
-            if entry.get("queueType") == "RANKED_SOLO_5x5":
-                return {
-                    "tier": entry.get("tier"),
-                    "rank": entry.get("rank"),
-                    "league_points": entry.get("leaguePoints", 0),
-                    "wins": entry.get("wins", 0),
-                    "losses": entry.get("losses", 0),
-                }
-        
+    try:
+        return _fetch_ranked_data(puuid)
+    except _PuuidRejected:
         return None
 
 
@@ -170,6 +323,10 @@ def _migrate_puuid(session: Session, old_puuid: str, new_puuid: str) -> None:
         OpggEntry.puuid == old_puuid
     ).update({"puuid": new_puuid})
 
+    session.query(DuoTrackedAccount).filter(
+        DuoTrackedAccount.puuid == old_puuid
+    ).update({"puuid": new_puuid})
+
     old_data = session.query(SummonerData).filter(
         SummonerData.puuid == old_puuid
     ).first()
@@ -178,66 +335,132 @@ def _migrate_puuid(session: Session, old_puuid: str, new_puuid: str) -> None:
         session.flush()
 
 
-def fetch_and_store_summoner_data(
-    session: Session,
+@dataclass
+class FetchedSummoner:
+    """Riot data for one account, fetched without touching the database."""
+
+    puuid: str
+    values: dict
+    resolved_at: Optional[datetime] = None
+
+
+def fetch_summoner_data(
     puuid: str,
     game_name: str,
     tag_line: str,
-) -> SummonerData:
-    """Fetch data from Riot API and store it in the database.
+    stored: Optional[SummonerData] = None,
+    puuid_verified: bool = False,
+) -> FetchedSummoner:
+    """Fetch an account's ranked data and recent matches from the Riot API.
+    
+    Refreshes are incremental, so a steady-state refresh costs two Riot calls
+    (ranked entries and the recent match ID list):
     
-    Re-resolves the PUUID from the Riot ID to handle cases where the
-    stored PUUID becomes invalid (e.g. API key project change).
+    - The PUUID is re-resolved from the Riot ID only for new rows, once
+      RIOT_PUUID_RESOLVE_TTL_HOURS has passed, or when Riot rejects the stored
+      PUUID (e.g. after an API key project change). Pass puuid_verified=True
+      when the caller has just resolved it.
+    - Only match IDs missing from the stored recent_matches are looked up.
     
-    Returns the created/updated SummonerData object.
+    ``stored`` is the account's current SummonerData row, if any. The
+    returned puuid differs from the one passed in when it was re-resolved to
+    a new value. Makes no database calls of its own (the match store and
+    rate limiter use their own short sessions), so read ``stored``, release
+    the caller's connection (see release_connection), fetch, then write the
+    result with store_summoner_data.
     """
-    fresh_puuid = get_puuid(game_name, tag_line)
+    now = datetime.utcnow()
+    resolved_at = now if puuid_verified else None
+
+    resolve_due = (
+        stored is None
+        or stored.puuid_resolved_at is None
+        or stored.puuid_resolved_at < now - timedelta(hours=RIOT_PUUID_RESOLVE_TTL_HOURS)
+    )
+    if resolved_at is None and resolve_due:
+        puuid = get_puuid(game_name, tag_line)
+        resolved_at = now
+
+    try:
+        ranked_data = _fetch_ranked_data(puuid)
+    except _PuuidRejected:
+        if resolved_at is not None:
+            ranked_data = None
+        else:
+            logger.info("Riot rejected PUUID %s..., re-resolving %s#%s", puuid[:12], game_name, tag_line)
+            puuid = get_puuid(game_name, tag_line)
+            resolved_at = now
+            ranked_data = get_ranked_data_by_puuid(puuid)
 
-    if fresh_puuid != puuid:
-        _migrate_puuid(session, puuid, fresh_puuid)
-
-    active_puuid = fresh_puuid
-
-    ranked_data = get_ranked_data_by_puuid(active_puuid)
-    recent_matches = get_recent_matches(active_puuid)
+    match_ids = get_last_10_match_ids(puuid)
+    stored_matches = {
+        m["match_id"]: m for m in (stored.recent_matches or [])
+    } if stored and stored.puuid == puuid else {}
+    new_matches = get_matches([mid for mid in match_ids if mid not in stored_matches])
 
-    existing = session.query(SummonerData).filter(
-        SummonerData.puuid == active_puuid
-    ).first()
+    recent_matches = []
+    for match_id in match_ids:
+        details = stored_matches.get(match_id)
+        if details is None and match_id in new_matches:
+            details = _player_match_details(new_matches[match_id], puuid)
+        if details:
+            recent_matches.append(details)
+
+    values = {
+        "game_name": game_name,
+        "tag_line": tag_line,
+        "tier": ranked_data.get("tier") if ranked_data else None,
+        "rank": ranked_data.get("rank") if ranked_data else None,
+        "league_points": ranked_data.get("league_points") if ranked_data else None,
+        "wins": ranked_data.get("wins") if ranked_data else None,
+        "losses": ranked_data.get("losses") if ranked_data else None,
+        "recent_matches": recent_matches,
+    }
+    return FetchedSummoner(puuid=puuid, values=values, resolved_at=resolved_at)
+
+
+def store_summoner_data(session: Session, puuid: str, fetched: FetchedSummoner) -> SummonerData:
+    """Write fetched Riot data for the account stored under ``puuid``.
+    
+    Migrates references first if the PUUID was re-resolved to a new value.
+    The row is left untouched when nothing changed, so last_updated records
+    the last time the data actually changed. The caller commits.
+    """
+    now = datetime.utcnow()
+    if fetched.puuid != puuid:
+        _migrate_puuid(session, puuid, fetched.puuid)
+    existing = session.get(SummonerData, fetched.puuid)
 
     if existing:
-        existing.game_name = game_name
-        existing.tag_line = tag_line
-        existing.tier = ranked_data.get("tier") if ranked_data else None
-        existing.rank = ranked_data.get("rank") if ranked_data else None
-        existing.league_points = ranked_data.get("league_points") if ranked_data else None
-        existing.wins = ranked_data.get("wins") if ranked_data else None
-        existing.losses = ranked_data.get("losses") if ranked_data else None
-        existing.recent_matches = recent_matches
-        existing.last_updated = datetime.utcnow()
+        if fetched.resolved_at is not None:
+            existing.puuid_resolved_at = fetched.resolved_at
+        if any(getattr(existing, key) != value for key, value in fetched.values.items()):
+            for key, value in fetched.values.items():
+                setattr(existing, key, value)
+            existing.last_updated = now
         return existing
     else:
         summoner_data = SummonerData(
-            puuid=active_puuid,
-            game_name=game_name,
-            tag_line=tag_line,
-            tier=ranked_data.get("tier") if ranked_data else None,
-            rank=ranked_data.get("rank") if ranked_data else None,
-            league_points=ranked_data.get("league_points") if ranked_data else None,
-            wins=ranked_data.get("wins") if ranked_data else None,
-            losses=ranked_data.get("losses") if ranked_data else None,
-            recent_matches=recent_matches,
-            last_updated=datetime.utcnow(),
+            puuid=fetched.puuid,
+            **fetched.values,
+            last_updated=now,
+            puuid_resolved_at=fetched.resolved_at,
         )
         session.add(summoner_data)
         return summoner_data
 
 
-SEASON_START = int(datetime(2026, 1, 8).timestamp())
+# Fallback season start (naive UTC); the duo_season table is authoritative.
+SEASON_START_AT = datetime.fromisoformat(RIOT_SEASON_START)
 
 
-def get_all_ranked_match_ids(puuid: str, known_ids: set[str] | None = None, max_matches: int = 500) -> list[str]:
-    """Paginate through ranked solo/duo match IDs for the current season.
+def get_all_ranked_match_ids(
+    puuid: str,
+    known_ids: set[str] | None = None,
+    max_matches: int = 500,
+    season_start: datetime = SEASON_START_AT,
+) -> list[str]:
+    """Paginate through ranked solo/duo match IDs played since season_start.
 
     Stops when the API returns empty, all returned IDs are already known,
     or max_matches is reached.
@@ -249,58 +472,48 @@ def get_all_ranked_match_ids(puuid: str, known_ids: set[str] | None = None, max_
     start = 0
     page_size = 100
 
-    with httpx.Client() as client:
-        while len(all_ids) < max_matches:
-            url = f"{RIOT_ACCOUNT_API_BASE}/lol/match/v5/matches/by-puuid/{puuid}/ids"
-            response = _riot_get(
-                client, url,
-                params={
-                    "queue": 420,
-                    "startTime": SEASON_START,
-                    "start": start,
-                    "count": page_size,
-                },
-            )
-            if response.status_code != 200:
-                break
-            batch = response.json()
-            if not batch:
-                break
+    while len(all_ids) < max_matches:
+        url = f"{RIOT_ACCOUNT_API_BASE}/lol/match/v5/matches/by-puuid/{puuid}/ids"
+        response = _riot_get(
+            url,
+            MATCH_IDS_BY_PUUID,
+            params={
+                "queue": 420,
+                "startTime": int(season_start.replace(tzinfo=timezone.utc).timestamp()),
+                "start": start,
+                "count": page_size,
+            },
+        )
+        if response.status_code != 200:
+            break
+        batch = response.json()
+        if not batch:
+            break
 
-            new_ids = [mid for mid in batch if mid not in known_ids]
-            all_ids.extend(new_ids)
+        new_ids = [mid for mid in batch if mid not in known_ids]
+        all_ids.extend(new_ids)
 
-            if len(new_ids) == 0:
-                break
-            start += page_size
+        if len(new_ids) == 0:
+            break
+        start += page_size
 
     return all_ids[:max_matches]
 
 
-def get_match_teammates(
-    match_id: str, owner_puuid: str
-) -> Optional[tuple[bool, list[str], datetime]]:
-    """Fetch a match and extract the owner's win status and teammate names.
+def match_teammates(match: dict, owner_puuid: str) -> Optional[tuple[bool, list[str], datetime]]:
+    """Extract the owner's win status and teammate names from a stored match.
 
-    Returns (win, ["name#tag", ...], played_at) or None on failure.
-    Teammates are the 4 other players on the owner's team, stored as
-    lowercase "gamename#tag" for case-insensitive matching.
+    Returns (win, ["name#tag", ...], played_at) or None if the owner isn't in
+    the match. Teammates are the 4 other players on the owner's team, stored
+    as lowercase "gamename#tag" for case-insensitive matching.
     """
-    url = f"{RIOT_ACCOUNT_API_BASE}/lol/match/v5/matches/{match_id}"
-    with httpx.Client() as client:
-        response = _riot_get(client, url)
-        if response.status_code != 200:
-            return None
-        data = response.json()
-
-    info = data.get("info", {})
-    participants = info.get("participants", [])
+    participants = match["participants"]
 
     owner_team_id = None
     owner_win = False
     for p in participants:
         if p.get("puuid") == owner_puuid:
-            owner_team_id = p.get("teamId")
+            owner_team_id = p.get("team_id")
             owner_win = p.get("win", False)
             break
 
@@ -309,13 +522,10 @@ def get_match_teammates(
 
     teammates: list[str] = []
     for p in participants:
-        if p.get("teamId") == owner_team_id and p.get("puuid") != owner_puuid:
-            game_name = p.get("riotIdGameName", "")
-            tag_line = p.get("riotIdTagline", "")
+        if p.get("team_id") == owner_team_id and p.get("puuid") != owner_puuid:
+            game_name = p.get("game_name", "")
+            tag_line = p.get("tag_line", "")
             if game_name and tag_line:
                 teammates.append(f"{game_name}#{tag_line}".lower())
 
-    game_creation_ms = info.get("gameCreation", 0)
-    played_at = datetime.utcfromtimestamp(game_creation_ms / 1000) if game_creation_ms else datetime.utcnow()
-
-    return (owner_win, teammates, played_at)
\ No newline at end of file
+    return (owner_win, teammates, match["played_at"])
@@ -1,8 +1,6 @@
 import logging
 from contextlib import asynccontextmanager
-from datetime import datetime, timedelta
 
-from apscheduler.schedulers.background import BackgroundScheduler
 from fastapi import FastAPI, Depends
 
 # Configure logging
@@ -12,6 +10,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from streampage.api.admin.admin import admin_router
+from streampage.api.middleware.pool_timing import PoolTimingMiddleware
 from streampage.api.cat.cat import cat_router
 from streampage.api.media.media import media_router
 from streampage.api.opgg.opgg import opgg_router
@@ -23,13 +23,10 @@ from streampage.api.first.first import first_router
 from streampage.api.duo.duo import duo_router
 from streampage.api.shop.shop import shop_router
 from streampage.api.user.auth import hash_password
-from streampage.config import FRONTEND_URL, IS_RAILWAY
-from streampage.db.engine import get_db, get_db_session
+from streampage.config import DB_POOL_TIMING, FRONTEND_URL, IS_RAILWAY
+from streampage.db.engine import get_async_engine, get_db, get_db_session
 from streampage.db.models import User, UserLogin
-from streampage.services.scheduler import update_all_int_list_entries
-
-# Background scheduler for periodic tasks
-scheduler = BackgroundScheduler()
+from streampage.db.riot import close_riot_client
 
 
 @asynccontextmanager
@@ -44,21 +41,14 @@ async def lifespan(app: FastAPI):
             session.commit()
             logger.info("Seeded default user: rosie")
     
-    # Start background scheduler for periodic int list updates
-    # Run first update 30 seconds after startup, then every 24 hours
-    scheduler.add_job(
-        update_all_int_list_entries,
-        'interval',
-        hours=24,
-        id='int_list_update',
-        next_run_time=datetime.now() + timedelta(seconds=30),
-    )
-    scheduler.start()
-    logger.info("Background scheduler started - first run in 30 seconds, then every 24 hours")
+    # Periodic jobs (Riot account refreshes, ...) run in the separate background
+    # worker: python -m streampage.worker
     
     yield
     
-    scheduler.shutdown()
+    close_riot_client()
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
 
 
 app = FastAPI(title="streampage", lifespan=lifespan)
@@ -82,6 +72,10 @@ if IS_RAILWAY:
 
 app.add_middleware(CORSMiddleware, **cors_kwargs)
 
+if DB_POOL_TIMING:
+    # Server-Timing would expose internal DB timings, so log-only in production.
+    app.add_middleware(PoolTimingMiddleware, send_header=not IS_RAILWAY)
+
 
 @app.get("/")
 def health_check():
@@ -125,3 +119,4 @@ app.include_router(forms_router, prefix="/forms")
 app.include_router(first_router, prefix="/firsts")
 app.include_router(duo_router, prefix="/duos")
 app.include_router(shop_router, prefix="/shop")
+app.include_router(admin_router, prefix="/admin")
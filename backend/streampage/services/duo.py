@@ -0,0 +1,383 @@
+"""
+Duo tracking: ingest the owner's ranked matches and recount duo records.
+
+Shared by the /duos endpoints and the background account refresh.
+"""
+
+import logging
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Callable
+
+from sqlalchemy import and_, distinct, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from streampage.db.models import (
+    DuoEntry,
+    DuoEntryAccount,
+    DuoMatch,
+    DuoMatchTeammate,
+    DuoSeason,
+    DuoSeasonRecord,
+    DuoTrackedAccount,
+)
+from streampage.db.riot import SEASON_START_AT, get_all_ranked_match_ids, get_matches, match_teammates
+
+logger = logging.getLogger(__name__)
+
+MATCH_BATCH_SIZE = 50
+
+
+def naive_utc(dt: datetime) -> datetime:
+    """Convert to the naive UTC datetimes stored in the (timestamp without time zone) columns."""
+    if dt.tzinfo is not None:
+        return dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def current_duo_season(session: Session, now: datetime | None = None) -> DuoSeason | None:
+    """The unarchived season in progress, or None between (or after) registered seasons."""
+    now = now or datetime.utcnow()
+    return session.execute(
+        select(DuoSeason)
+        .where(DuoSeason.starts_at <= now, DuoSeason.ends_at > now, DuoSeason.archived_at.is_(None))
+        .order_by(DuoSeason.starts_at.desc())
+        .limit(1)
+    ).scalar_one_or_none()
+
+
+def current_season_bounds(session: Session) -> tuple[datetime, datetime | None]:
+    """[start, end) of the current season.
+
+    With no season in progress, matches land in the DEFAULT partition; the
+    open-ended range starts where the last registered season ended, or at
+    RIOT_SEASON_START if none has.
+    """
+    now = datetime.utcnow()
+    season = current_duo_season(session, now)
+    if season is not None:
+        return season.starts_at, season.ends_at
+    last_ended = session.execute(
+        select(func.max(DuoSeason.ends_at)).where(DuoSeason.ends_at <= now)
+    ).scalar()
+    return max(last_ended or SEASON_START_AT, SEASON_START_AT), None
+
+
+def _entry_records(
+    session: Session,
+    owner_id: uuid.UUID,
+    entry_id: uuid.UUID | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> dict[uuid.UUID, tuple[int, int]]:
+    """Count (wins, losses) per duo entry with one GROUP BY in the database.
+
+    Joins each entry's accounts to duo_match_teammate on the
+    (owner_id, teammate_name) index; a match where two of an entry's
+    accounts both played counts once. since/until restrict to matches
+    played in [since, until) via the (owner_id, played_at) index and prune
+    partitions of other seasons. Detached (archived) seasons are not
+    counted. Entries with no matches are absent.
+    """
+    query = (
+        select(
+            DuoEntryAccount.entry_id,
+            func.count(distinct(DuoMatch.match_id)).filter(DuoMatch.win.is_(True)),
+            func.count(distinct(DuoMatch.match_id)).filter(DuoMatch.win.is_(False)),
+        )
+        .join(DuoEntry, DuoEntry.id == DuoEntryAccount.entry_id)
+        .join(DuoMatchTeammate, and_(
+            DuoMatchTeammate.owner_id == DuoEntry.owner_id,
+            DuoMatchTeammate.teammate_name == func.lower(func.trim(DuoEntryAccount.summoner_name)),
+        ))
+        .join(DuoMatch, and_(
+            DuoMatch.owner_id == DuoMatchTeammate.owner_id,
+            DuoMatch.match_id == DuoMatchTeammate.match_id,
+            DuoMatch.played_at == DuoMatchTeammate.played_at,
+        ))
+        .where(DuoEntry.owner_id == owner_id)
+        .group_by(DuoEntryAccount.entry_id)
+    )
+    if entry_id is not None:
+        query = query.where(DuoEntryAccount.entry_id == entry_id)
+    if since is not None:
+        query = query.where(DuoMatch.played_at >= since, DuoMatchTeammate.played_at >= since)
+    if until is not None:
+        query = query.where(DuoMatch.played_at < until, DuoMatchTeammate.played_at < until)
+    return {row_entry_id: (wins, losses) for row_entry_id, wins, losses in session.execute(query)}
+
+
+def duo_records_between(
+    session: Session,
+    owner_id: uuid.UUID,
+    since: datetime | None,
+    until: datetime | None = None,
+) -> dict[uuid.UUID, tuple[int, int]]:
+    """(wins, losses) per entry for matches played in [since, until); entries without games are absent."""
+    return _entry_records(session, owner_id, since=since, until=until)
+
+
+def suggest_duo_partners(
+    session: Session,
+    owner_id: uuid.UUID,
+    min_games: int = 2,
+    limit: int = 20,
+) -> list[tuple[str, int, int, datetime]]:
+    """Rank the owner's frequent teammates that aren't linked to any duo entry.
+
+    Aggregates duo_match_teammate over its (owner_id, teammate_name) index.
+    Returns (teammate_name, games, wins, last_played_at), most games first.
+    """
+    linked = (
+        select(func.lower(func.trim(DuoEntryAccount.summoner_name)))
+        .join(DuoEntry, DuoEntry.id == DuoEntryAccount.entry_id)
+        .where(DuoEntry.owner_id == owner_id)
+    )
+    games = func.count()
+    last_played_at = func.max(DuoMatch.played_at)
+    rows = session.execute(
+        select(
+            DuoMatchTeammate.teammate_name,
+            games,
+            func.count().filter(DuoMatch.win.is_(True)),
+            last_played_at,
+        )
+        .join(DuoMatch, and_(
+            DuoMatch.owner_id == DuoMatchTeammate.owner_id,
+            DuoMatch.match_id == DuoMatchTeammate.match_id,
+            DuoMatch.played_at == DuoMatchTeammate.played_at,
+        ))
+        .where(
+            DuoMatchTeammate.owner_id == owner_id,
+            DuoMatchTeammate.teammate_name.not_in(linked),
+        )
+        .group_by(DuoMatchTeammate.teammate_name)
+        .having(games >= min_games)
+        .order_by(games.desc(), last_played_at.desc())
+        .limit(limit)
+    ).all()
+    return [tuple(row) for row in rows]
+
+
+def season_duo_records(session: Session, owner_id: uuid.UUID, season: DuoSeason) -> dict[uuid.UUID, tuple[int, int]]:
+    """(wins, losses) per entry for one season: its snapshot once archived, otherwise its partition."""
+    if season.archived_at is None:
+        return duo_records_between(session, owner_id, season.starts_at, season.ends_at)
+    rows = session.execute(
+        select(DuoSeasonRecord.entry_id, DuoSeasonRecord.wins, DuoSeasonRecord.losses)
+        .where(DuoSeasonRecord.season == season.name, DuoSeasonRecord.owner_id == owner_id)
+    )
+    return {entry_id: (wins, losses) for entry_id, wins, losses in rows if wins or losses}
+
+
+def _archived_records(
+    session: Session,
+    owner_id: uuid.UUID,
+    entry_id: uuid.UUID | None = None,
+) -> dict[uuid.UUID, tuple[int, int]]:
+    """(wins, losses) per entry from the snapshots of archived seasons."""
+    query = (
+        select(DuoSeasonRecord.entry_id, func.sum(DuoSeasonRecord.wins), func.sum(DuoSeasonRecord.losses))
+        .join(DuoSeason, DuoSeason.name == DuoSeasonRecord.season)
+        .where(DuoSeasonRecord.owner_id == owner_id, DuoSeason.archived_at.is_not(None))
+        .group_by(DuoSeasonRecord.entry_id)
+    )
+    if entry_id is not None:
+        query = query.where(DuoSeasonRecord.entry_id == entry_id)
+    return {row_entry_id: (int(wins), int(losses)) for row_entry_id, wins, losses in session.execute(query)}
+
+
+def _all_time_records(
+    session: Session,
+    owner_id: uuid.UUID,
+    entry_id: uuid.UUID | None = None,
+) -> dict[uuid.UUID, tuple[int, int]]:
+    """Live matches plus archived season snapshots.
+
+    Snapshots are per entry, so accounts linked after a season was archived
+    don't add to that season's count.
+    """
+    records = _entry_records(session, owner_id, entry_id)
+    for archived_entry_id, (wins, losses) in _archived_records(session, owner_id, entry_id).items():
+        live_wins, live_losses = records.get(archived_entry_id, (0, 0))
+        records[archived_entry_id] = (live_wins + wins, live_losses + losses)
+    return records
+
+
+def _set_record(entry: DuoEntry, wins: int, losses: int) -> bool:
+    if entry.wins == wins and entry.losses == losses:
+        return False
+    logger.info("Entry %s: %d-%d -> %d-%d", entry.id, entry.wins, entry.losses, wins, losses)
+    entry.wins = wins
+    entry.losses = losses
+    return True
+
+
+def recalculate_duo_entry(session: Session, entry: DuoEntry) -> bool:
+    """Recount one entry from the matches naming its accounts. Returns whether it changed.
+
+    The entry row is locked (and reloaded) first, so an ingest's increment
+    (apply_new_duo_matches) either lands before the recount sees its matches
+    or waits and is applied on top of the recounted value.
+    """
+    session.flush()
+    session.refresh(entry, with_for_update=True)
+    wins, losses = _all_time_records(session, entry.owner_id, entry.id).get(entry.id, (0, 0))
+    return _set_record(entry, wins, losses)
+
+
+def recalculate_duo_entries(session: Session, owner_id: uuid.UUID) -> int:
+    """Recount wins/losses for every duo entry from stored matches.
+
+    Only needed when the match history itself is replaced (e.g. the tracked
+    account changes); otherwise use recalculate_duo_entry or apply_new_duo_matches.
+    """
+    session.flush()
+    # Lock the entries before recounting (see recalculate_duo_entry).
+    entries = session.execute(
+        select(DuoEntry)
+        .where(DuoEntry.owner_id == owner_id)
+        .order_by(DuoEntry.id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    ).scalars().all()
+    records = _all_time_records(session, owner_id)
+
+    updated = sum(1 for entry in entries if _set_record(entry, *records.get(entry.id, (0, 0))))
+    logger.info("Recalculation complete: %d of %d entries updated", updated, len(entries))
+    return updated
+
+
+def apply_new_duo_matches(session: Session, owner_id: uuid.UUID, matches: list[dict]) -> int:
+    """Bump the records of the entries named in newly stored matches.
+
+    Builds a name -> entries lookup once, so each new match only touches the
+    entries whose accounts were on the owner's team. The deltas are applied
+    in SQL (wins = wins + n) rather than on loaded rows, so concurrent
+    ingests for the same owner can't overwrite each other's increments.
+    Returns the number of entries updated.
+    """
+    if not matches:
+        return 0
+
+    accounts = session.execute(
+        select(DuoEntryAccount.entry_id, DuoEntryAccount.summoner_name)
+        .join(DuoEntry, DuoEntry.id == DuoEntryAccount.entry_id)
+        .where(DuoEntry.owner_id == owner_id)
+    ).all()
+
+    entries_by_name: dict[str, set[uuid.UUID]] = defaultdict(set)
+    for entry_id, summoner_name in accounts:
+        entries_by_name[summoner_name.strip().lower()].add(entry_id)
+
+    deltas: dict[uuid.UUID, list[int]] = defaultdict(lambda: [0, 0])
+    for match in matches:
+        hit = {entry_id for name in set(match["teammates"]) for entry_id in entries_by_name.get(name, ())}
+        for entry_id in hit:
+            deltas[entry_id][0 if match["win"] else 1] += 1
+
+    for entry_id, (wins, losses) in deltas.items():
+        session.execute(
+            update(DuoEntry)
+            .where(DuoEntry.id == entry_id)
+            .values(wins=DuoEntry.wins + wins, losses=DuoEntry.losses + losses)
+            .execution_options(synchronize_session=False)
+        )
+    return len(deltas)
+
+
+def _insert_duo_matches(session: Session, rows: list[dict]) -> list[dict]:
+    """Insert a batch of matches and their teammates in two statements.
+
+    Matches already stored (e.g. by a concurrent update of the same account)
+    are skipped rather than failing on the primary key. Returns only the rows
+    actually inserted, so records are bumped once per match.
+    """
+    if not rows:
+        return []
+
+    inserted_ids = set(session.execute(
+        insert(DuoMatch)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=["match_id", "owner_id", "played_at"])
+        .returning(DuoMatch.match_id)
+    ).scalars())
+    inserted = [row for row in rows if row["match_id"] in inserted_ids]
+
+    teammate_rows = [
+        {
+            "owner_id": row["owner_id"],
+            "match_id": row["match_id"],
+            "teammate_name": name,
+            "played_at": row["played_at"],
+        }
+        for row in inserted
+        for name in set(row["teammates"])
+    ]
+    if teammate_rows:
+        session.execute(
+            insert(DuoMatchTeammate).values(teammate_rows).on_conflict_do_nothing()
+        )
+    return inserted
+
+
+def fetch_and_store_duo_matches(
+    session: Session,
+    account: DuoTrackedAccount,
+    on_batch: Callable[[int, int, int], None] | None = None,
+) -> int:
+    """Fetch new ranked matches for the tracked account and store them.
+
+    Duo records are bumped for each batch of new matches as it is stored.
+    ``on_batch(fetched, total, stored)`` is called once the match ID list is
+    known and after every batch, so callers can commit progress as it arrives.
+    Returns the number of newly stored matches.
+    """
+    # Only the current season is fetched, so only its partition is read.
+    season_start, _ = current_season_bounds(session)
+    existing_ids = set(
+        session.execute(
+            select(DuoMatch.match_id).where(
+                DuoMatch.owner_id == account.owner_id,
+                DuoMatch.played_at >= season_start,
+            )
+        ).scalars().all()
+    )
+
+    new_match_ids = [
+        mid for mid in get_all_ranked_match_ids(account.puuid, known_ids=existing_ids, season_start=season_start)
+        if mid not in existing_ids
+    ]
+    stored = 0
+    if on_batch:
+        on_batch(0, len(new_match_ids), stored)
+
+    # Download in batches so a long backfill keeps its progress if interrupted.
+    for start in range(0, len(new_match_ids), MATCH_BATCH_SIZE):
+        batch = new_match_ids[start:start + MATCH_BATCH_SIZE]
+        matches = get_matches(batch)
+        rows: list[dict] = []
+        for match_id in batch:
+            match = matches.get(match_id)
+            result = match_teammates(match, account.puuid) if match else None
+            if result is None:
+                continue
+            win, teammates, played_at = result
+            rows.append({
+                "match_id": match_id,
+                "owner_id": account.owner_id,
+                "win": win,
+                "teammates": teammates,
+                "played_at": played_at,
+            })
+
+        new_matches = _insert_duo_matches(session, rows)
+        apply_new_duo_matches(session, account.owner_id, new_matches)
+        stored += len(new_matches)
+        if on_batch:
+            on_batch(start + len(batch), len(new_match_ids), stored)
+
+    account.last_updated = datetime.utcnow()
+    return stored
@@ -0,0 +1,180 @@
+"""
+Background duo match ingestion.
+
+A first-time backfill of the tracked account can be hundreds of matches, far
+too long to hold an HTTP request open for. The /duos/account endpoints
+enqueue a ``duo_ingest_job`` row and return immediately; the background
+worker claims queued jobs (``FOR UPDATE SKIP LOCKED``, so any number of
+worker replicas can poll) and runs them, committing matches, duo records
+and the job's progress together after every batch. The scheduled account
+refresh enqueues through here too, so all of an owner's ingests are
+serialized by the queue.
+"""
+
+import logging
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, exists, or_, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, aliased
+
+from streampage.config import DUO_INGEST_STALE_MINUTES
+from streampage.db.engine import get_db_session
+from streampage.db.models import DuoIngestJob, DuoTrackedAccount
+from streampage.services.duo import fetch_and_store_duo_matches, recalculate_duo_entries
+from streampage.services.job_runs import RefreshStats
+
+logger = logging.getLogger(__name__)
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_SUCCEEDED = "succeeded"
+STATUS_FAILED = "failed"
+
+
+def _queued_job(session: Session, owner_id: uuid.UUID) -> DuoIngestJob | None:
+    return session.execute(
+        select(DuoIngestJob)
+        .where(DuoIngestJob.owner_id == owner_id, DuoIngestJob.status == STATUS_QUEUED)
+        .with_for_update()
+    ).scalar_one_or_none()
+
+
+def enqueue_duo_ingest(session: Session, owner_id: uuid.UUID, recalculate: bool = False) -> DuoIngestJob:
+    """Queue an ingestion of the owner's new matches (the caller commits).
+
+    Coalesces with a job that is already queued for the owner, so repeated
+    clicks and scheduled refreshes don't stack up backfills. A partial
+    unique index keeps it to one queued job per owner even when two
+    requests enqueue at once.
+    """
+    job_id = session.execute(
+        insert(DuoIngestJob)
+        .values(owner_id=owner_id, status=STATUS_QUEUED, recalculate=recalculate)
+        .on_conflict_do_nothing(
+            index_elements=["owner_id"],
+            index_where=text("status = 'queued'"),
+        )
+        .returning(DuoIngestJob.id)
+    ).scalar_one_or_none()
+    if job_id is not None:
+        return session.get(DuoIngestJob, job_id)
+
+    job = _queued_job(session, owner_id)
+    if job is None:
+        # The queued job was claimed between our insert and select; queue another.
+        return enqueue_duo_ingest(session, owner_id, recalculate)
+    if recalculate:
+        job.recalculate = True
+    return job
+
+
+def latest_duo_ingest(session: Session, owner_id: uuid.UUID) -> DuoIngestJob | None:
+    return session.execute(
+        select(DuoIngestJob)
+        .where(DuoIngestJob.owner_id == owner_id)
+        .order_by(DuoIngestJob.created_at.desc())
+        .limit(1)
+    ).scalar_one_or_none()
+
+
+def _claim_next_job(session: Session) -> DuoIngestJob | None:
+    """Mark the oldest runnable job as running and return it.
+
+    A job is runnable if it is queued, or running but no longer heartbeating
+    (its worker died). Queued jobs wait while the owner has a running job
+    (a stale one is reclaimed first), so one owner's ingests never overlap;
+    with at most one queued job per owner, a job can only become queued
+    after the previous one was claimed and committed as running.
+    """
+    now = datetime.utcnow()
+    stale_before = now - timedelta(minutes=DUO_INGEST_STALE_MINUTES)
+    running = aliased(DuoIngestJob)
+    job = session.execute(
+        select(DuoIngestJob)
+        .where(or_(
+            and_(
+                DuoIngestJob.status == STATUS_QUEUED,
+                ~exists().where(
+                    running.owner_id == DuoIngestJob.owner_id,
+                    running.status == STATUS_RUNNING,
+                ),
+            ),
+            and_(DuoIngestJob.status == STATUS_RUNNING, DuoIngestJob.heartbeat_at < stale_before),
+        ))
+        .order_by(DuoIngestJob.created_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    ).scalar_one_or_none()
+
+    if job is None:
+        session.rollback()
+        return None
+
+    if job.status == STATUS_RUNNING:
+        logger.warning("Reclaiming stale duo ingest job %s", job.id)
+    job.status = STATUS_RUNNING
+    job.started_at = job.started_at or now
+    job.heartbeat_at = now
+    session.commit()
+    return job
+
+
+def run_duo_ingest_job(session: Session, job: DuoIngestJob) -> None:
+    """Ingest the owner's new matches, committing after every batch."""
+    account = session.execute(
+        select(DuoTrackedAccount).where(DuoTrackedAccount.owner_id == job.owner_id)
+    ).scalar_one_or_none()
+    if account is None:
+        raise ValueError("No tracked account set")
+
+    def record_progress(fetched: int, total: int, stored: int) -> None:
+        job.matches_total = total
+        job.matches_fetched = fetched
+        job.matches_stored = stored
+        job.heartbeat_at = datetime.utcnow()
+        session.commit()
+
+    fetch_and_store_duo_matches(session, account, on_batch=record_progress)
+    if job.recalculate:
+        recalculate_duo_entries(session, job.owner_id)
+
+    job.status = STATUS_SUCCEEDED
+    job.finished_at = datetime.utcnow()
+    session.commit()
+    logger.info(
+        "Duo ingest %s finished: stored %d of %d new matches",
+        job.id, job.matches_stored, job.matches_total or 0,
+    )
+
+
+def _fail_job(session: Session, job_id: uuid.UUID, error: Exception) -> None:
+    job = session.get(DuoIngestJob, job_id)
+    if job is None:
+        return
+    job.status = STATUS_FAILED
+    job.error = str(error)
+    job.finished_at = datetime.utcnow()
+    session.commit()
+
+
+def process_duo_ingest_queue() -> RefreshStats:
+    """Run queued ingestion jobs until none are left."""
+    stats = RefreshStats()
+    while True:
+        with get_db_session() as session:
+            job = _claim_next_job(session)
+            if job is None:
+                return stats
+
+            stats.total += 1
+            job_id = job.id
+            try:
+                run_duo_ingest_job(session, job)
+                stats.succeeded += 1
+            except Exception as e:
+                logger.error(f"Duo ingest {job_id} failed: {e}")
+                session.rollback()
+                _fail_job(session, job_id, e)
+                stats.failed += 1
@@ -0,0 +1,149 @@
+"""
+Season partitions of the duo match tables.
+
+duo_match and duo_match_teammate are range-partitioned on played_at with one
+partition per DuoSeason (``duo_match_s2026`` ...) plus a DEFAULT partition
+for matches outside every known season. Queries bounded to the current
+season (ingestion, /duos/list?window=season) only touch its partition.
+
+Once a season is over it can be archived: every entry's record for the
+season is snapshotted into duo_season_record, then the season's partitions
+are detached. The detached tables keep the raw matches and can be dumped or
+dropped at leisure; all-time records keep counting the archived season
+through its snapshot.
+"""
+
+import logging
+import re
+from datetime import datetime
+
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from streampage.db.models import DuoEntry, DuoSeason, DuoSeasonRecord
+from streampage.services.duo import duo_records_between, naive_utc
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLES = ("duo_match", "duo_match_teammate")
+SEASON_NAME_PATTERN = re.compile(r"^[a-z0-9_]{1,20}$")
+
+
+class SeasonError(Exception):
+    """A season operation that can't be applied (bad name, overlap, still current)."""
+
+
+def partition_name(table: str, season_name: str) -> str:
+    return f"{table}_s{season_name}"
+
+
+def _attached_partitions(session: Session, table: str) -> set[str]:
+    rows = session.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:table AS regclass)"
+        ),
+        {"table": table},
+    ).scalars()
+    return set(rows)
+
+
+def _create_partition(session: Session, table: str, season: DuoSeason) -> None:
+    """Attach a partition for the season, moving any of its rows out of DEFAULT.
+
+    Postgres refuses to add a partition while the DEFAULT partition holds
+    rows in its range, so DEFAULT is detached for the move and reattached.
+    """
+    partition = partition_name(table, season.name)
+    default = f"{table}_default"
+    starts_at = season.starts_at.isoformat(sep=" ")
+    ends_at = season.ends_at.isoformat(sep=" ")
+
+    session.execute(text(f"ALTER TABLE {table} DETACH PARTITION {default}"))
+    session.execute(text(
+        f"CREATE TABLE {partition} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{starts_at}') TO ('{ends_at}')"
+    ))
+    moved = session.execute(text(
+        f"WITH moved AS ("
+        f"DELETE FROM {default} WHERE played_at >= '{starts_at}' AND played_at < '{ends_at}' RETURNING *"
+        f") INSERT INTO {partition} SELECT * FROM moved"
+    )).rowcount
+    session.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT"))
+    logger.info("Created partition %s (moved %d rows from %s)", partition, moved, default)
+
+
+def add_season(session: Session, name: str, starts_at: datetime, ends_at: datetime) -> DuoSeason:
+    """Register a season and create its partitions (the caller commits)."""
+    # Partition bounds and duo_match.played_at are naive UTC; Postgres would
+    # silently drop an offset.
+    starts_at, ends_at = naive_utc(starts_at), naive_utc(ends_at)
+    if not SEASON_NAME_PATTERN.match(name):
+        raise SeasonError("Season names may only contain lowercase letters, digits and underscores")
+    if ends_at <= starts_at:
+        raise SeasonError("Season must end after it starts")
+    if session.get(DuoSeason, name) is not None:
+        raise SeasonError(f"Season {name} already exists")
+
+    overlapping = session.execute(
+        select(DuoSeason.name).where(DuoSeason.starts_at < ends_at, DuoSeason.ends_at > starts_at)
+    ).scalars().first()
+    if overlapping:
+        raise SeasonError(f"Season overlaps {overlapping}")
+
+    season = DuoSeason(name=name, starts_at=starts_at, ends_at=ends_at)
+    session.add(season)
+    session.flush()
+    for table in PARTITIONED_TABLES:
+        _create_partition(session, table, season)
+    return season
+
+
+def snapshot_season(session: Session, season: DuoSeason) -> int:
+    """Store every entry's record for the season's matches. Returns rows written."""
+    if season.archived_at is not None:
+        raise SeasonError(f"Season {season.name} is archived; its snapshot is final")
+
+    owner_ids = session.execute(select(DuoEntry.owner_id).distinct()).scalars().all()
+    now = datetime.utcnow()
+    rows = [
+        {
+            "season": season.name,
+            "entry_id": entry_id,
+            "owner_id": owner_id,
+            "wins": wins,
+            "losses": losses,
+            "snapshotted_at": now,
+        }
+        for owner_id in owner_ids
+        for entry_id, (wins, losses) in duo_records_between(
+            session, owner_id, season.starts_at, season.ends_at
+        ).items()
+    ]
+
+    session.query(DuoSeasonRecord).filter(DuoSeasonRecord.season == season.name).delete()
+    if rows:
+        session.execute(insert(DuoSeasonRecord).values(rows))
+    return len(rows)
+
+
+def archive_season(session: Session, season: DuoSeason) -> int:
+    """Snapshot a finished season and detach its partitions (the caller commits).
+
+    Returns the number of entry records snapshotted.
+    """
+    if season.archived_at is not None:
+        raise SeasonError(f"Season {season.name} is already archived")
+    if season.ends_at > session.execute(select(func.timezone("UTC", func.now()))).scalar():
+        raise SeasonError(f"Season {season.name} has not ended yet")
+
+    snapshotted = snapshot_season(session, season)
+    for table in PARTITIONED_TABLES:
+        partition = partition_name(table, season.name)
+        if partition in _attached_partitions(session, table):
+            session.execute(text(f"ALTER TABLE {table} DETACH PARTITION {partition}"))
+    season.archived_at = datetime.utcnow()
+    logger.info("Archived season %s (%d entry records snapshotted)", season.name, snapshotted)
+    return snapshotted
@@ -0,0 +1,89 @@
+"""
+Persistent history of background job runs.
+
+Wrap a job with ``track_job_run(name)`` to record a ``job_run`` row per
+execution: duration, items processed/failed (from the job's RefreshStats)
+and the Riot calls and 429s the run itself made (counted per run through
+current_riot_call_counter, so jobs running side by side on the worker's
+scheduler threads don't pick up each other's calls). Runs that found
+nothing to do and made no Riot calls of their own are not recorded, so
+frequent ticks of the tiered refresh and idle queue polls don't flood the
+table.
+"""
+
+import functools
+import logging
+import time
+import traceback
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, TypeVar
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from streampage.db.engine import get_db_session
+from streampage.db.models import JobRun
+from streampage.db.riot import RiotCallCounter, current_riot_call_counter
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class RefreshStats:
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def per_minute(self) -> float:
+        return self.total * 60 / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+def _save_run(run: JobRun) -> None:
+    try:
+        with get_db_session() as session:
+            session.add(run)
+            session.commit()
+    except SQLAlchemyError as e:
+        logger.warning("Failed to record %s job run: %s", run.job_name, e)
+
+
+def track_job_run(job_name: str) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Record each run of the wrapped job in the job_run table."""
+    def decorator(job: Callable[..., T]) -> Callable[..., T]:
+        @functools.wraps(job)
+        def wrapper(*args, **kwargs):
+            started_at = datetime.utcnow()
+            started = time.monotonic()
+            counter = RiotCallCounter()
+            token = current_riot_call_counter.set(counter)
+
+            run = JobRun(job_name=job_name, started_at=started_at)
+            try:
+                result = job(*args, **kwargs)
+                run.status = "succeeded"
+                return result
+            except Exception:
+                result = None
+                run.status = "failed"
+                run.error = traceback.format_exc()
+                raise
+            finally:
+                current_riot_call_counter.reset(token)
+                calls, rate_limited = counter.snapshot()
+                run.finished_at = datetime.utcnow()
+                run.duration_seconds = round(time.monotonic() - started, 2)
+                run.items_total = getattr(result, "total", 0)
+                run.items_succeeded = getattr(result, "succeeded", 0)
+                run.items_failed = getattr(result, "failed", 0)
+                run.riot_calls = calls
+                run.riot_rate_limited = rate_limited
+                if run.status == "failed" or run.items_total or run.riot_calls:
+                    _save_run(run)
+
+        return wrapper
+
+    return decorator
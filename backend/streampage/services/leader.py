@@ -0,0 +1,111 @@
+"""
+Leader election for periodic jobs via a Postgres advisory lock.
+
+The scheduler runs in the background worker process
+(``python -m streampage.worker``), which may be deployed as several
+replicas, but periodic jobs such as the account refresh should only run
+once across all of them. The worker process that takes a session-level
+advisory lock is the leader; it keeps the lock on a dedicated connection
+for as long as it lives. If the leader dies (or its connection drops)
+Postgres releases the lock, and the next worker to call ``ensure()`` takes
+over.
+"""
+
+import functools
+import logging
+import threading
+from typing import Callable, TypeVar
+
+from sqlalchemy import Connection, func, select, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from streampage.db.engine import get_engine
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary app-wide key for pg_try_advisory_lock ("stream" in ASCII).
+SCHEDULER_LOCK_KEY = 0x73747265616D
+
+T = TypeVar("T")
+
+
+class AdvisoryLockLeader:
+    """Holds (or competes for) a Postgres advisory lock on its own connection."""
+
+    def __init__(self, lock_key: int, name: str):
+        self.lock_key = lock_key
+        self.name = name
+        self._conn: Connection | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_leader(self) -> bool:
+        return self._conn is not None
+
+    def _drop_connection(self) -> None:
+        try:
+            self._conn.invalidate()
+            self._conn.close()
+        except SQLAlchemyError:
+            pass
+        self._conn = None
+
+    def ensure(self) -> bool:
+        """Confirm leadership if held, otherwise try to take it. Returns is_leader."""
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._conn.execute(text("SELECT 1"))
+                    self._conn.commit()
+                    return True
+                except SQLAlchemyError as e:
+                    logger.warning("Lost the %s leader lock connection, stepping down: %s", self.name, e)
+                    self._drop_connection()
+
+            conn = None
+            try:
+                conn = get_engine().connect()
+                acquired = conn.execute(select(func.pg_try_advisory_lock(self.lock_key))).scalar()
+                conn.commit()
+            except SQLAlchemyError as e:
+                logger.warning("Failed to contend for the %s leader lock: %s", self.name, e)
+                if conn is not None:
+                    conn.close()
+                return False
+
+            if not acquired:
+                conn.close()
+                return False
+
+            self._conn = conn
+            logger.info("This worker is now the %s leader", self.name)
+            return True
+
+    def release(self) -> None:
+        """Give up leadership (call on shutdown so another worker can take over)."""
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                self._conn.execute(select(func.pg_advisory_unlock(self.lock_key)))
+                self._conn.commit()
+                self._conn.close()
+                self._conn = None
+            except SQLAlchemyError:
+                self._drop_connection()
+            logger.info("Released the %s leader lock", self.name)
+
+    def only_leader(self, job: Callable[..., T]) -> Callable[..., T | None]:
+        """Wrap a periodic job so it only runs on the leader."""
+        @functools.wraps(job)
+        def wrapper(*args, **kwargs):
+            if not self.ensure():
+                logger.info("Skipping %s: this worker is not the %s leader", job.__name__, self.name)
+                return None
+            return job(*args, **kwargs)
+
+        return wrapper
+
+
+# Create singleton instance
+scheduler_leader = AdvisoryLockLeader(SCHEDULER_LOCK_KEY, "scheduler")
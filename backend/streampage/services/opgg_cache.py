@@ -0,0 +1,68 @@
+"""
+Short-lived cache of serialized /opgg/accounts responses.
+
+Every viewer of the main card hits /opgg/accounts, but the accounts only
+change when they are refreshed, added, removed or reordered, or a game is
+hidden/unhidden. Responses are cached as ready-to-send JSON per
+(owner_id, include_hidden) and dropped explicitly by the endpoints that make
+those changes. Entries also expire after a short TTL, since invalidation only
+reaches the process that made the change (the background worker's scheduled
+refreshes and other web workers rely on the TTL).
+"""
+
+import threading
+import time
+import uuid
+from datetime import datetime
+
+OPGG_ACCOUNTS_CACHE_TTL_SECONDS = 30
+
+
+class OpggAccountsCache:
+    """Thread-safe TTL cache of response bodies keyed by (owner_id, include_hidden)."""
+
+    def __init__(self, ttl_seconds: float = OPGG_ACCOUNTS_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        # key -> (expires_at monotonic, cached_at UTC, body)
+        self._entries: dict[tuple[uuid.UUID, bool], tuple[float, datetime, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, owner_id: uuid.UUID, include_hidden: bool) -> bytes | None:
+        key = (owner_id, include_hidden)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, _, body = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            return body
+
+    def put(self, owner_id: uuid.UUID, include_hidden: bool, body: bytes) -> None:
+        with self._lock:
+            self._entries[(owner_id, include_hidden)] = (
+                time.monotonic() + self.ttl_seconds, datetime.utcnow(), body
+            )
+
+    def invalidate(self, owner_id: uuid.UUID) -> None:
+        """Drop an owner's responses (call after committing any change to their card)."""
+        with self._lock:
+            self._entries.pop((owner_id, True), None)
+            self._entries.pop((owner_id, False), None)
+
+    def invalidate_before(self, owner_id: uuid.UUID, changed_at: datetime) -> None:
+        """Drop an owner's responses cached before a change made elsewhere (e.g. by the worker)."""
+        with self._lock:
+            for key in ((owner_id, True), (owner_id, False)):
+                entry = self._entries.get(key)
+                if entry is not None and entry[1] < changed_at:
+                    del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Create singleton instance
+opgg_accounts_cache = OpggAccountsCache()
@@ -0,0 +1,189 @@
+"""
+On-demand refresh of the owner's OPGG accounts.
+
+/opgg/refresh is open to any logged-in viewer, so it must not fan out into
+Riot calls per click. Each request is resolved against the owner's refresh
+jobs:
+
+* a job already queued or running is returned as-is (single flight; a
+  partial unique index keeps it to one per owner even across web workers),
+* a refresh that finished within OPGG_REFRESH_COOLDOWN_SECONDS is returned
+  with the time left until the next one is allowed,
+* otherwise a new job is queued for the background worker.
+
+The worker claims jobs with ``FOR UPDATE SKIP LOCKED`` and refreshes the
+accounts on the same bounded pool as the scheduled refresh, heartbeating the
+job as accounts finish; only a job that stops heartbeating is reclaimed.
+"""
+
+import logging
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, or_, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from streampage.config import OPGG_REFRESH_COOLDOWN_SECONDS
+from streampage.db.engine import get_db_session
+from streampage.db.models import OpggEntry, OpggRefreshJob, SummonerData
+from streampage.services.scheduler import SOURCE_OPGG, RefreshStats, RefreshTarget, refresh_targets
+
+logger = logging.getLogger(__name__)
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_SUCCEEDED = "succeeded"
+STATUS_FAILED = "failed"
+ACTIVE_STATUSES = (STATUS_QUEUED, STATUS_RUNNING)
+
+# A running job that hasn't heartbeated for this long is assumed to have lost
+# its worker and is re-run (refresh_targets reports progress at least every
+# PROGRESS_INTERVAL_SECONDS, well inside this).
+STALE_AFTER = timedelta(minutes=10)
+
+
+def _active_job(session: Session, owner_id: uuid.UUID) -> OpggRefreshJob | None:
+    return session.execute(
+        select(OpggRefreshJob).where(
+            OpggRefreshJob.owner_id == owner_id,
+            OpggRefreshJob.status.in_(ACTIVE_STATUSES),
+        )
+    ).scalar_one_or_none()
+
+
+def latest_opgg_refresh(session: Session, owner_id: uuid.UUID) -> OpggRefreshJob | None:
+    return session.execute(
+        select(OpggRefreshJob)
+        .where(OpggRefreshJob.owner_id == owner_id)
+        .order_by(OpggRefreshJob.created_at.desc())
+        .limit(1)
+    ).scalar_one_or_none()
+
+
+def request_opgg_refresh(
+    session: Session,
+    owner_id: uuid.UUID,
+    requested_by: uuid.UUID | None,
+) -> tuple[OpggRefreshJob, int]:
+    """Queue a refresh, or join the one in flight (the caller commits).
+
+    Returns the job and, if the owner is still cooling down from the last
+    refresh, the seconds until another is allowed (0 otherwise).
+    """
+    job = _active_job(session, owner_id)
+    if job is not None:
+        return job, 0
+
+    now = datetime.utcnow()
+    last = session.execute(
+        select(OpggRefreshJob)
+        .where(OpggRefreshJob.owner_id == owner_id, OpggRefreshJob.status == STATUS_SUCCEEDED)
+        .order_by(OpggRefreshJob.finished_at.desc())
+        .limit(1)
+    ).scalar_one_or_none()
+    if last is not None and last.finished_at is not None:
+        remaining = (last.finished_at + timedelta(seconds=OPGG_REFRESH_COOLDOWN_SECONDS) - now).total_seconds()
+        if remaining > 0:
+            return last, int(remaining) + 1
+
+    job_id = session.execute(
+        insert(OpggRefreshJob)
+        .values(owner_id=owner_id, requested_by=requested_by, status=STATUS_QUEUED)
+        .on_conflict_do_nothing(
+            index_elements=["owner_id"],
+            index_where=text("status IN ('queued', 'running')"),
+        )
+        .returning(OpggRefreshJob.id)
+    ).scalar_one_or_none()
+    if job_id is None:
+        # Another request queued one between our check and insert.
+        return _active_job(session, owner_id), 0
+    return session.get(OpggRefreshJob, job_id), 0
+
+
+def _claim_next_job(session: Session) -> OpggRefreshJob | None:
+    now = datetime.utcnow()
+    job = session.execute(
+        select(OpggRefreshJob)
+        .where(or_(
+            OpggRefreshJob.status == STATUS_QUEUED,
+            and_(OpggRefreshJob.status == STATUS_RUNNING, OpggRefreshJob.heartbeat_at < now - STALE_AFTER),
+        ))
+        .order_by(OpggRefreshJob.created_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    ).scalar_one_or_none()
+
+    if job is None:
+        session.rollback()
+        return None
+
+    if job.status == STATUS_RUNNING:
+        logger.warning("Reclaiming stale OPGG refresh job %s", job.id)
+    job.status = STATUS_RUNNING
+    job.started_at = now
+    job.heartbeat_at = now
+    session.commit()
+    return job
+
+
+def run_opgg_refresh_job(session: Session, job: OpggRefreshJob) -> RefreshStats:
+    """Refresh every OPGG account of the job's owner, ignoring activity tiers."""
+    rows = session.execute(
+        select(OpggEntry.puuid, SummonerData.game_name, SummonerData.tag_line)
+        .join(SummonerData, SummonerData.puuid == OpggEntry.puuid)
+        .where(OpggEntry.owner_id == job.owner_id)
+        .order_by(OpggEntry.display_order)
+    ).all()
+    targets = [
+        RefreshTarget(puuid, game_name, tag_line, sources={SOURCE_OPGG})
+        for puuid, game_name, tag_line in rows
+    ]
+    job.accounts_total = len(targets)
+    session.commit()
+
+    def record_progress(progress: RefreshStats) -> None:
+        job.accounts_refreshed = progress.succeeded
+        job.accounts_failed = progress.failed
+        job.heartbeat_at = datetime.utcnow()
+        session.commit()
+
+    stats = refresh_targets(targets, on_progress=record_progress)
+
+    job.accounts_refreshed = stats.succeeded
+    job.accounts_failed = stats.failed
+    job.status = STATUS_SUCCEEDED
+    job.finished_at = datetime.utcnow()
+    session.commit()
+    logger.info(
+        "OPGG refresh %s finished: %d/%d accounts in %.1fs",
+        job.id, stats.succeeded, stats.total, stats.elapsed_seconds,
+    )
+    return stats
+
+
+def process_opgg_refresh_queue() -> RefreshStats:
+    """Run queued OPGG refresh jobs until none are left."""
+    totals = RefreshStats()
+    while True:
+        with get_db_session() as session:
+            job = _claim_next_job(session)
+            if job is None:
+                return totals
+
+            job_id = job.id
+            try:
+                stats = run_opgg_refresh_job(session, job)
+                totals.total += stats.total
+                totals.succeeded += stats.succeeded
+                totals.failed += stats.failed
+            except Exception as e:
+                logger.error(f"OPGG refresh {job_id} failed: {e}")
+                session.rollback()
+                failed = session.get(OpggRefreshJob, job_id)
+                if failed is not None:
+                    failed.status = STATUS_FAILED
+                    failed.error = str(e)
+                    failed.finished_at = datetime.utcnow()
+                    session.commit()
@@ -0,0 +1,90 @@
+"""
+Process-level cache of the page owner's identity.
+
+Nearly every endpoint needs the page owner's (rosie's) user id before doing
+any real work. The id, username and email only change when the owner edits
+their profile, so they are resolved once per process and reused until
+``page_owner.invalidate()`` is called. Invalidation only reaches the worker
+that handled the edit, so entries also expire after a short TTL to bound
+staleness in the other workers.
+"""
+
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from streampage.db.models import User
+
+logger = logging.getLogger(__name__)
+
+OWNER_USERNAME = "rosie"
+OWNER_CACHE_TTL_SECONDS = 300
+
+
+@dataclass(frozen=True)
+class OwnerIdentity:
+    id: uuid.UUID
+    username: str
+    email: str | None
+
+
+class PageOwnerCache:
+    """Caches the page owner's identity; misses are never cached."""
+
+    def __init__(self, username: str, ttl_seconds: float = OWNER_CACHE_TTL_SECONDS):
+        self.username = username
+        self.ttl_seconds = ttl_seconds
+        self._identity: OwnerIdentity | None = None
+        self._expires_at = 0.0
+
+    def _cached(self) -> OwnerIdentity | None:
+        if self._identity is not None and time.monotonic() < self._expires_at:
+            return self._identity
+        return None
+
+    def _store(self, user: User | None) -> OwnerIdentity | None:
+        if user is None:
+            return None
+        identity = OwnerIdentity(id=user.id, username=user.username, email=user.email)
+        self._identity = identity
+        self._expires_at = time.monotonic() + self.ttl_seconds
+        return identity
+
+    def _query(self):
+        """Match the username case-insensitively (as _is_creator does), preferring an exact match."""
+        return (
+            select(User)
+            .where(func.lower(User.username) == self.username.lower())
+            .order_by((User.username == self.username).desc())
+            .limit(1)
+        )
+
+    def get(self, session: Session) -> OwnerIdentity | None:
+        """Return the owner's identity, loading it with ``session`` on a miss."""
+        cached = self._cached()
+        if cached is not None:
+            return cached
+        user = session.execute(self._query()).scalar_one_or_none()
+        return self._store(user)
+
+    async def get_async(self, session: AsyncSession) -> OwnerIdentity | None:
+        """Async-session variant of :meth:`get`."""
+        cached = self._cached()
+        if cached is not None:
+            return cached
+        user = (await session.execute(self._query())).scalar_one_or_none()
+        return self._store(user)
+
+    def invalidate(self) -> None:
+        """Drop the cached identity (call after the owner's profile changes)."""
+        logger.info("Invalidating cached page owner identity")
+        self._identity = None
+
+
+# Create singleton instance
+page_owner = PageOwnerCache(OWNER_USERNAME)
@@ -0,0 +1,234 @@
+"""
+Riot API rate limiter shared across workers.
+
+Riot reports the limits that apply to each call in its response headers:
+
+    X-App-Rate-Limit: 20:1,100:120          (requests:window_seconds, per region)
+    X-App-Rate-Limit-Count: 3:1,42:120      (what Riot has counted so far)
+    X-Method-Rate-Limit: 2000:10            (per endpoint, per region)
+    X-Method-Rate-Limit-Count: 1:10
+
+Each (host, scope, window) gets a counter row in ``riot_rate_limit_bucket``.
+Before a request, every bucket that applies to it is locked, reset if its
+window has elapsed, and incremented; if any bucket is exhausted (or blocked
+by a 429's Retry-After) the caller sleeps until the earliest moment all of
+them have room. Riot counts fixed windows that start at the first request,
+so the counters mirror that rather than a continuously refilling bucket,
+which would let a burst straddle a window boundary and overshoot.
+The ``-Count`` headers are folded back in so the shared counters never lag
+what Riot has actually seen.
+
+Cost: every Riot call takes two short transactions on top of the HTTP
+round trip, one in acquire() that row-locks every applicable bucket
+(including the shared app bucket, so concurrent callers serialize on it
+for the duration of that transaction) and one in record() to fold the
+counts back in. Each holds a pool connection only for those few
+statements, never across the HTTP request itself; size the pool for it
+(see WORKER_DB_POOL_SIZE). If the store is unreachable, calls proceed
+unthrottled rather than fail.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import httpx
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from streampage.config import RIOT_APP_RATE_LIMIT
+from streampage.db.engine import get_db_session
+from streampage.db.models import RiotRateLimitBucket
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on a single wait so a bad header can't park a thread forever.
+MAX_WAIT_SECONDS = 130.0
+# Back-off after a 429 whose Retry-After is missing or unparseable.
+DEFAULT_RETRY_AFTER_SECONDS = 5
+
+
+def parse_rate_limit_header(value: str | None) -> list[tuple[int, int]]:
+    """Parse ``"20:1,100:120"`` into ``[(20, 1), (100, 120)]``."""
+    pairs: list[tuple[int, int]] = []
+    for part in (value or "").split(","):
+        count, _, window = part.strip().partition(":")
+        if count.isdigit() and window.isdigit():
+            pairs.append((int(count), int(window)))
+    return pairs
+
+
+def parse_retry_after(value: str | None) -> int:
+    """Seconds to back off from a Retry-After header (delta-seconds or HTTP-date)."""
+    value = (value or "").strip()
+    if value.isdigit():
+        return min(int(value), int(MAX_WAIT_SECONDS))
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return DEFAULT_RETRY_AFTER_SECONDS
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    seconds = (retry_at - datetime.now(timezone.utc)).total_seconds()
+    return max(1, min(int(seconds) + 1, int(MAX_WAIT_SECONDS)))
+
+
+def _bucket_key(host: str, scope: str, window: int) -> str:
+    return f"{host}|{scope}|{window}"
+
+
+class RiotRateLimiter:
+    """Admits Riot API requests against app and per-method budgets."""
+
+    def __init__(self, default_app_limits: list[tuple[int, int]]):
+        self.default_app_limits = default_app_limits
+        # (host, scope) -> [(limit, window_seconds)], learned from headers.
+        self._limits: dict[tuple[str, str], list[tuple[int, int]]] = {}
+        # Local fallback for 429 back-off if the shared store is unreachable.
+        self._local_blocked_until: dict[tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+
+    def _scopes(self, host: str, method: str) -> list[str]:
+        return ["app", f"method:{method}"]
+
+    def _buckets(self, host: str, method: str) -> list[tuple[str, int, int]]:
+        """Return ``(bucket_key, limit, window)`` for every limit on a call."""
+        with self._lock:
+            app_limits = self._limits.get((host, "app"), self.default_app_limits)
+            method_limits = self._limits.get((host, f"method:{method}"), [])
+        buckets = [(_bucket_key(host, "app", w), n, w) for n, w in app_limits]
+        buckets += [(_bucket_key(host, f"method:{method}", w), n, w) for n, w in method_limits]
+        return sorted(buckets)
+
+    def _try_acquire(self, buckets: list[tuple[str, int, int]]) -> float:
+        """Take one request from every bucket, or return seconds to wait."""
+        with get_db_session() as session:
+            keys = [key for key, _, _ in buckets]
+            now = session.execute(select(func.timezone("UTC", func.clock_timestamp()))).scalar()
+            session.execute(
+                insert(RiotRateLimitBucket)
+                .values([{"bucket": key, "window_started_at": now, "request_count": 0} for key in keys])
+                .on_conflict_do_nothing(index_elements=["bucket"])
+            )
+            # Lock in key order so concurrent acquirers can't deadlock.
+            rows = {
+                row.bucket: row
+                for row in session.execute(
+                    select(RiotRateLimitBucket)
+                    .where(RiotRateLimitBucket.bucket.in_(keys))
+                    .order_by(RiotRateLimitBucket.bucket)
+                    .with_for_update()
+                ).scalars()
+            }
+
+            wait = 0.0
+            for key, limit, window in buckets:
+                row = rows[key]
+                if row.blocked_until and row.blocked_until > now:
+                    wait = max(wait, (row.blocked_until - now).total_seconds())
+                if row.window_started_at + timedelta(seconds=window) <= now:
+                    row.window_started_at = now
+                    row.request_count = 0
+                if row.request_count >= limit:
+                    window_end = row.window_started_at + timedelta(seconds=window)
+                    wait = max(wait, (window_end - now).total_seconds())
+
+            if wait > 0:
+                session.rollback()
+                return wait
+
+            for row in rows.values():
+                row.request_count += 1
+            session.commit()
+            return 0.0
+
+    def acquire(self, url: str, method: str) -> None:
+        """Block until a request to ``url`` fits every applicable budget."""
+        host = urlsplit(url).hostname or ""
+        while True:
+            wait = max(
+                (self._local_blocked_until.get((host, scope), 0.0) - time.monotonic())
+                for scope in self._scopes(host, method)
+            )
+            if wait <= 0:
+                try:
+                    wait = self._try_acquire(self._buckets(host, method))
+                except SQLAlchemyError as e:
+                    logger.warning("Rate limit store unavailable, proceeding unthrottled: %s", e)
+                    return
+            if wait <= 0:
+                return
+            wait = min(wait, MAX_WAIT_SECONDS)
+            logger.info("Riot budget exhausted for %s %s, waiting %.2fs", host, method, wait)
+            time.sleep(wait)
+
+    def record(self, url: str, method: str, response: httpx.Response) -> None:
+        """Learn limits and counts from a response; honour 429 Retry-After."""
+        host = urlsplit(url).hostname or ""
+        headers = response.headers
+
+        observed: dict[str, list[tuple[int, int]]] = {
+            "app": parse_rate_limit_header(headers.get("X-App-Rate-Limit-Count")),
+            f"method:{method}": parse_rate_limit_header(headers.get("X-Method-Rate-Limit-Count")),
+        }
+        with self._lock:
+            app_limits = parse_rate_limit_header(headers.get("X-App-Rate-Limit"))
+            if app_limits:
+                self._limits[(host, "app")] = app_limits
+            method_limits = parse_rate_limit_header(headers.get("X-Method-Rate-Limit"))
+            if method_limits:
+                self._limits[(host, f"method:{method}")] = method_limits
+
+        blocked_scopes: list[str] = []
+        retry_after = 0
+        if response.status_code == 429:
+            retry_after = parse_retry_after(headers.get("Retry-After"))
+            limit_type = headers.get("X-Rate-Limit-Type", "application")
+            blocked_scopes = ["app"] if limit_type == "application" else [f"method:{method}"]
+            for scope in blocked_scopes:
+                self._local_blocked_until[(host, scope)] = time.monotonic() + retry_after
+            logger.info("Riot 429 (%s) on %s %s, backing off %ds", limit_type, host, method, retry_after)
+
+        try:
+            self._sync_store(host, observed, blocked_scopes, retry_after)
+        except SQLAlchemyError as e:
+            logger.warning("Failed to sync Riot rate limit counts: %s", e)
+
+    def _sync_store(
+        self,
+        host: str,
+        observed: dict[str, list[tuple[int, int]]],
+        blocked_scopes: list[str],
+        retry_after: int,
+    ) -> None:
+        if not any(observed.values()) and not blocked_scopes:
+            return
+        with get_db_session() as session:
+            for scope, counts in observed.items():
+                for count, window in counts:
+                    session.execute(
+                        update(RiotRateLimitBucket)
+                        .where(
+                            RiotRateLimitBucket.bucket == _bucket_key(host, scope, window),
+                            RiotRateLimitBucket.request_count < count,
+                        )
+                        .values(request_count=count)
+                    )
+            for scope in blocked_scopes:
+                session.execute(
+                    update(RiotRateLimitBucket)
+                    .where(RiotRateLimitBucket.bucket.like(f"{host}|{scope}|%"))
+                    .values(
+                        blocked_until=func.timezone("UTC", func.clock_timestamp())
+                        + timedelta(seconds=retry_after)
+                    )
+                )
+            session.commit()
+
+
+# Create singleton instance
+riot_rate_limiter = RiotRateLimiter(parse_rate_limit_header(RIOT_APP_RATE_LIMIT))
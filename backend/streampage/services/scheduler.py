@@ -1,66 +1,299 @@
 """
 Scheduled tasks for updating summoner data.
+
+One refresh cycle covers every tracked Riot account: OPGG card accounts,
+int list entries and the duo tracked account. Accounts are deduplicated by
+PUUID (the same account is often on both the OPGG card and the int list) so
+each is refreshed once per cycle, in source priority order.
+
+Cycles run every few minutes but only refresh accounts that are due. Each
+refresh sets the summoner's next_refresh_at from its activity tier (see
+refresh_interval), so active players are checked every 15 minutes while
+dormant accounts are checked once a day.
 """
 
+import contextvars
 import logging
+import threading
 import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
+
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
 
-from streampage.db.engine import get_db_session
-from streampage.db.models import IntListEntry
-from streampage.db.riot import fetch_and_store_summoner_data
+from streampage.config import SCHEDULER_REFRESH_WORKERS
+from streampage.db.engine import get_db_session, release_connection
+from streampage.db.models import DuoTrackedAccount, IntListEntry, Match, OpggEntry, SummonerData
+from streampage.db.riot import fetch_summoner_data, store_summoner_data
+from streampage.services.duo_ingest import enqueue_duo_ingest
+from streampage.services.job_runs import RefreshStats
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per round trip while collecting accounts to refresh.
+STREAM_BATCH_SIZE = 100
+
+# Refresh sources, in priority order (OPGG accounts are on the main card).
+SOURCE_OPGG = "opgg"
+SOURCE_INT_LIST = "int_list"
+SOURCE_DUO = "duo"
+SOURCE_PRIORITY = {SOURCE_OPGG: 0, SOURCE_INT_LIST: 1, SOURCE_DUO: 2}
+
+# Sources whose accounts are shown from SummonerData.
+SUMMONER_SOURCES = {SOURCE_OPGG, SOURCE_INT_LIST}
+
+# Activity tiers. An account is active if its data changed or it played within
+# ACTIVE_WINDOW, or it played ACTIVE_GAMES_PER_WEEK+ games in the last week.
+ACTIVE_WINDOW = timedelta(hours=24)
+ACTIVE_GAMES_PER_WEEK = 5
+ACTIVE_REFRESH_INTERVAL = timedelta(minutes=15)
+RECENT_REFRESH_INTERVAL = timedelta(hours=3)
+DORMANT_REFRESH_INTERVAL = timedelta(hours=24)
+# Retry delay after a failed refresh, so broken accounts don't eat the budget.
+FAILED_REFRESH_INTERVAL = timedelta(hours=1)
+# Longest gap between refresh_targets progress callbacks.
+PROGRESS_INTERVAL_SECONDS = 30
+
+# Failed accounts with no SummonerData row to carry next_refresh_at (e.g. a
+# new int list entry whose Riot ID no longer resolves) are deferred here
+# instead, by PUUID. Process-local, so a newly elected leader retries them once.
+_failed_refresh_until: dict[str, datetime] = {}
+_failed_refresh_lock = threading.Lock()
+
+
+@dataclass
+class RefreshTarget:
+    """One Riot account to refresh, and every source that tracks it."""
+    puuid: str
+    game_name: str
+    tag_line: str
+    sources: set[str] = field(default_factory=set)
+    duo_account_id: uuid.UUID | None = None
+    # None means due now.
+    next_refresh_at: datetime | None = None
+
+    @property
+    def priority(self) -> int:
+        return min(SOURCE_PRIORITY[source] for source in self.sources)
+
+
+def refresh_interval(last_updated: datetime | None, played_at: list[datetime], now: datetime) -> timedelta:
+    """Pick how long until a summoner is next refreshed from how active it is."""
+    week_ago = now - timedelta(days=7)
+    games_this_week = sum(1 for p in played_at if p >= week_ago)
+    last_activity = max([t for t in (last_updated, *played_at) if t is not None], default=None)
+
+    if games_this_week >= ACTIVE_GAMES_PER_WEEK or (
+        last_activity is not None and now - last_activity <= ACTIVE_WINDOW
+    ):
+        return ACTIVE_REFRESH_INTERVAL
+    if last_activity is not None and last_activity >= week_ago:
+        return RECENT_REFRESH_INTERVAL
+    return DORMANT_REFRESH_INTERVAL
+
+
+def _schedule_next_refresh(session: Session, summoner_data: SummonerData, now: datetime) -> None:
+    match_ids = [m["match_id"] for m in summoner_data.recent_matches or []]
+    played_at = session.execute(
+        select(Match.played_at).where(Match.match_id.in_(match_ids))
+    ).scalars().all() if match_ids else []
+    summoner_data.next_refresh_at = now + refresh_interval(summoner_data.last_updated, played_at, now)
+
+
+def collect_refresh_targets(session: Session) -> list[RefreshTarget]:
+    """Gather every tracked account, deduplicated by PUUID, highest priority first."""
+    targets: dict[str, RefreshTarget] = {}
+
+    def add(
+        source: str,
+        puuid: str,
+        game_name: str,
+        tag_line: str,
+        next_refresh_at: datetime | None = None,
+    ) -> RefreshTarget:
+        target = targets.get(puuid)
+        if target is None:
+            target = targets[puuid] = RefreshTarget(puuid, game_name, tag_line, next_refresh_at=next_refresh_at)
+        elif SOURCE_PRIORITY[source] < target.priority:
+            # Prefer the Riot ID as recorded by the higher-priority source.
+            target.game_name, target.tag_line = game_name, tag_line
+        target.sources.add(source)
+        return target
+
+    # OPGG entries only know their Riot ID through SummonerData.
+    opgg_rows = session.execute(
+        select(OpggEntry.puuid, SummonerData.game_name, SummonerData.tag_line, SummonerData.next_refresh_at)
+        .join(SummonerData, SummonerData.puuid == OpggEntry.puuid)
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
+    for puuid, game_name, tag_line, next_refresh_at in opgg_rows:
+        add(SOURCE_OPGG, puuid, game_name, tag_line, next_refresh_at)
+
+    int_list_rows = session.execute(
+        select(IntListEntry.puuid, IntListEntry.summoner_name, IntListEntry.summoner_tag, SummonerData.next_refresh_at)
+        .outerjoin(SummonerData, SummonerData.puuid == IntListEntry.puuid)
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
+    for puuid, summoner_name, summoner_tag, next_refresh_at in int_list_rows:
+        add(SOURCE_INT_LIST, puuid, summoner_name, summoner_tag, next_refresh_at)
+
+    # The duo account has no SummonerData of its own unless it is also on the
+    # OPGG card or int list; otherwise it is due RECENT_REFRESH_INTERVAL after
+    # its last ingest.
+    duo_rows = session.execute(
+        select(
+            DuoTrackedAccount.id,
+            DuoTrackedAccount.puuid,
+            DuoTrackedAccount.game_name,
+            DuoTrackedAccount.tag_line,
+            DuoTrackedAccount.last_updated,
+        )
+    )
+    for account_id, puuid, game_name, tag_line, last_updated in duo_rows:
+        next_refresh_at = last_updated + RECENT_REFRESH_INTERVAL if last_updated else None
+        target = add(SOURCE_DUO, puuid, game_name, tag_line, next_refresh_at)
+        target.duo_account_id = account_id
+
+    now = datetime.utcnow()
+    with _failed_refresh_lock:
+        for puuid, deferred_until in list(_failed_refresh_until.items()):
+            target = targets.get(puuid)
+            if target is None or deferred_until <= now:
+                del _failed_refresh_until[puuid]
+            elif target.next_refresh_at is None or target.next_refresh_at < deferred_until:
+                target.next_refresh_at = deferred_until
+
+    return sorted(targets.values(), key=lambda target: target.priority)
 
-def update_all_int_list_entries(buffer_seconds: int = 10) -> None:
+
+def _refresh_target(target: RefreshTarget) -> bool:
+    """Refresh one account for all of its sources in its own short-lived session."""
+    now = datetime.utcnow()
+    with get_db_session() as session:
+        try:
+            if target.sources & SUMMONER_SOURCES:
+                stored = session.get(SummonerData, target.puuid)
+                release_connection(session)
+                fetched = fetch_summoner_data(target.puuid, target.game_name, target.tag_line, stored)
+                summoner_data = store_summoner_data(session, target.puuid, fetched)
+                _schedule_next_refresh(session, summoner_data, now)
+                session.commit()
+            if target.duo_account_id is not None:
+                account = session.get(DuoTrackedAccount, target.duo_account_id)
+                if account is not None:
+                    # Run by the duo_ingest worker job, which never overlaps
+                    # another ingest for the same owner.
+                    enqueue_duo_ingest(session, account.owner_id)
+                    session.commit()
+            with _failed_refresh_lock:
+                _failed_refresh_until.pop(target.puuid, None)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to update {target.game_name}#{target.tag_line}: {e}")
+            session.rollback()
+            _defer_failed_refresh(target.puuid, now)
+            return False
+
+
+def _defer_failed_refresh(puuid: str, now: datetime) -> None:
+    deferred = 0
+    try:
+        with get_db_session() as session:
+            deferred = session.query(SummonerData).filter(SummonerData.puuid == puuid).update(
+                {"next_refresh_at": now + FAILED_REFRESH_INTERVAL}
+            )
+            session.commit()
+    except SQLAlchemyError as e:
+        logger.warning(f"Failed to defer next refresh for {puuid[:12]}...: {e}")
+    if not deferred:
+        with _failed_refresh_lock:
+            _failed_refresh_until[puuid] = now + FAILED_REFRESH_INTERVAL
+
+
+def refresh_targets(
+    targets: Iterable[RefreshTarget],
+    workers: int = SCHEDULER_REFRESH_WORKERS,
+    on_progress: Callable[[RefreshStats], None] | None = None,
+) -> RefreshStats:
     """
-    Update summoner data for all int list entries.
-    
-    Queries all unique PUUIDs from IntListEntry and refreshes their
-    SummonerData records from the Riot API.
-    
-    Args:
-        buffer_seconds: Time to wait between API calls to respect rate limits.
+    Refresh accounts on a worker pool.
+
+    Workers run concurrently and are paced by the shared Riot rate limiter,
+    so throughput tracks the API budget rather than a fixed sleep. At most
+    2 * workers refreshes are queued at once, so targets are started in the
+    order given (i.e. priority order).
+
+    on_progress, if given, is called from the calling thread as refreshes
+    finish and at least every PROGRESS_INTERVAL_SECONDS while they run (e.g.
+    to heartbeat a job row).
     """
-    logger.info("Starting scheduled int list update...")
-    
+    stats = RefreshStats()
+    started = time.monotonic()
+    in_flight: set[Future] = set()
+
+    def collect(done: set[Future]) -> None:
+        for future in done:
+            if future.result():
+                stats.succeeded += 1
+            else:
+                stats.failed += 1
+            completed = stats.succeeded + stats.failed
+            if completed % 50 == 0:
+                rate = completed * 60 / (time.monotonic() - started)
+                logger.info(f"Refreshed {completed} accounts ({stats.failed} failed, {rate:.1f}/min)")
+
+    def wait_until(limit: int) -> None:
+        nonlocal in_flight
+        while len(in_flight) > limit:
+            done, in_flight = wait(in_flight, timeout=PROGRESS_INTERVAL_SECONDS, return_when=FIRST_COMPLETED)
+            collect(done)
+            if on_progress is not None:
+                on_progress(stats)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="account-refresh") as pool:
+        for target in targets:
+            wait_until(workers * 2 - 1)
+            # Carry the job run's Riot call counter into the worker thread.
+            in_flight.add(pool.submit(contextvars.copy_context().run, _refresh_target, target))
+            stats.total += 1
+        wait_until(0)
+
+    stats.elapsed_seconds = time.monotonic() - started
+    return stats
+
+
+def refresh_all_accounts(force: bool = False) -> RefreshStats:
+    """
+    Refresh every tracked Riot account (OPGG, int list and duo) that is due.
+
+    Pass force=True to refresh every account regardless of its tier. Each
+    account gets one short transaction on the worker pool.
+    """
+    now = datetime.utcnow()
     with get_db_session() as session:
-        # Get all int list entries with their summoner info
-        entries = session.query(IntListEntry).all()
-        
-        if not entries:
-            logger.info("No int list entries to update.")
-            return
-        
-        total = len(entries)
-        logger.info(f"Found {total} int list entries to update.")
-        
-        for i, entry in enumerate(entries, start=1):
-            try:
-                logger.info(
-                    f"[{i}/{total}] Updating {entry.summoner_name}#{entry.summoner_tag}..."
-                )
-                
-                fetch_and_store_summoner_data(
-                    session,
-                    entry.puuid,
-                    entry.summoner_name,
-                    entry.summoner_tag,
-                )
-                session.commit()
-                
-                logger.info(
-                    f"[{i}/{total}] Successfully updated {entry.summoner_name}#{entry.summoner_tag}"
-                )
-                
-            except Exception as e:
-                logger.error(
-                    f"[{i}/{total}] Failed to update {entry.summoner_name}#{entry.summoner_tag}: {e}"
-                )
-                session.rollback()
-            
-            # Buffer between API calls (skip on last entry)
-            if i < total:
-                time.sleep(buffer_seconds)
-    
-    logger.info("Scheduled int list update completed.")
+        targets = collect_refresh_targets(session)
+    tracked = len(targets)
+    if not force:
+        targets = [t for t in targets if t.next_refresh_at is None or t.next_refresh_at <= now]
+
+    if not targets:
+        logger.debug(f"No accounts due for refresh ({tracked} tracked).")
+        return RefreshStats()
+
+    counts = {
+        source: sum(1 for t in targets if source in t.sources) for source in SOURCE_PRIORITY
+    }
+    logger.info(f"Refreshing {len(targets)} of {tracked} tracked accounts ({counts})")
+
+    stats = refresh_targets(targets)
+
+    logger.info(
+        f"Scheduled account refresh completed: {stats.succeeded}/{stats.total} updated, "
+        f"{stats.failed} failed in {stats.elapsed_seconds:.1f}s ({stats.per_minute:.1f} accounts/min)"
+    )
+    return stats
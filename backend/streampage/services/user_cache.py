@@ -0,0 +1,71 @@
+"""
+Short-lived LRU cache of authenticated users.
+
+Access tokens carry the user's id, so ``get_current_user`` can resolve the
+caller from this cache without touching the database. Each hit hands out a
+fresh detached ``User`` built from a column snapshot, so requests never share
+ORM instances. Entries expire after a short TTL (invalidation only reaches
+the worker that made the change) and are dropped explicitly whenever a
+user's profile is edited.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from streampage.db.models import User
+
+USER_CACHE_MAX_SIZE = 512
+USER_CACHE_TTL_SECONDS = 60
+
+
+class UserCache:
+    """Thread-safe TTL + LRU cache of user column snapshots keyed by id."""
+
+    def __init__(self, max_size: int = USER_CACHE_MAX_SIZE, ttl_seconds: float = USER_CACHE_TTL_SECONDS):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[uuid.UUID, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: uuid.UUID) -> User | None:
+        """Return a detached copy of the cached user, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, values = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+
+        user = User(**values)
+        make_transient_to_detached(user)
+        return user
+
+    def put(self, user: User) -> None:
+        values = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+        with self._lock:
+            self._entries[user.id] = (time.monotonic() + self.ttl_seconds, values)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        """Drop a user (call after the user is renamed, edited or deleted)."""
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Create singleton instance
+user_cache = UserCache()
@@ -0,0 +1,105 @@
+"""
+Background worker process for periodic jobs.
+
+Runs the scheduler (Riot summoner refreshes and friends) outside the web
+process so refresh load never competes with request handling for the GIL
+or the web pool's database connections:
+
+    python -m streampage.worker
+
+Any number of worker processes/replicas may run; jobs only execute on the
+one holding the scheduler advisory lock (see services/leader.py).
+"""
+
+import logging
+import signal
+from datetime import datetime, timedelta
+
+from apscheduler.schedulers.blocking import BlockingScheduler
+
+from streampage.config import (
+    DUO_INGEST_POLL_SECONDS,
+    OPGG_REFRESH_POLL_SECONDS,
+    REFRESH_TICK_MINUTES,
+    WORKER_DB_MAX_OVERFLOW,
+    WORKER_DB_POOL_SIZE,
+)
+from streampage.db.engine import configure_pool
+from streampage.db.riot import close_riot_client
+from streampage.services.duo_ingest import process_duo_ingest_queue
+from streampage.services.job_runs import track_job_run
+from streampage.services.leader import scheduler_leader
+from streampage.services.opgg_refresh import process_opgg_refresh_queue
+from streampage.services.scheduler import refresh_all_accounts
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def build_scheduler() -> BlockingScheduler:
+    scheduler = BlockingScheduler()
+
+    # Keep (or contend for) leadership so a standby worker takes over within
+    # a minute if the leader dies.
+    scheduler.add_job(
+        scheduler_leader.ensure,
+        'interval',
+        seconds=60,
+        id='scheduler_leader_heartbeat',
+        next_run_time=datetime.now(),
+    )
+    # Refresh due OPGG, int list and duo accounts 30 seconds after startup,
+    # then every few minutes (each account's tier decides when it is due)
+    scheduler.add_job(
+        scheduler_leader.only_leader(track_job_run('account_refresh')(refresh_all_accounts)),
+        'interval',
+        minutes=REFRESH_TICK_MINUTES,
+        id='account_refresh',
+        max_instances=1,
+        coalesce=True,
+        next_run_time=datetime.now() + timedelta(seconds=30),
+    )
+    # Run duo match backfills queued by the /duos/account endpoints. Jobs are
+    # claimed with SKIP LOCKED, so this runs on every worker, not just the leader.
+    scheduler.add_job(
+        track_job_run('duo_ingest')(process_duo_ingest_queue),
+        'interval',
+        seconds=DUO_INGEST_POLL_SECONDS,
+        id='duo_ingest',
+        max_instances=1,
+        coalesce=True,
+    )
+    # Run OPGG refreshes requested through /opgg/refresh (also SKIP LOCKED).
+    scheduler.add_job(
+        track_job_run('opgg_refresh')(process_opgg_refresh_queue),
+        'interval',
+        seconds=OPGG_REFRESH_POLL_SECONDS,
+        id='opgg_refresh',
+        max_instances=1,
+        coalesce=True,
+    )
+    return scheduler
+
+
+def main() -> None:
+    configure_pool(WORKER_DB_POOL_SIZE, WORKER_DB_MAX_OVERFLOW)
+    scheduler = build_scheduler()
+
+    def stop(signum, frame) -> None:
+        logger.info("Received signal %d, shutting down worker", signum)
+        scheduler.shutdown(wait=False)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    logger.info("Background worker started - first account refresh in 30 seconds")
+    try:
+        scheduler.start()
+    finally:
+        scheduler_leader.release()
+        close_riot_client()
+        logger.info("Background worker stopped")
+
+
+if __name__ == "__main__":
+    main()
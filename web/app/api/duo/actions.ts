@@ -39,6 +39,24 @@ export type DuoResult = {
     error?: string;
 };
 
+export type DuoIngestStatus = {
+    id: string;
+    status: "queued" | "running" | "succeeded" | "failed";
+    message: string;
+    matches_total: number | null;
+    matches_fetched: number;
+    matches_remaining: number | null;
+    matches_stored: number;
+    error: string | null;
+};
+
+export type DuoIngestResult = {
+    success: boolean;
+    message: string;
+    ingest: DuoIngestStatus | null;
+    error?: string;
+};
+
 export type AccountResult = {
     success: boolean;
     account: TrackedAccountData | null;
@@ -112,7 +130,7 @@ export async function setTrackedAccount(
     token: string,
     gameName: string,
     tagLine: string,
-): Promise<DuoResult> {
+): Promise<DuoIngestResult> {
     try {
         const response = await fetch(`${API_URL}/duos/account`, {
             method: "POST",
@@ -129,21 +147,23 @@ export async function setTrackedAccount(
             return {
                 success: false,
                 message: "",
+                ingest: null,
                 error: data.detail || data.message || "Failed to set account",
             };
         }
 
-        return { success: true, message: data.message || "Account set" };
+        return { success: true, message: data.message || "Account set", ingest: data };
     } catch (error) {
         return {
             success: false,
             message: "",
+            ingest: null,
             error: error instanceof Error ? error.message : "An unexpected error occurred",
         };
     }
 }
 
-export async function updateTrackedAccount(token: string): Promise<DuoResult> {
+export async function updateTrackedAccount(token: string): Promise<DuoIngestResult> {
     try {
         const response = await fetch(`${API_URL}/duos/account/update`, {
             method: "POST",
@@ -159,15 +179,53 @@ export async function updateTrackedAccount(token: string): Promise<DuoResult> {
             return {
                 success: false,
                 message: "",
+                ingest: null,
                 error: data.detail || data.message || "Failed to update account",
             };
         }
 
-        return { success: true, message: data.message || "Account updated" };
+        return { success: true, message: data.message || "Account updated", ingest: data };
+    } catch (error) {
+        return {
+            success: false,
+            message: "",
+            ingest: null,
+            error: error instanceof Error ? error.message : "An unexpected error occurred",
+        };
+    }
+}
+
+export async function getDuoIngestStatus(token: string): Promise<DuoIngestResult> {
+    try {
+        const response = await fetch(`${API_URL}/duos/account/ingest`, {
+            method: "GET",
+            headers: {
+                "Content-Type": "application/json",
+                Authorization: `Bearer ${token}`,
+            },
+        });
+
+        const data = await response.json();
+
+        if (!response.ok) {
+            return {
+                success: false,
+                message: "",
+                ingest: null,
+                error: data.detail || data.message || "Failed to fetch ingest status",
+            };
+        }
+
+        return {
+            success: true,
+            message: data?.message || "",
+            ingest: data,
+        };
     } catch (error) {
         return {
             success: false,
             message: "",
+            ingest: null,
             error: error instanceof Error ? error.message : "An unexpected error occurred",
         };
     }
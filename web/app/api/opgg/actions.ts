@@ -32,6 +32,19 @@ export type OpggAccount = {
     recent_matches: RecentMatch[];
 };
 
+export type OpggRefreshStatus = {
+    status: "queued" | "running" | "succeeded" | "failed";
+    message: string;
+    retry_after_seconds: number;
+};
+
+export type OpggRefreshResult = {
+    success: boolean;
+    message: string;
+    refresh: OpggRefreshStatus | null;
+    error?: string;
+};
+
 export type GetOpggAccountsResult = {
     success: boolean;
     accounts: OpggAccount[];
@@ -233,7 +246,7 @@ export async function getOpggAccounts(includeHidden: boolean = false): Promise<G
     }
 }
 
-export async function refreshOpggAccounts(token: string): Promise<OpggResult> {
+export async function refreshOpggAccounts(token: string): Promise<OpggRefreshResult> {
     try {
         const response = await fetch(`${API_URL}/opgg/refresh`, {
             method: "POST",
@@ -249,18 +262,57 @@ export async function refreshOpggAccounts(token: string): Promise<OpggResult> {
             return {
                 success: false,
                 message: "",
+                refresh: null,
                 error: data.detail || data.message || "Failed to refresh accounts",
             };
         }
 
         return {
             success: true,
-            message: data.message || "Successfully refreshed accounts",
+            message: data.message || "Refresh queued",
+            refresh: data,
+        };
+    } catch (error) {
+        return {
+            success: false,
+            message: "",
+            refresh: null,
+            error: error instanceof Error ? error.message : "An unexpected error occurred",
+        };
+    }
+}
+
+export async function getOpggRefreshStatus(token: string): Promise<OpggRefreshResult> {
+    try {
+        const response = await fetch(`${API_URL}/opgg/refresh/status`, {
+            method: "GET",
+            headers: {
+                "Content-Type": "application/json",
+                Authorization: `Bearer ${token}`,
+            },
+        });
+
+        const data = await response.json();
+
+        if (!response.ok) {
+            return {
+                success: false,
+                message: "",
+                refresh: null,
+                error: data.detail || data.message || "Failed to fetch refresh status",
+            };
+        }
+
+        return {
+            success: true,
+            message: data?.message || "",
+            refresh: data,
         };
     } catch (error) {
         return {
             success: false,
             message: "",
+            refresh: null,
             error: error instanceof Error ? error.message : "An unexpected error occurred",
         };
     }
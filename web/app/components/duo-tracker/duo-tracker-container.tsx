@@ -7,6 +7,7 @@ import {
     fetchTrackedAccount,
     setTrackedAccount,
     updateTrackedAccount,
+    getDuoIngestStatus,
     recordDuo,
     deleteDuoEntry,
     updateDuoEntry,
@@ -14,6 +15,7 @@ import {
     removeDuoAccount,
     type DuoEntryData,
     type TrackedAccountData,
+    type DuoIngestResult,
 } from "@/app/api/duo/actions"
 import DuoTrackerCard from "./duo-tracker-card"
 import DuoTrackerFooter from "./duo-tracker-footer"
@@ -62,11 +64,24 @@ export default function DuoTrackerContainer({ onClose, onMouseDown, isRosie, onO
         }
     }, [isRosie, token, loadAccount])
 
+    // Matches are fetched by the background worker; poll the ingest job until
+    // it finishes (or give up after a minute) before reloading.
+    const waitForIngest = async (result: DuoIngestResult) => {
+        if (!token) return
+        for (let attempt = 0; attempt < 30; attempt++) {
+            const status = result.ingest?.status
+            if (status !== "queued" && status !== "running") break
+            await new Promise((resolve) => setTimeout(resolve, 2000))
+            result = await getDuoIngestStatus(token)
+        }
+    }
+
     const handleSetAccount = async (gameName: string, tagLine: string) => {
         if (!token) return
         setAccountLoading(true)
         const result = await setTrackedAccount(token, gameName, tagLine)
         if (result.success) {
+            await waitForIngest(result)
             await loadAccount()
             await loadEntries()
         }
@@ -78,6 +93,7 @@ export default function DuoTrackerContainer({ onClose, onMouseDown, isRosie, onO
         setAccountLoading(true)
         const result = await updateTrackedAccount(token)
         if (result.success) {
+            await waitForIngest(result)
             await loadAccount()
             await loadEntries()
         }
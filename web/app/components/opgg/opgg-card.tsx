@@ -10,6 +10,7 @@ import {
   getOpggAccounts,
   addOpggAccount,
   refreshOpggAccounts,
+  getOpggRefreshStatus,
   hideOpggGame,
   type OpggAccount,
   type RecentMatch,
@@ -217,7 +218,15 @@ export default function OpggCard({ onClose, onMouseDown }: OpggCardProps) {
   const handleRefresh = async () => {
     if (!token || isRefreshing) return;
     setIsRefreshing(true);
-    await refreshOpggAccounts(token);
+    // The refresh runs in the background; poll until it finishes (or give up
+    // after a minute) before reloading the accounts.
+    let result = await refreshOpggAccounts(token);
+    for (let attempt = 0; attempt < 30; attempt++) {
+      const status = result.refresh?.status;
+      if (status !== "queued" && status !== "running") break;
+      await new Promise((resolve) => setTimeout(resolve, 2000));
+      result = await getOpggRefreshStatus(token);
+    }
     await fetchAccounts(showHiddenMatches);
     setIsRefreshing(false);
   };